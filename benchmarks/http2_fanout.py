@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Benchmark a cross-installation fan-out over aiohttp and over HTTP/2.
+
+The outputs of every installation of the account are fetched concurrently,
+once with the default aiohttp transport (a connection per parallel request)
+and once with the HTTP/2 transport (streams multiplexed on one connection).
+The median wall time of a fan-out and the median latency of a request are
+reported for both.
+
+How to use this script:
+    pip install pyhaopenmotics[http2]
+    OPENMOTICS_TOKEN=... python benchmarks/http2_fanout.py [--runs 10] [--width 4]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+from pyhaopenmotics import OpenMoticsCloud
+
+
+async def fan_out(omcloud: OpenMoticsCloud, paths: list[str]) -> tuple[float, list[float]]:
+    """Get all paths concurrently, return the wall time and the request latencies."""
+    latencies: list[float] = []
+
+    async def timed_get(path: str) -> None:
+        start = time.perf_counter()
+        await omcloud.get(path)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(timed_get(path) for path in paths))
+    return time.perf_counter() - start, latencies
+
+
+async def measure(token: str, *, http2: bool, runs: int, width: int) -> tuple[float, float]:
+    """Return the median fan-out time and request latency in milliseconds."""
+    async with OpenMoticsCloud(token=token, http2=http2, adaptive_timeout=False) as omcloud:
+        installations = await omcloud.installations.get_all()
+        paths = [f"/base/installations/{installation.idx}/outputs" for installation in installations] * width
+        # Warm up, so the connection set-up is not measured.
+        await fan_out(omcloud, paths[:1])
+        walls: list[float] = []
+        latencies: list[float] = []
+        for _ in range(runs):
+            wall, run_latencies = await fan_out(omcloud, paths)
+            walls.append(wall)
+            latencies.extend(run_latencies)
+    return statistics.median(walls) * 1000, statistics.median(latencies) * 1000
+
+
+async def main() -> None:
+    """Run both transports and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--width", type=int, default=4, help="requests per installation in a fan-out")
+    args = parser.parse_args()
+
+    if not (token := os.environ.get("OPENMOTICS_TOKEN")):
+        sys.exit("Set OPENMOTICS_TOKEN to an access token of the cloud API.")
+
+    for name, http2 in (("aiohttp (HTTP/1.1)", False), ("httpx (HTTP/2)", True)):
+        wall, latency = await measure(token, http2=http2, runs=args.runs, width=args.width)
+        print(f"{name:<24} fan-out {wall:8.1f} ms   request {latency:8.1f} ms")  # noqa: T201
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
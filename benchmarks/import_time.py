@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Benchmark the import time of pyhaopenmotics.
+
+Every measurement runs in a fresh interpreter, so nothing is cached between
+runs. The median of several runs is reported for:
+    * the bare ``import pyhaopenmotics``
+    * the first access of ``LocalGateway`` and ``OpenMoticsCloud``
+    * importing every client and domain module up front
+
+How to use this script:
+    python benchmarks/import_time.py [--runs 10]
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+SCENARIOS = {
+    "import pyhaopenmotics": "import pyhaopenmotics",
+    "LocalGateway": "import pyhaopenmotics; pyhaopenmotics.LocalGateway",
+    "OpenMoticsCloud": "import pyhaopenmotics; pyhaopenmotics.OpenMoticsCloud",
+    "everything": (
+        "import pyhaopenmotics; pyhaopenmotics.LocalGateway; pyhaopenmotics.OpenMoticsCloud; "
+        "import pyhaopenmotics.cloud.models as m; [getattr(m, n) for n in m.__all__]; "
+        "import pyhaopenmotics.openmoticsgw as g; [getattr(g, n) for n in g.__all__]"
+    ),
+}
+
+TIMER = """
+import time
+start = time.perf_counter()
+{code}
+print(time.perf_counter() - start)
+"""
+
+
+def measure(code: str, runs: int) -> float:
+    """Return the median duration of a snippet in milliseconds."""
+    durations = []
+    for _ in range(runs):
+        result = subprocess.run(  # noqa: S603
+            [sys.executable, "-c", TIMER.format(code=code)],
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+        durations.append(float(result.stdout.strip()) * 1000)
+    return statistics.median(durations)
+
+
+def main() -> None:
+    """Run all scenarios and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    for name, code in SCENARIOS.items():
+        print(f"{name:<24} {measure(code, args.runs):8.1f} ms")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Benchmark the client-side overhead of a request, without any network.
+
+For both clients the preparation of a command is timed: its path, its url
+and its auth headers. The median time per call and the memory allocated per
+call (tracemalloc peak) are reported, next to a headers dict rebuilt for every
+request as a reference.
+
+How to use this script:
+    python benchmarks/request_overhead.py [--calls 100000] [--runs 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+import tracemalloc
+from typing import TYPE_CHECKING, Any
+
+from pyhaopenmotics import LocalGateway, OpenMoticsCloud
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+
+async def prepare_local(client: LocalGateway) -> Any:
+    """Prepare a command of the local gateway."""
+    return await client._get_url("set_output"), await client._get_auth_headers()  # noqa: SLF001
+
+
+async def prepare_cloud(client: OpenMoticsCloud) -> Any:
+    """Prepare a command of the cloud."""
+    path = client.routes.path("outputs/{}/turn_on", 3)
+    return await client._get_url(path), await client._get_auth_headers(json_body=True)  # noqa: SLF001
+
+
+async def rebuild_headers(client: OpenMoticsCloud) -> Any:
+    """Build the auth headers per request, the reference."""
+    return {
+        "User-Agent": client.user_agent,
+        "Accept": "application/json",
+        "Authorization": f"Bearer {client.token}",
+        "Content-Type": "application/json",
+    }
+
+
+async def measure(prepare: Callable[[], Awaitable[Any]], calls: int, runs: int) -> tuple[float, float]:
+    """Return the median microseconds and the median peak of allocated bytes per call."""
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        for _ in range(calls):
+            await prepare()
+        durations.append((time.perf_counter() - start) / calls * 1e6)
+
+    peaks = []
+    tracemalloc.start()
+    for _ in range(1000):
+        current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        await prepare()
+        peaks.append(tracemalloc.get_traced_memory()[1] - current)
+    tracemalloc.stop()
+    return statistics.median(durations), statistics.median(peaks)
+
+
+async def main() -> None:
+    """Run all scenarios and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=100_000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    local = LocalGateway("user", "password", "localhost")
+    local.token = "token"  # noqa: S105
+    local.token_expires_at = float("inf")
+    cloud = OpenMoticsCloud("token", installation_id=12)
+
+    scenarios = {
+        "local command": lambda: prepare_local(local),
+        "cloud command": lambda: prepare_cloud(cloud),
+        "headers dict per request": lambda: rebuild_headers(cloud),
+    }
+    for name, prepare in scenarios.items():
+        per_call, allocated = await measure(prepare, args.calls, args.runs)
+        print(f"{name:<26} {per_call:8.2f} us {allocated:8.0f} B peak")  # noqa: T201
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
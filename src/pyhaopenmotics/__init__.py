@@ -1,26 +1,53 @@
 """Module HTTP communication with the OpenMotics API."""
 
-from pyhaopenmotics.cloud.models import Installation
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from pyhaopenmotics.helpers.lazy import lazy_module
 
 from .errors import (
     AuthenticationError,
+    OpenMoticsCircuitOpenError,
     OpenMoticsConnectionError,
     OpenMoticsConnectionSslError,
     OpenMoticsConnectionTimeoutError,
     OpenMoticsError,
+    OpenMoticsQueueFullError,
+    OpenMoticsUnsupportedError,
 )
-from .helpers import get_ssl_context
-from .localgateway import LocalGateway
-from .openmoticscloud import OpenMoticsCloud
+
+if TYPE_CHECKING:
+    from pyhaopenmotics.client.localgateway import LocalGateway
+    from pyhaopenmotics.client.openmoticscloud import OpenMoticsCloud
+    from pyhaopenmotics.client.sync import SyncClient
+    from pyhaopenmotics.cloud.models.installation import Installation
+    from pyhaopenmotics.helpers import get_ssl_context
+
+# Attributes are imported on first access (PEP 562), so importing the
+# package does not pull in every submodule and its dependencies.
+_LAZY_IMPORTS = {
+    "Installation": "pyhaopenmotics.cloud.models.installation",
+    "get_ssl_context": "pyhaopenmotics.helpers",
+    "LocalGateway": "pyhaopenmotics.client.localgateway",
+    "OpenMoticsCloud": "pyhaopenmotics.client.openmoticscloud",
+    "SyncClient": "pyhaopenmotics.client.sync",
+}
 
 __all__ = [
     "AuthenticationError",
     "Installation",
     "LocalGateway",
+    "OpenMoticsCircuitOpenError",
     "OpenMoticsCloud",
     "OpenMoticsConnectionError",
     "OpenMoticsConnectionSslError",
     "OpenMoticsConnectionTimeoutError",
     "OpenMoticsError",
+    "OpenMoticsQueueFullError",
+    "OpenMoticsUnsupportedError",
+    "SyncClient",
     "get_ssl_context",
 ]
+
+__getattr__, __dir__ = lazy_module(__name__, _LAZY_IMPORTS)
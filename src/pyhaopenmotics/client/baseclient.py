@@ -3,51 +3,94 @@
 from __future__ import annotations
 
 # import abc
+import asyncio
+import contextlib
 import logging
 import socket
+import time
+from functools import partial
 from typing import TYPE_CHECKING, Any
 
 import aiohttp
 import async_timeout
 import backoff
+from multidict import CIMultiDict, CIMultiDictProxy
 
 # import websockets
 from yarl import URL
 
 from pyhaopenmotics.__version__ import __version__
-from pyhaopenmotics.client.errors import (
+from pyhaopenmotics.client.cache import DEFAULT_CACHE_TTL, ResponseCache
+from pyhaopenmotics.client.health import LatencyTracker, health_registry, latency_key
+from pyhaopenmotics.client.scheduler import request_priority
+from pyhaopenmotics.errors import (
     AuthenticationError,
+    OpenMoticsCircuitOpenError,
     OpenMoticsConnectionError,
     OpenMoticsConnectionSslError,
     OpenMoticsConnectionTimeoutError,
 )
+from pyhaopenmotics.helpers.features import error_status
+from pyhaopenmotics.helpers.index import EntityIndex
 
 if TYPE_CHECKING:
     import ssl
-    from collections.abc import Awaitable, Callable
+    from collections.abc import Awaitable, Callable, Mapping
     from typing import Self
 
+    from pyhaopenmotics.client.health import CircuitBreaker, HealthRegistry
+    from pyhaopenmotics.client.http2 import Http2Transport
+    from pyhaopenmotics.client.scheduler import RequestScheduler
+
 _LOGGER = logging.getLogger(__name__)
 
 StrOrURL = str | URL
 
 
+# Client errors worth retrying: request timeout and too many requests.
+_RETRIED_CLIENT_ERRORS = (408, 429)
+
+
+def _giveup(exception: Exception) -> bool:
+    """Do not retry requests refused by an open circuit or by the API itself.
+
+    A client error, such as the 404 of an unknown action, gets the same
+    answer on every try.
+    """
+    if isinstance(exception, OpenMoticsCircuitOpenError):
+        return True
+    status = error_status(exception)
+    return status is not None and 400 <= status < 500 and status not in _RETRIED_CLIENT_ERRORS
+
+
 class BaseClient:
-    """Docstring."""
+    """Client core shared by LocalGateway and OpenMoticsCloud.
+
+    All requests go through ``_request``, so retries, timeouts, token
+    handling and SSL set-up behave the same for both clients.
+    """
 
     _wsclient: aiohttp.ClientWebSocketResponse | None = None
     _close_session: bool = False
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         *,
         token: str | None = None,
-        request_timeout: int = 8,
+        request_timeout: float = 8,
         session: aiohttp.client.ClientSession | None = None,
         token_refresh_method: Callable[[], Awaitable[str]] | None = None,
         verify_ssl: bool = False,
         ssl_context: ssl.SSLContext | None = None,
         port: int = 443,
+        adaptive_timeout: bool = True,
+        hedge_requests: bool = False,
+        circuit_breaker: CircuitBreaker | None = None,
+        health: HealthRegistry | None = None,
+        http2: bool = False,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+        cache_ttls: dict[str, float] | None = None,
+        scheduler: RequestScheduler | None = None,
     ) -> None:
         """Initialize connection with the OpenMotics LocalGateway API.
 
@@ -62,6 +105,21 @@ class BaseClient:
             tls: True, when TLS/SSL should be used.
             username: Username for HTTP auth, if enabled.
             ssl_context: ssl.SSLContext.
+            adaptive_timeout: derive the timeout of each action from its observed
+                latency, request_timeout being the upper bound.
+            hedge_requests: send a second request when an idempotent read takes
+                longer than its p95 latency, and use whichever answers first.
+            circuit_breaker: CircuitBreaker, taken from the health registry if omitted.
+            health: HealthRegistry shared with the other clients of the same gateway,
+                the registry of the process is used if omitted.
+            http2: multiplex all requests over a single HTTP/2 connection (httpx)
+                instead of the aiohttp session, requires the http2 extra.
+            cache_ttl: seconds a read response is reused, 0 only de-duplicates
+                concurrent reads.
+            cache_ttls: cache_ttl per action or path.
+            scheduler: RequestScheduler limiting the concurrent requests per class,
+                share it between the clients of a gateway to limit them together.
+                Requests are not scheduled if omitted.
 
         """
         self.user_agent = f"PyHAOpenMotics/{__version__}"
@@ -76,14 +134,103 @@ class BaseClient:
 
         self.token_refresh_method = token_refresh_method
 
-    @backoff.on_exception(backoff.expo, OpenMoticsConnectionError, max_tries=3, logger=None)
+        self.adaptive_timeout = adaptive_timeout
+        self.hedge_requests = hedge_requests
+        self.latency = LatencyTracker()
+        self.health = health_registry if health is None else health
+        self._circuit_breaker = circuit_breaker
+        self.http2 = http2
+        self._http2_transport: Http2Transport | None = None
+        self.cache = ResponseCache(ttl=cache_ttl, ttls=cache_ttls)
+        self.scheduler = scheduler
+
+        # Latest state of all entities, fed by the get_all methods of the domains.
+        self.indexes: dict[int | None, EntityIndex] = {}
+        # Header sets by name, with the token they were built for.
+        self._header_sets: dict[str, tuple[str | None, CIMultiDictProxy[str]]] = {}
+
+    @property
+    def circuit_breaker(self) -> CircuitBreaker:
+        """Return the circuit breaker of the gateway.
+
+        Clients of the same gateway share the breaker from the health registry,
+        so they all fail fast once one of them opened the circuit.
+
+        Returns
+        -------
+            CircuitBreaker
+
+        """
+        if self._circuit_breaker is None:
+            self._circuit_breaker = self.health.get(self._health_key())
+        return self._circuit_breaker
+
+    def _health_key(self) -> str:
+        """Return the key of the gateway in the health registry.
+
+        Returns
+        -------
+            str
+
+        """
+        # Base class should implement this
+        raise NotImplementedError
+
+    @property
+    def index(self) -> EntityIndex:
+        """Return the latest state of the entities the requests are about.
+
+        Returns
+        -------
+            EntityIndex
+
+        """
+        return self.index_for(self._index_key())
+
+    def index_for(self, installation_id: int | None) -> EntityIndex:
+        """Return the entity index of an installation.
+
+        Ids are only unique within an installation, so every installation
+        has its own index.
+
+        Args:
+        ----
+            installation_id: int, None for a local gateway
+
+        Returns:
+        -------
+            EntityIndex
+
+        """
+        if (index := self.indexes.get(installation_id)) is None:
+            index = self.indexes[installation_id] = EntityIndex()
+        return index
+
+    def _index_key(self) -> int | None:
+        """Return the installation the requests go to, see index_for.
+
+        Returns
+        -------
+            None, a local gateway is a single installation
+
+        """
+        return None
+
+    @backoff.on_exception(
+        backoff.expo,
+        OpenMoticsConnectionError,
+        max_tries=3,
+        giveup=_giveup,
+        logger=None,
+    )
     async def _request(
         self,
         path: str,
         *,
         method: str = aiohttp.hdrs.METH_POST,
-        data: dict[str, Any] | None = None,
-        headers: dict[str, Any] | None = None,
+        data: dict[str, Any] | bytes | None = None,
+        headers: Mapping[str, str] | None = None,
+        params: dict[str, Any] | None = None,
         scheme: str = "https",
         **kwargs: Any,
     ) -> Any:
@@ -96,8 +243,9 @@ class BaseClient:
         ----
             path: path
             method: post
-            data: dict
+            data: dict, or an encoded body
             headers: dict
+            params: dict
             scheme: str
             **kwargs: extra args
 
@@ -112,9 +260,15 @@ class BaseClient:
             OpenMoticsConnectionSslError: Error with SSL certificates.
             OpenMoticsConnectionTimeoutError: A timeout occurred while communicating
                 with the OpenMotics API.
+            OpenMoticsCircuitOpenError: The API failed too often recently, the
+                request was not sent.
+            OpenMoticsQueueFullError: The scheduler has too many requests of the
+                same priority waiting for the gateway.
             AuthenticationException: raised when token is expired.
 
         """
+        self.circuit_breaker.check()
+
         if self.token_refresh_method is not None:
             self.token = await self.token_refresh_method()
 
@@ -123,18 +277,144 @@ class BaseClient:
             scheme=scheme,
         )
 
-        if self.session is None:
-            self.session = aiohttp.ClientSession()
+        if self.http2:
+            if self._http2_transport is None:
+                from pyhaopenmotics.client.http2 import (  # pylint: disable=import-outside-toplevel
+                    Http2Transport,
+                )
+
+                self._http2_transport = Http2Transport(ssl_context=self.ssl_context)
+        elif self.session is None:
+            self.session = aiohttp.ClientSession(headers={aiohttp.hdrs.USER_AGENT: self.user_agent})
             self._close_session = True
 
+        if params:
+            params = {key: str(value).lower() if isinstance(value, bool) else value for key, value in params.items()}
+
+        key = latency_key(method, path)
+        timeout = self.request_timeout
+        if self.adaptive_timeout:
+            timeout = self.latency.timeout_for(key, self.request_timeout)
+
+        send = partial(
+            self._send_http2 if self.http2 else self._send,
+            method,
+            url,
+            request_timeout=timeout,
+            data=data,
+            params=params,
+            headers=headers,
+            **kwargs,
+        )
+
+        idempotent = self._is_idempotent(method, path)
+        slot = (
+            contextlib.nullcontext()
+            if self.scheduler is None
+            else self.scheduler.slot(request_priority(path, idempotent=idempotent))
+        )
+        async with slot:
+            start = time.monotonic()
+            if self.hedge_requests and idempotent and (delay := self.latency.hedge_delay(key)):
+                result = await self._hedged(send, delay)
+            else:
+                result = await send()
+            elapsed = time.monotonic() - start
+        self.latency.record(key, elapsed)
+        self.circuit_breaker.record_latency(elapsed)
+        return result
+
+    @staticmethod
+    def _is_idempotent(method: str, path: str) -> bool:
+        """Return True when a request only reads data.
+
+        Args:
+        ----
+            method: HTTP method
+            path: action or path
+
+        Returns:
+        -------
+            bool
+
+        """
+        if method == aiohttp.hdrs.METH_GET:
+            return True
+        return path.startswith("get_")
+
+    async def _hedged(
+        self,
+        send: Callable[[], Awaitable[Any]],
+        delay: float,
+    ) -> Any:
+        """Send a request, and a second one if the first is slower than delay.
+
+        Args:
+        ----
+            send: coroutine function sending the request
+            delay: seconds to wait before the second request
+
+        Returns:
+        -------
+            The response of whichever request succeeds first.
+
+        """
+        pending = {asyncio.ensure_future(send())}
+        done, pending = await asyncio.wait(pending, timeout=delay)
+        if not done:
+            pending.add(asyncio.ensure_future(send()))
+        error: BaseException | None = None
+        try:
+            while True:
+                for task in done:
+                    if (exception := task.exception()) is None:
+                        return task.result()
+                    error = exception
+                if not pending:
+                    break
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in pending:
+                task.cancel()
+        raise error  # type: ignore[misc]
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        *,
+        request_timeout: float,
+        **kwargs: Any,
+    ) -> Any:
+        """Send a single request and read its response.
+
+        Args:
+        ----
+            method: HTTP method
+            url: str
+            request_timeout: seconds
+            **kwargs: extra args for aiohttp
+
+        Returns:
+        -------
+            response json or text
+
+        Raises:
+        ------
+            OpenMoticsConnectionError: An error occurred while communication with
+                the OpenMotics API.
+            OpenMoticsConnectionSslError: Error with SSL certificates.
+            OpenMoticsConnectionTimeoutError: A timeout occurred while communicating
+                with the OpenMotics API.
+            AuthenticationException: raised when token is expired.
+
+        """
         try:
-            async with async_timeout.timeout(self.request_timeout):
-                resp = await self.session.request(
+            async with async_timeout.timeout(request_timeout):
+                resp = await self.session.request(  # type: ignore[union-attr]
                     method,
                     url,
-                    data=data,
                     ssl=self.ssl_context,  # pyright: ignore [reportArgumentType]
-                    headers=headers,
                     **kwargs,
                 )
 
@@ -149,6 +429,7 @@ class BaseClient:
             resp.raise_for_status()
 
         except TimeoutError as exception:
+            self.circuit_breaker.record_failure()
             msg = "Timeout occurred while connecting to OpenMotics API."
             raise OpenMoticsConnectionTimeoutError(msg) from exception
         except aiohttp.ClientConnectorSSLError as exception:
@@ -156,19 +437,95 @@ class BaseClient:
             msg = "Error with SSL certificate."
             raise OpenMoticsConnectionSslError(msg) from exception
         except aiohttp.ClientResponseError as exception:
+            # The gateway answered, so it is healthy.
+            self.circuit_breaker.record_success()
             if exception.status in [401, 403]:
                 raise AuthenticationError from exception
             msg = "Error occurred while communicating with OpenMotics API."
             raise OpenMoticsConnectionError(msg) from exception
         except (socket.gaierror, aiohttp.ClientError) as exception:
+            self.circuit_breaker.record_failure()
             msg = "Error occurred while communicating with OpenMotics API."
             raise OpenMoticsConnectionError(msg) from exception
 
+        self.circuit_breaker.record_success()
+
         if "application/json" in resp.headers.get("Content-Type", ""):
             return await resp.json()
 
         return await resp.text()
 
+    async def _send_http2(
+        self,
+        method: str,
+        url: str,
+        *,
+        request_timeout: float,
+        **kwargs: Any,
+    ) -> Any:
+        """Send a single request over the HTTP/2 transport and read its response.
+
+        Errors are mapped like in ``_send``, so both transports behave the same
+        towards the callers, the retries and the circuit breaker.
+
+        Args:
+        ----
+            method: HTTP method
+            url: str
+            request_timeout: seconds
+            **kwargs: data, json, params and headers of the request
+
+        Returns:
+        -------
+            response json or text
+
+        Raises:
+        ------
+            OpenMoticsConnectionError: An error occurred while communication with
+                the OpenMotics API.
+            OpenMoticsConnectionTimeoutError: A timeout occurred while communicating
+                with the OpenMotics API.
+            AuthenticationException: raised when token is expired.
+
+        """
+        from pyhaopenmotics.client import http2  # pylint: disable=import-outside-toplevel
+
+        try:
+            resp = await self._http2_transport.request(  # type: ignore[union-attr]
+                method,
+                url,
+                request_timeout=request_timeout,
+                **{key: value for key, value in kwargs.items() if value is not None},
+            )
+        except http2.TimeoutException as exception:
+            self.circuit_breaker.record_failure()
+            msg = "Timeout occurred while connecting to OpenMotics API."
+            raise OpenMoticsConnectionTimeoutError(msg) from exception
+        except http2.HTTPStatusError as exception:
+            # The gateway answered, so it is healthy.
+            self.circuit_breaker.record_success()
+            _LOGGER.debug(
+                "Request with status=%s, body=%s",
+                exception.response.status_code,
+                exception.response.text,
+            )
+            if exception.response.status_code in [401, 403]:
+                raise AuthenticationError from exception
+            msg = "Error occurred while communicating with OpenMotics API."
+            raise OpenMoticsConnectionError(msg) from exception
+        except http2.TransportError as exception:
+            self.circuit_breaker.record_failure()
+            msg = "Error occurred while communicating with OpenMotics API."
+            raise OpenMoticsConnectionError(msg) from exception
+
+        self.circuit_breaker.record_success()
+        _LOGGER.debug("Request with status=%s, body=%s", resp.status_code, resp.text)
+
+        if "application/json" in resp.headers.get("Content-Type", ""):
+            return resp.json()
+
+        return resp.text
+
     # @property
     # def token(self) -> str:
     #     return self.token
@@ -203,7 +560,7 @@ class BaseClient:
     async def _get_auth_headers(
         self,
         headers: dict[str, Any] | None = None,
-    ) -> dict[str, Any]:
+    ) -> Mapping[str, str]:
         """Update the auth headers to include a working token.
 
         Args:
@@ -218,17 +575,61 @@ class BaseClient:
         # Base class should implement this
         raise NotImplementedError
 
+    def _header_set(self, name: str, build: Callable[[str | None], dict[str, str]]) -> CIMultiDictProxy[str]:
+        """Return a set of headers, built once per token.
+
+        The set is immutable, so it is shared by all requests until the token
+        changes. aiohttp takes it without converting it first.
+
+        Args:
+        ----
+            name: name of the set, e.g. "auth"
+            build: returns the headers for a token
+
+        Returns:
+        -------
+            CIMultiDictProxy
+
+        """
+        cached = self._header_sets.get(name)
+        if cached is None or cached[0] != self.token:
+            cached = self._header_sets[name] = (self.token, CIMultiDictProxy(CIMultiDict(build(self.token))))
+        return cached[1]
+
+    @staticmethod
+    def _merge_headers(header_set: CIMultiDictProxy[str], headers: dict[str, Any] | None) -> Mapping[str, str]:
+        """Return a header set, extended with the headers of a caller.
+
+        Args:
+        ----
+            header_set: CIMultiDictProxy
+            headers: extra headers, the header set wins on conflicts
+
+        Returns:
+        -------
+            The header set itself without extra headers, else a new CIMultiDict.
+
+        """
+        if not headers:
+            return header_set
+        merged = CIMultiDict(headers)
+        merged.update(header_set)
+        return merged
+
     async def close(self) -> None:
         """Close open client session."""
         if self.session and self._close_session:
             await self.session.close()
+        if self._http2_transport is not None:
+            await self._http2_transport.close()
+            self._http2_transport = None
 
     async def __aenter__(self) -> Self:
         """Async enter.
 
         Returns
         -------
-            LocalGateway: The LocalGateway object.
+            The client object.
 
         """
         return self
@@ -0,0 +1,203 @@
+"""Short-lived cache of read responses, with in-flight de-duplication.
+
+Reads of the same action or path within the TTL share a single request:
+callers arriving while the request is in flight await the same response,
+later callers get the cached one. A command invalidates the reads of the
+domain it touches, e.g. ``set_output`` invalidates ``get_output_status``,
+so a read after a command always reaches the gateway.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+# Seconds a read response is reused, unless overridden per action or path.
+DEFAULT_CACHE_TTL = 0.5
+
+# Local commands (by prefix) and the reads (by prefix) they invalidate.
+# Commands that are not listed invalidate every read.
+ACTION_INVALIDATIONS: dict[str, tuple[str, ...]] = {
+    "set_output": ("get_output_",),
+    "set_all_lights": ("get_output_",),
+    "do_shutter_": ("get_shutter_",),
+    "set_shutter": ("get_shutter_",),
+    "set_input": ("get_input_",),
+    "set_sensor": ("get_sensor_",),
+    "set_thermostat": ("get_thermostat_",),
+    "set_current_setpoint": ("get_thermostat_",),
+    "set_per_thermostat_mode": ("get_thermostat_",),
+    "set_airco_status": ("get_thermostat_", "get_airco_status"),
+}
+
+# Cloud domains whose entities are also exposed by other domains.
+CLOUD_RELATED_DOMAINS: dict[str, tuple[str, ...]] = {
+    "outputs": ("lights",),
+    "lights": ("outputs",),
+    "thermostats": ("sensors",),
+}
+# Cloud domains whose commands may touch any entity of the installation.
+CLOUD_GLOBAL_DOMAINS = frozenset({"groupactions", "scenes"})
+
+
+def cache_key(name: str, params: dict[str, Any] | None = None) -> str:
+    """Return the key of a read in the cache.
+
+    Args:
+    ----
+        name: action or path
+        params: data or query parameters of the request
+
+    Returns:
+    -------
+        str
+
+    """
+    if not params:
+        return name
+    return f"{name}?{sorted(params.items())}"
+
+
+def invalidated_actions(action: str) -> tuple[str, ...]:
+    """Return the prefixes of the local reads a command invalidates.
+
+    Args:
+    ----
+        action: e.g. set_output
+
+    Returns:
+    -------
+        tuple of action prefixes, ("",) for all reads
+
+    """
+    for command, reads in ACTION_INVALIDATIONS.items():
+        if action.startswith(command):
+            return reads
+    return ("",)
+
+
+def invalidated_paths(path: str) -> tuple[str, ...]:
+    """Return the prefixes of the cloud reads a POST invalidates.
+
+    A command invalidates all reads of its domain in the same installation,
+    e.g. ``/base/installations/1/outputs/2/turn_on`` invalidates
+    ``/base/installations/1/outputs`` and ``/base/installations/1/outputs/2``.
+
+    Args:
+    ----
+        path: path of the POST
+
+    Returns:
+    -------
+        tuple of path prefixes, ("",) for all reads
+
+    """
+    segments = path.strip("/").split("/")
+    if len(segments) < 4 or segments[:2] != ["base", "installations"]:
+        return ("",)
+    installation = "/" + "/".join(segments[:3])
+    domain = segments[3]
+    if domain in CLOUD_GLOBAL_DOMAINS:
+        return (installation,)
+    return tuple(f"{installation}/{name}" for name in (domain, *CLOUD_RELATED_DOMAINS.get(domain, ())))
+
+
+class ResponseCache:
+    """Responses of reads by key, valid for a short TTL.
+
+    Responses are not copied: every caller of the same read gets the same
+    parsed JSON object, from the cache or from the request in flight. They
+    must be treated as read-only, build new dicts instead of changing them
+    (``merge_dicts`` does).
+    """
+
+    def __init__(self, ttl: float = DEFAULT_CACHE_TTL, ttls: dict[str, float] | None = None) -> None:
+        """Init the cache.
+
+        Args:
+        ----
+            ttl: seconds a response is reused, 0 only de-duplicates concurrent reads
+            ttls: TTL per action or path, overriding ttl
+
+        """
+        self.ttl = ttl
+        self.ttls = ttls or {}
+        # key: (name, expires at, response)
+        self._entries: dict[str, tuple[str, float, Any]] = {}
+        # key: (name, task sending the request)
+        self._inflight: dict[str, tuple[str, asyncio.Task[Any]]] = {}
+
+    def ttl_for(self, name: str) -> float:
+        """Return the TTL of an action or path.
+
+        Args:
+        ----
+            name: action or path
+
+        Returns:
+        -------
+            seconds
+
+        """
+        return self.ttls.get(name, self.ttl)
+
+    async def fetch(self, name: str, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached response, or fetch it once for all concurrent callers.
+
+        Args:
+        ----
+            name: action or path, used for the TTL and invalidation
+            key: name plus the parameters of the request
+            fetch: coroutine function sending the request
+
+        Returns:
+        -------
+            The response, shared with the other callers, do not modify it.
+
+        """
+        if (entry := self._entries.get(key)) is not None:
+            if entry[1] > time.monotonic():
+                return entry[2]
+            del self._entries[key]
+
+        if (inflight := self._inflight.get(key)) is not None:
+            return await asyncio.shield(inflight[1])
+
+        task: asyncio.Task[Any] = asyncio.get_running_loop().create_task(fetch())
+        self._inflight[key] = (name, task)
+        task.add_done_callback(partial(self._store, key, name))
+        # A cancelled caller does not cancel the request the others wait for.
+        return await asyncio.shield(task)
+
+    def _store(self, key: str, name: str, task: asyncio.Task[Any]) -> None:
+        """Cache the response of a finished request."""
+        if self._inflight.get(key, (None, None))[1] is not task:
+            # Invalidated while in flight, the response may be stale.
+            return
+        del self._inflight[key]
+        if task.cancelled() or task.exception() is not None:
+            return
+        if (ttl := self.ttl_for(name)) > 0:
+            self._entries[key] = (name, time.monotonic() + ttl, task.result())
+
+    def invalidate(self, *prefixes: str) -> None:
+        """Drop the cached and in-flight responses of actions or paths.
+
+        Args:
+        ----
+            *prefixes: prefixes of the actions or paths, "" for all
+
+        """
+        for store in (self._entries, self._inflight):
+            for key in [key for key, value in store.items() if value[0].startswith(prefixes)]:
+                del store[key]
+
+    def clear(self) -> None:
+        """Drop all responses."""
+        self._entries.clear()
+        self._inflight.clear()
@@ -1,21 +1,27 @@
-"""Exceptions for the OpenMotics API."""
-
-
-class OpenMoticsError(Exception):
-    """Generic OpenMotics exception."""
-
-
-class OpenMoticsConnectionSslError(OpenMoticsError):
-    """OpenMotics connection SSL exception."""
-
-
-class OpenMoticsConnectionError(OpenMoticsError):
-    """OpenMotics connection exception."""
-
-
-class OpenMoticsConnectionTimeoutError(OpenMoticsConnectionError):
-    """OpenMotics connection Timeout exception."""
-
-
-class AuthenticationError(Exception):
-    """Exception is raised when the user credentials are not valid."""
+"""Exceptions for the OpenMotics API.
+
+The exceptions are defined once in ``pyhaopenmotics.errors``, so the same
+classes are raised whichever import path is used.
+"""
+
+from pyhaopenmotics.errors import (
+    AuthenticationError,
+    OpenMoticsCircuitOpenError,
+    OpenMoticsConnectionError,
+    OpenMoticsConnectionSslError,
+    OpenMoticsConnectionTimeoutError,
+    OpenMoticsError,
+    OpenMoticsQueueFullError,
+    OpenMoticsUnsupportedError,
+)
+
+__all__ = [
+    "AuthenticationError",
+    "OpenMoticsCircuitOpenError",
+    "OpenMoticsConnectionError",
+    "OpenMoticsConnectionSslError",
+    "OpenMoticsConnectionTimeoutError",
+    "OpenMoticsError",
+    "OpenMoticsQueueFullError",
+    "OpenMoticsUnsupportedError",
+]
@@ -0,0 +1,316 @@
+"""Latency tracking and circuit breaking for the OpenMotics clients."""
+
+from __future__ import annotations
+
+import math
+import re
+import time
+from collections import deque
+from typing import Any
+
+from pyhaopenmotics.errors import OpenMoticsCircuitOpenError
+
+# Number of latency samples kept per action.
+LATENCY_WINDOW = 50
+# Samples needed before the observed latency is trusted.
+LATENCY_MIN_SAMPLES = 10
+# The adaptive timeout is this multiple of the observed p99 latency.
+TIMEOUT_P99_FACTOR = 3.0
+# Lower bound of the adaptive timeout, in seconds.
+MIN_TIMEOUT = 1.0
+
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_TIMEOUT = 30.0
+# Weight of the latest sample in the latency EWMA.
+LATENCY_EWMA_ALPHA = 0.2
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+_ID_RE = re.compile(r"\d+")
+
+
+def latency_key(method: str, path: str) -> str:
+    """Return the key under which the latency of a request is tracked.
+
+    Ids in paths are collapsed, so all requests to the same endpoint share
+    their statistics.
+
+    Args:
+    ----
+        method: HTTP method
+        path: action or path of the request
+
+    Returns:
+    -------
+        str
+
+    """
+    return f"{method} {_ID_RE.sub('{id}', path)}"
+
+
+class LatencyTracker:
+    """Observed latency per action, used for timeouts and hedging."""
+
+    def __init__(self, window: int = LATENCY_WINDOW) -> None:
+        """Init the tracker.
+
+        Args:
+        ----
+            window: number of samples kept per action
+
+        """
+        self.window = window
+        self._samples: dict[str, deque[float]] = {}
+
+    def record(self, key: str, duration: float) -> None:
+        """Record the duration of a successful request.
+
+        Args:
+        ----
+            key: latency key of the request
+            duration: seconds
+
+        """
+        if (samples := self._samples.get(key)) is None:
+            samples = self._samples[key] = deque(maxlen=self.window)
+        samples.append(duration)
+
+    def percentile(self, key: str, percentile: float) -> float | None:
+        """Return a latency percentile of an action.
+
+        Args:
+        ----
+            key: latency key of the request
+            percentile: 0 - 100
+
+        Returns:
+        -------
+            Seconds, or None when too few samples are known.
+
+        """
+        samples = self._samples.get(key)
+        if samples is None or len(samples) < LATENCY_MIN_SAMPLES:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, math.ceil(percentile / 100 * len(ordered)) - 1)
+        return ordered[max(index, 0)]
+
+    def timeout_for(self, key: str, max_timeout: float) -> float:
+        """Return the timeout for the next request of an action.
+
+        Args:
+        ----
+            key: latency key of the request
+            max_timeout: the configured request timeout
+
+        Returns:
+        -------
+            Seconds.
+
+        """
+        if (p99 := self.percentile(key, 99)) is None:
+            return max_timeout
+        return min(max_timeout, max(MIN_TIMEOUT, p99 * TIMEOUT_P99_FACTOR))
+
+    def hedge_delay(self, key: str) -> float | None:
+        """Return after how long a hedged request is sent.
+
+        Args:
+        ----
+            key: latency key of the request
+
+        Returns:
+        -------
+            The p95 latency in seconds, or None when unknown.
+
+        """
+        return self.percentile(key, 95)
+
+
+class CircuitBreaker:
+    """Health of a gateway, failing fast when it keeps failing.
+
+    After ``failure_threshold`` consecutive transport failures the circuit
+    opens and requests are refused without touching the network. Once
+    ``reset_timeout`` seconds passed the circuit is half-open: a single
+    probe request is let through while the others are still refused. A
+    successful probe closes the circuit, a failed one opens it again.
+
+    Besides the circuit state, the latency EWMA and the time of the last
+    success are kept, so the health of a gateway can be inspected.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = CIRCUIT_RESET_TIMEOUT,
+    ) -> None:
+        """Init the circuit breaker.
+
+        Args:
+        ----
+            failure_threshold: consecutive failures before the circuit opens
+            reset_timeout: seconds before a probe request is let through
+
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.probe_started_at: float | None = None
+        self.latency_ewma: float | None = None
+        self.last_success: float | None = None
+        self.last_failure: float | None = None
+
+    @property
+    def state(self) -> str:
+        """Return the state of the circuit.
+
+        Returns
+        -------
+            STATE_CLOSED, STATE_OPEN or STATE_HALF_OPEN
+
+        """
+        if self.opened_at is None:
+            return STATE_CLOSED
+        if time.monotonic() - self.opened_at < self.reset_timeout:
+            return STATE_OPEN
+        return STATE_HALF_OPEN
+
+    @property
+    def is_open(self) -> bool:
+        """Return True while requests are refused.
+
+        Returns
+        -------
+            bool
+
+        """
+        return self.state == STATE_OPEN
+
+    def check(self) -> None:
+        """Raise when the request may not be sent.
+
+        In half-open state only one probe at a time is allowed. A probe that
+        never reported back is replaced after ``reset_timeout`` seconds.
+
+        Raises
+        ------
+            OpenMoticsCircuitOpenError: The gateway failed too often recently.
+
+        """
+        state = self.state
+        if state == STATE_CLOSED:
+            return
+        now = time.monotonic()
+        if state == STATE_HALF_OPEN and (self.probe_started_at is None or now - self.probe_started_at >= self.reset_timeout):
+            self.probe_started_at = now
+            return
+        msg = "Circuit open: the OpenMotics API failed too often, not sending the request."
+        raise OpenMoticsCircuitOpenError(msg)
+
+    def record_success(self) -> None:
+        """Close the circuit."""
+        self.failures = 0
+        self.opened_at = None
+        self.probe_started_at = None
+        self.last_success = time.time()
+
+    def record_failure(self) -> None:
+        """Count a failure and open the circuit when the threshold is reached."""
+        self.failures += 1
+        self.last_failure = time.time()
+        self.probe_started_at = None
+        if self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+    def record_latency(self, duration: float) -> None:
+        """Update the latency EWMA with a successful request.
+
+        Args:
+        ----
+            duration: seconds
+
+        """
+        if self.latency_ewma is None:
+            self.latency_ewma = duration
+        else:
+            self.latency_ewma += LATENCY_EWMA_ALPHA * (duration - self.latency_ewma)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the health as a dict.
+
+        Returns
+        -------
+            dict
+
+        """
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "latency_ewma": self.latency_ewma,
+            "last_success": self.last_success,
+            "last_failure": self.last_failure,
+        }
+
+
+class HealthRegistry:
+    """Circuit breakers shared by all clients talking to the same gateway.
+
+    Every client that polls a gateway benefits from what the others
+    learned: once one of them opened the circuit, the others fail fast
+    instead of each waiting for its own timeouts and retries.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = CIRCUIT_RESET_TIMEOUT,
+    ) -> None:
+        """Init the registry.
+
+        Args:
+        ----
+            failure_threshold: consecutive failures before a circuit opens
+            reset_timeout: seconds before a probe request is let through
+
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def get(self, key: str) -> CircuitBreaker:
+        """Return the circuit breaker of a gateway, creating it if needed.
+
+        Args:
+        ----
+            key: identifies the gateway, e.g. host:port
+
+        Returns:
+        -------
+            CircuitBreaker
+
+        """
+        if (breaker := self._breakers.get(key)) is None:
+            breaker = self._breakers[key] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+        return breaker
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Return the health of all known gateways.
+
+        Returns
+        -------
+            dict of gateway key to health
+
+        """
+        return {key: breaker.as_dict() for key, breaker in self._breakers.items()}
+
+    def clear(self) -> None:
+        """Forget all gateways."""
+        self._breakers.clear()
+
+
+# Registry shared by all clients of this process.
+health_registry = HealthRegistry()
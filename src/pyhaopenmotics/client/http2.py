@@ -0,0 +1,91 @@
+"""Optional HTTP/2 transport, based on httpx.
+
+All requests of a client share a single TLS connection per host, on which
+they are multiplexed as HTTP/2 streams. Fanning out requests over many
+installations then no longer opens a connection per request.
+
+Requires the ``http2`` extra: ``pip install pyhaopenmotics[http2]``.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+try:
+    import httpx
+except ImportError as exception:  # pragma: no cover
+    msg = "HTTP/2 support requires httpx, install pyhaopenmotics[http2]."
+    raise ImportError(msg) from exception
+
+if TYPE_CHECKING:
+    import ssl
+
+__all__ = [
+    "HTTPStatusError",
+    "Http2Transport",
+    "TimeoutException",
+    "TransportError",
+]
+
+HTTPStatusError = httpx.HTTPStatusError
+TimeoutException = httpx.TimeoutException
+TransportError = httpx.TransportError
+
+
+class Http2Transport:
+    """Send requests over a multiplexed HTTP/2 connection."""
+
+    def __init__(
+        self,
+        *,
+        ssl_context: ssl.SSLContext | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        """Init the transport.
+
+        Args:
+        ----
+            ssl_context: ssl.SSLContext, the certificate is verified against the
+                default CAs when omitted, like aiohttp does.
+            transport: httpx transport replacing the HTTP/2 connections, e.g.
+                an httpx.MockTransport in tests.
+
+        """
+        self._client = httpx.AsyncClient(
+            http2=True,
+            verify=ssl_context if ssl_context is not None else True,
+            transport=transport,
+        )
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        request_timeout: float,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Send a request and read its response.
+
+        Args:
+        ----
+            method: HTTP method
+            url: str
+            request_timeout: seconds
+            **kwargs: data, json, params and headers of the request
+
+        Returns:
+        -------
+            httpx.Response
+
+        """
+        if isinstance(kwargs.get("data"), bytes):
+            # httpx sends raw bodies as content.
+            kwargs["content"] = kwargs.pop("data")
+        resp = await self._client.request(method, url, timeout=request_timeout, **kwargs)
+        resp.raise_for_status()
+        return resp
+
+    async def close(self) -> None:
+        """Close the connections."""
+        await self._client.aclose()
@@ -5,25 +5,32 @@ from __future__ import annotations
 import base64
 import logging
 import time
+from functools import cached_property, partial
 from typing import TYPE_CHECKING, Any
 
 import aiohttp
 from yarl import URL
 
 from pyhaopenmotics.client.baseclient import BaseClient
+from pyhaopenmotics.client.cache import DEFAULT_CACHE_TTL, cache_key, invalidated_actions
+from pyhaopenmotics.errors import OpenMoticsConnectionError
 from pyhaopenmotics.helpers import get_ssl_context
-from pyhaopenmotics.openmoticsgw.energy import OpenMoticsEnergySensors
-from pyhaopenmotics.openmoticsgw.groupactions import OpenMoticsGroupActions
-from pyhaopenmotics.openmoticsgw.inputs import OpenMoticsInputs
-from pyhaopenmotics.openmoticsgw.lights import OpenMoticsLights
-from pyhaopenmotics.openmoticsgw.outputs import OpenMoticsOutputs
-from pyhaopenmotics.openmoticsgw.sensors import OpenMoticsSensors
-from pyhaopenmotics.openmoticsgw.shutters import OpenMoticsShutters
-from pyhaopenmotics.openmoticsgw.thermostats import OpenMoticsThermostats
+from pyhaopenmotics.helpers.features import FeatureMap, is_unsupported_error
 
 if TYPE_CHECKING:
     import ssl
-    from typing import Self
+    from collections.abc import Mapping
+
+    from pyhaopenmotics.client.health import CircuitBreaker, HealthRegistry
+    from pyhaopenmotics.client.scheduler import RequestScheduler
+    from pyhaopenmotics.openmoticsgw.energy import OpenMoticsEnergySensors
+    from pyhaopenmotics.openmoticsgw.groupactions import OpenMoticsGroupActions
+    from pyhaopenmotics.openmoticsgw.inputs import OpenMoticsInputs
+    from pyhaopenmotics.openmoticsgw.lights import OpenMoticsLights
+    from pyhaopenmotics.openmoticsgw.outputs import OpenMoticsOutputs
+    from pyhaopenmotics.openmoticsgw.sensors import OpenMoticsSensors
+    from pyhaopenmotics.openmoticsgw.shutters import OpenMoticsShutters
+    from pyhaopenmotics.openmoticsgw.thermostats import OpenMoticsThermostats
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -34,17 +41,26 @@ CLOCK_OUT_OF_SYNC_MAX_SEC = 20
 class LocalGateway(BaseClient):
     """Docstring."""
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         username: str,
         password: str,
         localgw: str,
         *,
-        request_timeout: int = 8,
+        request_timeout: float = 8,
         session: aiohttp.client.ClientSession | None = None,
         verify_ssl: bool = False,
         ssl_context: ssl.SSLContext | None = None,
         port: int = 443,
+        tls: bool | None = None,
+        adaptive_timeout: bool = True,
+        hedge_requests: bool = False,
+        circuit_breaker: CircuitBreaker | None = None,
+        health: HealthRegistry | None = None,
+        features: FeatureMap | dict[str, Any] | None = None,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+        cache_ttls: dict[str, float] | None = None,
+        scheduler: RequestScheduler | None = None,
     ) -> None:
         """Initialize connection with the OpenMotics LocalGateway API.
 
@@ -55,16 +71,36 @@ class LocalGateway(BaseClient):
             port: Port on which the API runs, usually 3000.
             request_timeout: Max timeout to wait for a response from the API.
             session: Optional, shared, aiohttp client session.
-            tls: True, when TLS/SSL should be used.
             username: Username for HTTP auth, if enabled.
             ssl_context: ssl.SSLContext.
+            verify_ssl: True, when the certificate of the gateway should be verified.
+            tls: deprecated alias of verify_ssl.
+            adaptive_timeout: derive the timeout of each action from its observed latency.
+            hedge_requests: hedge slow idempotent reads with a second request.
+            circuit_breaker: CircuitBreaker, taken from the health registry if omitted.
+            health: HealthRegistry shared between clients, defaults to the one of the process.
+            features: FeatureMap (or its stored dict) of a previous session, saves the probe.
+            cache_ttl: seconds the response of a get_ action is reused.
+            cache_ttls: cache_ttl per action, e.g. {"get_sensor_status": 5}.
+            scheduler: RequestScheduler giving commands priority over bulk reads,
+                requests are not scheduled if omitted.
 
         """
+        if tls is not None:
+            verify_ssl = tls
+
         super().__init__(
             request_timeout=request_timeout,
             session=session,
             port=port,
             verify_ssl=verify_ssl,
+            adaptive_timeout=adaptive_timeout,
+            hedge_requests=hedge_requests,
+            circuit_breaker=circuit_breaker,
+            health=health,
+            cache_ttl=cache_ttl,
+            cache_ttls=cache_ttls,
+            scheduler=scheduler,
         )
 
         self.localgw = localgw
@@ -81,32 +117,97 @@ class LocalGateway(BaseClient):
             _LOGGER.debug("LocalGateway setting self.auth")
             self.auth = {"username": self.username, "password": self.password}
 
+        if isinstance(features, dict):
+            features = FeatureMap.from_dict(features)
+        self.features = FeatureMap() if features is None else features
+
     async def exec_action(
         self,
         path: str,
         data: dict[str, Any] | None = None,
         headers: dict[str, Any] | None = None,
+        *,
+        cached: bool = True,
     ) -> Any:
         """Make get request using the underlying aiohttp.ClientSession.
 
+        Reads (get_ actions) share their response through the cache, commands
+        invalidate the cached reads of their domain.
+
         Args:
         ----
             path: path
             data: dict
             headers: dict
+            cached: False to bypass the cache of reads, e.g. for a tight poll
 
         Returns:
         -------
             response json or text
 
         """
-        # Try to execute the action.
-        return await self._request(
-            path,
-            method=aiohttp.hdrs.METH_POST,
-            data=data,
-            headers=await self._get_auth_headers(headers),
-        )
+        if path.startswith("get_"):
+            if not cached:
+                return await self._exec_action(path, data, headers)
+            return await self.cache.fetch(path, cache_key(path, data), partial(self._exec_action, path, data, headers))
+        try:
+            return await self._exec_action(path, data, headers)
+        finally:
+            self.cache.invalidate(*invalidated_actions(path))
+
+    async def _exec_action(
+        self,
+        path: str,
+        data: dict[str, Any] | None = None,
+        headers: dict[str, Any] | None = None,
+    ) -> Any:
+        """Execute an action on the gateway, bypassing the cache.
+
+        Args:
+        ----
+            path: path
+            data: dict
+            headers: dict
+
+        Returns:
+        -------
+            response json or text
+
+        """
+        try:
+            return await self._request(
+                path,
+                method=aiohttp.hdrs.METH_POST,
+                data=data,
+                headers=await self._get_auth_headers(headers),
+            )
+        except OpenMoticsConnectionError as exception:
+            if is_unsupported_error(exception):
+                self.features.mark_unsupported(path)
+            raise
+
+    async def probe_features(self) -> FeatureMap:
+        """Ask the gateway which features it supports.
+
+        Gateways without the get_features action predate all optional features.
+
+        Returns
+        -------
+            FeatureMap
+
+        """
+        try:
+            resp = await self.exec_action("get_features")
+        except OpenMoticsConnectionError as exception:
+            if not is_unsupported_error(exception):
+                raise
+            resp = {}
+        if isinstance(resp, dict) and resp.get("success") is True:
+            self.features.features = set(resp.get("features", []))
+        else:
+            self.features.features = set()
+        _LOGGER.debug("Gateway features: %s", self.features.features)
+        return self.features
 
     async def get_token(self) -> None:
         """Login to the gateway: sets the token in the connector."""
@@ -117,10 +218,25 @@ class LocalGateway(BaseClient):
         if resp["success"] is True:
             self.token = resp["token"]
             self.token_expires_at = time.time() + LOCAL_TOKEN_EXPIRES_IN
+            if not self.features.probed:
+                try:
+                    await self.probe_features()
+                except OpenMoticsConnectionError:
+                    _LOGGER.debug("Probing the gateway features failed, retrying on the next login")
         else:
             self.token = None
             self.token_expires_at = 0
 
+    def _health_key(self) -> str:
+        """Return the key of the gateway in the health registry.
+
+        Returns
+        -------
+            host:port of the gateway
+
+        """
+        return f"{self.localgw}:{self.port}"
+
     async def _get_url(self, path: str, scheme: str = "https") -> str:
         """Update the auth headers to include a working token.
 
@@ -138,33 +254,43 @@ class LocalGateway(BaseClient):
             URL.build(scheme=scheme, host=self.localgw, port=self.port, path="/").join(URL(path)),
         )
 
-    # async def subscribe_webhook(self, installation_id: str) -> None:
-    #     """Register a webhook with OpenMotics for live updates.
+    async def subscribe_webhook(self, installation_id: str) -> None:
+        """Register a webhook with OpenMotics for live updates.
 
-    #     Args:
-    #     ----
+        Args:
+        ----
+            installation_id: int
 
-    #     """
-    #     # Register webhook
-    #     await self._request(
-    #         "/ws/events",
-    #             "types": [
-    #                 "OUTPUT_CHANGE",
-    #                 "SHUTTER_CHANGE",
-    #                 "THERMOSTAT_CHANGE",
-    #                 "THERMOSTAT_GROUP_CHANGE",
-    #             ],
-    #         },
-
-    # async def unsubscribe_webhook(self) -> None:
-    #     """Delete all webhooks for this application ID."""
-    #     await self._request(
-    #         "/ws/events",
+        """
+        # Register webhook
+        await self._request(
+            "/ws/events",
+            method=aiohttp.hdrs.METH_POST,
+            data={
+                "action": "set_subscription",
+                "types": [
+                    "OUTPUT_CHANGE",
+                    "SHUTTER_CHANGE",
+                    "THERMOSTAT_CHANGE",
+                    "THERMOSTAT_GROUP_CHANGE",
+                ],
+                "installation_ids": [installation_id],
+            },
+            headers=await self._get_auth_headers(),
+        )
+
+    async def unsubscribe_webhook(self) -> None:
+        """Delete all webhooks for this application ID."""
+        await self._request(
+            "/ws/events",
+            method=aiohttp.hdrs.METH_DELETE,
+            headers=await self._get_auth_headers(),
+        )
 
     async def _get_auth_headers(
         self,
         headers: dict[str, Any] | None = None,
-    ) -> dict[str, Any]:
+    ) -> Mapping[str, str]:
         """Update the auth headers to include a working token.
 
         Args:
@@ -173,23 +299,31 @@ class LocalGateway(BaseClient):
 
         Returns:
         -------
-            headers
+            headers, shared until the token changes when no extra headers are given
 
         """
         if self.token is None or self.token_expires_at < time.time() + CLOCK_OUT_OF_SYNC_MAX_SEC:
             await self.get_token()
 
-        if headers is None:
-            headers = {}
+        return self._merge_headers(self._header_set("auth", self._build_auth_headers), headers)
 
-        headers.update(
-            {
-                "User-Agent": self.user_agent,
-                "Accept": "application/json, text/plain, */*",
-                "Authorization": f"Bearer {self.token}",
-            },
-        )
-        return headers
+    def _build_auth_headers(self, token: str | None) -> dict[str, str]:
+        """Return the headers of the requests made with a token.
+
+        Args:
+        ----
+            token: str
+
+        Returns:
+        -------
+            headers
+
+        """
+        return {
+            "User-Agent": self.user_agent,
+            "Accept": "application/json, text/plain, */*",
+            "Authorization": f"Bearer {token}",
+        }
 
     async def _get_ws_connection_url(self) -> str:
         return await self._get_url(
@@ -200,7 +334,7 @@ class LocalGateway(BaseClient):
     async def _get_ws_headers(
         self,
         headers: dict[str, Any] | None = None,
-    ) -> dict[str, Any]:
+    ) -> Mapping[str, str]:
         """Update the auth headers to include a working token.
 
         Args:
@@ -209,38 +343,33 @@ class LocalGateway(BaseClient):
 
         Returns:
         -------
-            headers
+            headers, shared until the token changes when no extra headers are given
 
         """
         if self.token is None or self.token_expires_at < time.time() + CLOCK_OUT_OF_SYNC_MAX_SEC:
             await self.get_token()
 
-        if headers is None:
-            headers = {}
-
-        base64_message = str(base64.b64encode(self.token))
-
-        headers.update(
-            {
-                # "User-Agent": self.user_agent,
-                "Sec-WebSocket-Protocol": f"authorization.bearer.{base64_message}",
-                # "Sec-WebSocket-Extensions": "permessage-deflate",
-                # "host": self.localgw,
-                # "Origin": self.localgw,
-                "Connection": "Upgrade",
-                "Upgrade": "websocket",
-                # "accept-encoding": "gzip, deflate, br",
-                # "cache-control": "no-cache",
-                # "pragma": "no-cache",
-                # # "Sec-Fetch-Dest": "websocket",
-                # "Sec-Fetch-Mode": "websocket",
-                # "Sec-Fetch-site": "same-site",
-                # "user-agent": "User-Agent: Mozilla/5.0 (Windows NT 10.0; Win64; x64)
-                #    AppleWebKit/537.36 (KHTML, like Gecko)
-                #    Chrome/109.0.0.0 Safari/537.36",
-            },
-        )
-        return headers
+        return self._merge_headers(self._header_set("ws", self._build_ws_headers), headers)
+
+    @staticmethod
+    def _build_ws_headers(token: str | None) -> dict[str, str]:
+        """Return the headers of the websocket connections made with a token.
+
+        Args:
+        ----
+            token: str
+
+        Returns:
+        -------
+            headers
+
+        """
+        base64_message = base64.b64encode((token or "").encode()).decode()
+        return {
+            "Sec-WebSocket-Protocol": f"authorization.bearer.{base64_message}",
+            "Connection": "Upgrade",
+            "Upgrade": "websocket",
+        }
 
     # @property
     # def connected(self) -> bool:
@@ -343,37 +472,51 @@ class LocalGateway(BaseClient):
     #     except websockets.WebSocketException:
     #         pass
 
-    @property
+    @cached_property
     def inputs(self) -> OpenMoticsInputs:
         """Get outputs.
 
+        The instance is kept, so all subscribers share its input event engine.
+
         Returns
         -------
             OpenMoticsOutputs
 
         """
+        from pyhaopenmotics.openmoticsgw.inputs import OpenMoticsInputs  # pylint: disable=import-outside-toplevel
+
         return OpenMoticsInputs(self)
 
-    @property
+    @cached_property
     def outputs(self) -> OpenMoticsOutputs:
         """Get outputs.
 
+        The instance is kept, so the output configurations are only loaded once.
+
         Returns
         -------
             OpenMoticsOutputs
 
         """
+        from pyhaopenmotics.openmoticsgw.outputs import OpenMoticsOutputs  # pylint: disable=import-outside-toplevel
+
         return OpenMoticsOutputs(self)
 
-    @property
+    @cached_property
     def groupactions(self) -> OpenMoticsGroupActions:
         """Get groupactions.
 
+        The instance is kept, so the group action registry survives between calls.
+
         Returns
         -------
             OpenMoticsGroupActions
 
         """
+        from pyhaopenmotics.openmoticsgw.groupactions import (  # pylint: disable=import-outside-toplevel
+            OpenMoticsGroupActions,
+        )
+
         return OpenMoticsGroupActions(self)
 
     @property
@@ -385,18 +528,24 @@ class LocalGateway(BaseClient):
             OpenMoticsLights
 
         """
-        # implemented to be compatible with cloud
+        # The lights are the outputs of type LIGHT.
+        from pyhaopenmotics.openmoticsgw.lights import OpenMoticsLights  # pylint: disable=import-outside-toplevel
+
         return OpenMoticsLights(self)
 
-    @property
+    @cached_property
     def sensors(self) -> OpenMoticsSensors:
         """Get sensors.
 
+        The instance is kept, so the sensor configurations are only loaded once.
+
         Returns
         -------
             OpenMoticsSensors
 
         """
+        from pyhaopenmotics.openmoticsgw.sensors import OpenMoticsSensors  # pylint: disable=import-outside-toplevel
+
         return OpenMoticsSensors(self)
 
     @property
@@ -408,51 +557,36 @@ class LocalGateway(BaseClient):
             OpenMoticsEnergySensors
 
         """
+        from pyhaopenmotics.openmoticsgw.energy import OpenMoticsEnergySensors  # pylint: disable=import-outside-toplevel
+
         return OpenMoticsEnergySensors(self)
 
-    @property
+    @cached_property
     def shutters(self) -> OpenMoticsShutters:
         """Get shutters.
 
+        The instance is kept, so the shutter motion model survives between calls.
+
         Returns
         -------
             OpenMoticsShutters
 
         """
+        from pyhaopenmotics.openmoticsgw.shutters import OpenMoticsShutters  # pylint: disable=import-outside-toplevel
+
         return OpenMoticsShutters(self)
 
-    @property
+    @cached_property
     def thermostats(self) -> OpenMoticsThermostats:
         """Get thermostats.
 
-        Returns
-        -------
-            OpenMoticsThermostats
-
-        """
-        return OpenMoticsThermostats(self)
-
-    async def close(self) -> None:
-        """Close open client session."""
-        if self.session and self._close_session:
-            await self.session.close()
-
-    async def __aenter__(self) -> Self:
-        """Async enter.
+        The instance is kept, so the thermostat configurations are only downloaded once.
 
         Returns
         -------
-            LocalGateway: The LocalGateway object.
+            OpenMoticsThermostats
 
         """
-        return self
+        from pyhaopenmotics.openmoticsgw.thermostats import OpenMoticsThermostats  # pylint: disable=import-outside-toplevel
 
-    async def __aexit__(self, *_exc_info: object) -> None:
-        """Async exit.
-
-        Args:
-        ----
-            *_exc_info: Exec type.
-
-        """
-        await self.close()
+        return OpenMoticsThermostats(self)
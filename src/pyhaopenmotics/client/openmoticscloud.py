@@ -4,71 +4,179 @@ from __future__ import annotations
 
 import base64
 import logging
+from functools import cached_property, partial
 from typing import TYPE_CHECKING, Any
 
 import aiohttp
+import orjson
 
 # import websocket
 # from websockets import connect
 from yarl import URL
 
 from pyhaopenmotics.client.baseclient import BaseClient
-from pyhaopenmotics.cloud.groupactions import OpenMoticsGroupActions
-from pyhaopenmotics.cloud.inputs import OpenMoticsInputs
-from pyhaopenmotics.cloud.installations import OpenMoticsInstallations
-from pyhaopenmotics.cloud.lights import OpenMoticsLights
-from pyhaopenmotics.cloud.outputs import OpenMoticsOutputs
-from pyhaopenmotics.cloud.sensors import OpenMoticsSensors
-from pyhaopenmotics.cloud.shutters import OpenMoticsShutters
-from pyhaopenmotics.cloud.thermostats import OpenMoticsThermostats
+from pyhaopenmotics.client.cache import DEFAULT_CACHE_TTL, cache_key, invalidated_paths
+from pyhaopenmotics.client.routes import InstallationRoutes
 from pyhaopenmotics.const import CLOUD_API_URL
+from pyhaopenmotics.helpers.features import FeatureMap
 
 if TYPE_CHECKING:
-    from collections.abc import Awaitable, Callable
-    from typing import Self
-
+    from collections.abc import Awaitable, Callable, Mapping
+
+    from pyhaopenmotics.client.health import CircuitBreaker, HealthRegistry
+    from pyhaopenmotics.client.scheduler import RequestScheduler
+    from pyhaopenmotics.cloud.groupactions import OpenMoticsGroupActions
+    from pyhaopenmotics.cloud.inputs import OpenMoticsInputs
+    from pyhaopenmotics.cloud.installations import OpenMoticsInstallations
+    from pyhaopenmotics.cloud.lights import OpenMoticsLights
     from pyhaopenmotics.cloud.models.installation import Installation
+    from pyhaopenmotics.cloud.outputs import OpenMoticsOutputs
+    from pyhaopenmotics.cloud.sensors import OpenMoticsSensors
+    from pyhaopenmotics.cloud.shutters import OpenMoticsShutters
+    from pyhaopenmotics.cloud.thermostats import OpenMoticsThermostats
 
 
 # from .helpers import base64_encode
 
+JSON_CONTENT_TYPE = "application/json"
+
 _LOGGER = logging.getLogger(__name__)
 
 
+def encode_command(payload: Any) -> bytes:
+    """Encode the JSON body of a command.
+
+    A body that is already encoded is passed as is, so it is never encoded twice.
+
+    Args:
+    ----
+        payload: dict, or str / bytes of encoded JSON
+
+    Returns:
+    -------
+        bytes
+
+    """
+    if isinstance(payload, bytes):
+        return payload
+    if isinstance(payload, str):
+        return payload.encode()
+    return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+
+
 class OpenMoticsCloud(BaseClient):
     """Docstring."""
 
     _installations: list[Installation] | None
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         token: str,
         *,
-        request_timeout: int = 8,
+        request_timeout: float = 8,
         session: aiohttp.client.ClientSession | None = None,
-        token_refresh_method: (Callable[[], Awaitable[str]] | None) = None,  # pyright: ignore [unusedMethodArgument]
+        token_refresh_method: Callable[[], Awaitable[str]] | None = None,
         installation_id: int | None = None,
         base_url: str = CLOUD_API_URL,
+        adaptive_timeout: bool = True,
+        hedge_requests: bool = False,
+        circuit_breaker: CircuitBreaker | None = None,
+        health: HealthRegistry | None = None,
+        http2: bool = False,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+        cache_ttls: dict[str, float] | None = None,
+        scheduler: RequestScheduler | None = None,
     ) -> None:
         """Initialize connection with the OpenMotics Cloud API.
 
         Args:
         ----
             token: str
-            request_timeout: int
+            request_timeout: float
             session: aiohttp.client.ClientSession
             token_refresh_method: token refresh function
             installation_id: int
             base_url: str
+            adaptive_timeout: derive the timeout of each path from its observed latency.
+            hedge_requests: hedge slow GET requests with a second request.
+            circuit_breaker: CircuitBreaker, taken from the health registry if omitted.
+            health: HealthRegistry shared between clients, defaults to the one of the process.
+            http2: multiplex the requests over one HTTP/2 connection, requires the http2 extra.
+            cache_ttl: seconds the response of a GET is reused.
+            cache_ttls: cache_ttl per path.
+            scheduler: RequestScheduler giving commands priority over bulk reads,
+                requests are not scheduled if omitted.
 
         """
         super().__init__(
             token=token,
             request_timeout=request_timeout,
             session=session,
+            token_refresh_method=token_refresh_method,
+            adaptive_timeout=adaptive_timeout,
+            hedge_requests=hedge_requests,
+            circuit_breaker=circuit_breaker,
+            health=health,
+            http2=http2,
+            cache_ttl=cache_ttl,
+            cache_ttls=cache_ttls,
+            scheduler=scheduler,
         )
         self._installation_id = installation_id
+        self._routes: dict[int | None, InstallationRoutes] = {}
+        self._url_prefixes: dict[str, str] = {}
         self.base_url = base_url
+        self.feature_maps: dict[int, FeatureMap] = {}
+
+    @property
+    def base_url(self) -> str:
+        """Get the base url of the API.
+
+        Returns
+        -------
+            The base url, e.g. https://api.openmotics.com/api/v1.1
+
+        """
+        return self._base_url
+
+    @base_url.setter
+    def base_url(self, base_url: str) -> None:
+        """Set the base url of the API.
+
+        Args:
+        ----
+            base_url: str
+
+        """
+        self._base_url = base_url
+        self._url_prefixes.clear()
+
+    @property
+    def routes(self) -> InstallationRoutes:
+        """Get the endpoint paths of the current installation.
+
+        Returns
+        -------
+            InstallationRoutes
+
+        """
+        return self.routes_for(self._installation_id)
+
+    def routes_for(self, installation_id: int | None) -> InstallationRoutes:
+        """Get the endpoint paths of an installation, compiled once.
+
+        Args:
+        ----
+            installation_id: int
+
+        Returns:
+        -------
+            InstallationRoutes
+
+        """
+        if (routes := self._routes.get(installation_id)) is None:
+            routes = self._routes[installation_id] = InstallationRoutes(installation_id)
+        return routes
 
     @property
     def installation_id(self) -> int | None:
@@ -93,6 +201,43 @@ class OpenMoticsCloud(BaseClient):
         """
         self._installation_id = installation_id
 
+    def _health_key(self) -> str:
+        """Return the key of the cloud API in the health registry.
+
+        Returns
+        -------
+            the base url
+
+        """
+        return self.base_url
+
+    def _index_key(self) -> int | None:
+        """Return the installation the requests go to, see index_for.
+
+        Returns
+        -------
+            The installation id
+
+        """
+        return self._installation_id
+
+    @property
+    def features(self) -> FeatureMap:
+        """Get the features of the gateway of the current installation.
+
+        The map is filled from ``gateway_features`` whenever installations are
+        fetched. Until then every feature is assumed to be supported.
+
+        Returns
+        -------
+            FeatureMap
+
+        """
+        installation_id = self._installation_id or 0
+        if (features := self.feature_maps.get(installation_id)) is None:
+            features = self.feature_maps[installation_id] = FeatureMap()
+        return features
+
     async def _get_url(self, path: str, scheme: str = "https") -> str:
         """Update the auth headers to include a working token.
 
@@ -106,71 +251,102 @@ class OpenMoticsCloud(BaseClient):
             url: str
 
         """
-        url = URL(f"{self.base_url}{path}")
-        if scheme != "https":
-            url = URL(url).with_scheme(scheme)
-        return str(url)
-
-    # async def subscribe_webhook(self) -> None:
-    #     """Register a webhook with OpenMotics for live updates."""
-    #     # Register webhook
-    #     await self._request(
-    #         "/ws/events",
-    #                 "types": [
-    #                     "OUTPUT_CHANGE",
-    #                     "SENSOR_CHANGE",
-    #                     "SHUTTER_CHANGE",
-    #                     "THERMOSTAT_CHANGE",
-    #                     "THERMOSTAT_GROUP_CHANGE",
-    #                     "VENTILATION_CHANGE",
-    #                 ],
-    #             },
-    #         },
+        # The base url is parsed once per scheme, a url is then a single join.
+        if (prefix := self._url_prefixes.get(scheme)) is None:
+            base = URL(self.base_url)
+            if scheme != "https":
+                base = base.with_scheme(scheme)
+            prefix = self._url_prefixes[scheme] = str(base)
+        return f"{prefix}{path}"
+
+    async def subscribe_webhook(self) -> None:
+        """Register a webhook with OpenMotics for live updates."""
+        # Register webhook
+        await self._request(
+            "/ws/events",
+            method=aiohttp.hdrs.METH_POST,
+            data={
+                "type": "ACTION",
+                "data": {
+                    "action": "set_subscription",
+                    "types": [
+                        "OUTPUT_CHANGE",
+                        "SENSOR_CHANGE",
+                        "SHUTTER_CHANGE",
+                        "THERMOSTAT_CHANGE",
+                        "THERMOSTAT_GROUP_CHANGE",
+                        "VENTILATION_CHANGE",
+                    ],
+                    "installation_ids": [self.installation_id],
+                },
+            },
+            headers=await self._get_auth_headers(),
+        )
 
-    # async def unsubscribe_webhook(self) -> None:
-    #     """Delete all webhooks for this application ID."""
-    #     await self._request(
-    #         "/ws/events",
+    async def unsubscribe_webhook(self) -> None:
+        """Delete all webhooks for this application ID."""
+        await self._request(
+            "/ws/events",
+            method=aiohttp.hdrs.METH_DELETE,
+            headers=await self._get_auth_headers(),
+        )
 
     async def _get_auth_headers(
         self,
         headers: dict[str, Any] | None = None,
-    ) -> dict[str, Any]:
+        *,
+        json_body: bool = False,
+    ) -> Mapping[str, str]:
         """Update the auth headers to include a working token.
 
         Args:
         ----
             headers: dict
+            json_body: True when the request sends a JSON body
 
         Returns:
         -------
-            headers
+            headers, shared until the token changes when no extra headers are given
 
         """
         # if self.token is None or \
         # self.token_expires_at < time.time() + CLOCK_OUT_OF_SYNC_MAX_SEC:
 
-        if headers is None:
-            headers = {}
-
-        headers.update(
-            {
-                "User-Agent": self.user_agent,
-                "Accept": "application/json",
-                # "Accept-Language": "en-US,en;q=0.5",
-                # "Accept-Encoding": "gzip, defalte, br",
-                # "Referer": "https://portal.openmotics.com/",
-                "Authorization": f"Bearer {self.token}",
-                # "Content-Type": "application/json",
-                # "Origin": "https://portal.openmotics.com",
-                # "Connection": "keep-alive",
-                # "Sec-Fetch-Dest": "empty",
-                # "Sec-Fetch-Mode": "cors",
-                # "Sec-Fetch-Site": "same-site",
-                # "Cache-Control": "no-cache",
-            },
-        )
-        return headers
+        if json_body:
+            return self._merge_headers(self._header_set("json", self._build_json_headers), headers)
+        return self._merge_headers(self._header_set("auth", self._build_auth_headers), headers)
+
+    def _build_auth_headers(self, token: str | None) -> dict[str, str]:
+        """Return the headers of the requests made with a token.
+
+        Args:
+        ----
+            token: str
+
+        Returns:
+        -------
+            headers
+
+        """
+        return {
+            "User-Agent": self.user_agent,
+            "Accept": "application/json",
+            "Authorization": f"Bearer {token}",
+        }
+
+    def _build_json_headers(self, token: str | None) -> dict[str, str]:
+        """Return the headers of the requests with a JSON body made with a token.
+
+        Args:
+        ----
+            token: str
+
+        Returns:
+        -------
+            headers
+
+        """
+        return self._build_auth_headers(token) | {"Content-Type": JSON_CONTENT_TYPE}
 
     async def _get_ws_connection_url(self) -> str:
         return await self._get_url(
@@ -181,7 +357,7 @@ class OpenMoticsCloud(BaseClient):
     async def _get_ws_headers(
         self,
         headers: dict[str, Any] | None = None,
-    ) -> dict[str, Any]:
+    ) -> Mapping[str, str]:
         """Update the auth headers to include a working token.
 
         Args:
@@ -190,32 +366,34 @@ class OpenMoticsCloud(BaseClient):
 
         Returns:
         -------
-            headers
+            headers, shared until the token changes when no extra headers are given
 
         """
         # if self.token is None or self.token_expires_at < time.time() + CLOCK_OUT_OF_SYNC_MAX_SEC:
 
-        if headers is None:
-            headers = {}
-
-        b64token = str(base64.b64encode(self.token))
-
-        headers.update(
-            {
-                # "User-Agent": self.user_agent,
-                # "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36
-                #   (KHTML, like Gecko) Chrome/109.0.0.0 Safari/537.36",
-                # "Accept-Language": "en-US,en;q=0.5",
-                # "Accept-Encoding": "gzip, defalte, br",
-                "Sec-WebSocket-Protocol": f"authorization.bearer.{b64token}",
-                "Sec-WebSocket-extensions": "permessage-deflate",
-                "Sec-Fetch-Dest": "websocket",
-                "Sec-Fetch-Mode": "websocket",
-                "Sec-Fetch-site": "same-site",
-                # "cache-control": "no-cache",
-            },
-        )
-        return headers
+        return self._merge_headers(self._header_set("ws", self._build_ws_headers), headers)
+
+    @staticmethod
+    def _build_ws_headers(token: str | None) -> dict[str, str]:
+        """Return the headers of the websocket connections made with a token.
+
+        Args:
+        ----
+            token: str
+
+        Returns:
+        -------
+            headers
+
+        """
+        b64token = base64.b64encode((token or "").encode()).decode()
+        return {
+            "Sec-WebSocket-Protocol": f"authorization.bearer.{b64token}",
+            "Sec-WebSocket-extensions": "permessage-deflate",
+            "Sec-Fetch-Dest": "websocket",
+            "Sec-Fetch-Mode": "websocket",
+            "Sec-Fetch-site": "same-site",
+        }
 
     # @property
     # def connected(self) -> bool:
@@ -434,17 +612,23 @@ class OpenMoticsCloud(BaseClient):
             OpenMoticsInstallations
 
         """
+        from pyhaopenmotics.cloud.installations import OpenMoticsInstallations  # pylint: disable=import-outside-toplevel
+
         return OpenMoticsInstallations(self)
 
-    @property
+    @cached_property
     def inputs(self) -> OpenMoticsInputs:
         """Get inputs.
 
+        The instance is kept, so all subscribers share its input event engine.
+
         Returns
         -------
             OpenMoticsInputs
 
         """
+        from pyhaopenmotics.cloud.inputs import OpenMoticsInputs  # pylint: disable=import-outside-toplevel
+
         return OpenMoticsInputs(self)
 
     @property
@@ -456,17 +640,23 @@ class OpenMoticsCloud(BaseClient):
             OpenMoticsOutputs
 
         """
+        from pyhaopenmotics.cloud.outputs import OpenMoticsOutputs  # pylint: disable=import-outside-toplevel
+
         return OpenMoticsOutputs(self)
 
-    @property
+    @cached_property
     def groupactions(self) -> OpenMoticsGroupActions:
         """Get groupactions.
 
+        The instance is kept, so the group action registry survives between calls.
+
         Returns
         -------
             OpenMoticsGroupActions
 
         """
+        from pyhaopenmotics.cloud.groupactions import OpenMoticsGroupActions  # pylint: disable=import-outside-toplevel
+
         return OpenMoticsGroupActions(self)
 
     @property
@@ -478,6 +668,8 @@ class OpenMoticsCloud(BaseClient):
             OpenMoticsLights
 
         """
+        from pyhaopenmotics.cloud.lights import OpenMoticsLights  # pylint: disable=import-outside-toplevel
+
         return OpenMoticsLights(self)
 
     @property
@@ -489,6 +681,8 @@ class OpenMoticsCloud(BaseClient):
             OpenMoticsSensors
 
         """
+        from pyhaopenmotics.cloud.sensors import OpenMoticsSensors  # pylint: disable=import-outside-toplevel
+
         return OpenMoticsSensors(self)
 
     @property
@@ -500,6 +694,8 @@ class OpenMoticsCloud(BaseClient):
             OpenMoticsShutters
 
         """
+        from pyhaopenmotics.cloud.shutters import OpenMoticsShutters  # pylint: disable=import-outside-toplevel
+
         return OpenMoticsShutters(self)
 
     @property
@@ -511,14 +707,27 @@ class OpenMoticsCloud(BaseClient):
             OpenMoticsThermostats
 
         """
+        from pyhaopenmotics.cloud.thermostats import OpenMoticsThermostats  # pylint: disable=import-outside-toplevel
+
         return OpenMoticsThermostats(self)
 
-    async def get(self, path: str, headers: dict[str, Any] | None = None, **kwargs: Any) -> Any:
+    async def get(
+        self,
+        path: str,
+        headers: dict[str, Any] | None = None,
+        *,
+        cached: bool = True,
+        **kwargs: Any,
+    ) -> Any:
         """Make get request using the underlying aiohttp.ClientSession.
 
+        Concurrent and recent GETs of the same path and params share their
+        response through the cache.
+
         Args:
         ----
             path: string
+            cached: False to bypass the cache, e.g. for a tight poll
             **kwargs: any
 
         Returns:
@@ -526,55 +735,60 @@ class OpenMoticsCloud(BaseClient):
             response json or text
 
         """
-        headers = await self._get_auth_headers(headers)
-        return await self._request(
-            path,
-            method=aiohttp.hdrs.METH_GET,
-            headers=headers,
-            **kwargs,
-        )
+        if cached and kwargs.keys() <= {"params"}:
+            return await self.cache.fetch(
+                path,
+                cache_key(path, kwargs.get("params")),
+                partial(self._get, path, headers, **kwargs),
+            )
+        return await self._get(path, headers, **kwargs)
 
-    async def post(self, path: str, headers: dict[str, Any] | None = None, **kwargs: Any) -> Any:
-        """Make get request using the underlying aiohttp.ClientSession.
+    async def _get(self, path: str, headers: dict[str, Any] | None = None, **kwargs: Any) -> Any:
+        """Make get request, bypassing the cache.
 
         Args:
         ----
-            path: path
-            **kwargs: extra args
+            path: string
+            **kwargs: any
 
         Returns:
         -------
             response json or text
 
         """
-        headers = await self._get_auth_headers(headers)
         return await self._request(
             path,
-            method=aiohttp.hdrs.METH_POST,
+            method=aiohttp.hdrs.METH_GET,
+            headers=await self._get_auth_headers(headers),
             **kwargs,
         )
 
-    async def close(self) -> None:
-        """Close open client session."""
-        if self.session and self._close_session:
-            await self.session.close()
-
-    async def __aenter__(self) -> Self:
-        """Async enter.
-
-        Returns
-        -------
-            OpenMoticsCloud: The OpenMoticsCloud object.
-
-        """
-        return self
+    async def post(self, path: str, headers: dict[str, Any] | None = None, **kwargs: Any) -> Any:
+        """Make get request using the underlying aiohttp.ClientSession.
 
-    async def __aexit__(self, *_exc_info: object) -> None:
-        """Async exit.
+        A ``json`` body is encoded once with orjson and sent as data, for both
+        transports.
 
         Args:
         ----
-            *_exc_info: Exec type.
+            path: path
+            headers: dict
+            **kwargs: extra args, e.g. json={"position": 50}
+
+        Returns:
+        -------
+            response json or text
 
         """
-        await self.close()
+        if (payload := kwargs.pop("json", None)) is not None:
+            kwargs["data"] = encode_command(payload)
+        auth_headers = await self._get_auth_headers(headers, json_body=payload is not None)
+        try:
+            return await self._request(
+                path,
+                method=aiohttp.hdrs.METH_POST,
+                headers=auth_headers,
+                **kwargs,
+            )
+        finally:
+            self.cache.invalidate(*invalidated_paths(path))
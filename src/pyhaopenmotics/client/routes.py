@@ -0,0 +1,44 @@
+"""Paths of the cloud API endpoints, compiled per installation.
+
+Endpoints are written relative to their installation with positional
+placeholders for the ids, e.g. ``"shutters/{}/change_position"``. The full
+template of an installation is built on first use and kept, so a path costs
+a single ``str.format``.
+"""
+
+from __future__ import annotations
+
+INSTALLATIONS_PATH = "/base/installations"
+
+
+class InstallationRoutes:
+    """Compiled endpoint templates of a single installation."""
+
+    def __init__(self, installation_id: int | None) -> None:
+        """Init the routes.
+
+        Args:
+        ----
+            installation_id: int
+
+        """
+        self.installation_id = installation_id
+        self.prefix = f"{INSTALLATIONS_PATH}/{installation_id}"
+        self._templates: dict[str, str] = {}
+
+    def path(self, endpoint: str, *ids: int) -> str:
+        """Return the path of an endpoint of the installation.
+
+        Args:
+        ----
+            endpoint: template relative to the installation, e.g. "outputs/{}/turn_on"
+            *ids: values of the placeholders
+
+        Returns:
+        -------
+            path, e.g. "/base/installations/12/outputs/3/turn_on"
+
+        """
+        if (template := self._templates.get(endpoint)) is None:
+            template = self._templates[endpoint] = f"{self.prefix}/{endpoint}"
+        return template.format(*ids) if ids else template
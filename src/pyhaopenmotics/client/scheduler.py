@@ -0,0 +1,208 @@
+"""Priority scheduling of the requests to a gateway.
+
+Requests are split in three classes:
+    * interactive: commands, like set_output or turn_on
+    * status: reads of the state of entities, like get_output_status
+    * background: reads of configurations, energy and features
+
+Every class has its own concurrency limit. Commands only wait for other
+commands, so they are never queued behind a large refresh. Status and
+background reads share ``max_reads`` slots, which are handed to waiting
+status reads first. With ``max_queued`` set for a class, new requests of
+the class are refused with OpenMoticsQueueFullError once that many are
+waiting, instead of piling up.
+
+Clients only schedule their requests when they are given a scheduler.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import re
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
+
+from pyhaopenmotics.errors import OpenMoticsQueueFullError
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_STATUS = 1
+PRIORITY_BACKGROUND = 2
+
+DEFAULT_LIMITS = {
+    PRIORITY_INTERACTIVE: 4,
+    PRIORITY_STATUS: 2,
+    PRIORITY_BACKGROUND: 1,
+}
+DEFAULT_MAX_READS = 2
+
+_BACKGROUND_RE = re.compile(r"configuration|power|energy|features|version|schedule")
+
+
+def request_priority(path: str, *, idempotent: bool) -> int:
+    """Return the class of a request.
+
+    Args:
+    ----
+        path: action or path
+        idempotent: True when the request only reads data
+
+    Returns:
+    -------
+        PRIORITY_INTERACTIVE, PRIORITY_STATUS or PRIORITY_BACKGROUND
+
+    """
+    if not idempotent:
+        return PRIORITY_INTERACTIVE
+    if _BACKGROUND_RE.search(path):
+        return PRIORITY_BACKGROUND
+    return PRIORITY_STATUS
+
+
+class RequestScheduler:
+    """Hand out request slots per class, in order of priority."""
+
+    def __init__(
+        self,
+        limits: dict[int, int] | None = None,
+        max_reads: int = DEFAULT_MAX_READS,
+        max_queued: dict[int, int | None] | None = None,
+    ) -> None:
+        """Init the scheduler.
+
+        Args:
+        ----
+            limits: concurrent requests per class
+            max_reads: concurrent status and background reads together
+            max_queued: waiting requests per class before new ones are refused,
+                by default they are never refused
+
+        """
+        self.limits = DEFAULT_LIMITS | (limits or {})
+        self.max_reads = max_reads
+        self.max_queued: dict[int, int | None] = dict.fromkeys(self.limits) | (max_queued or {})
+        self._active = dict.fromkeys(self.limits, 0)
+        self._queued = dict.fromkeys(self.limits, 0)
+        # (priority, sequence, future), the sequence keeps each class FIFO
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+
+    def active(self, priority: int) -> int:
+        """Return the number of running requests of a class.
+
+        Args:
+        ----
+            priority: class of the requests
+
+        Returns:
+        -------
+            int
+
+        """
+        return self._active[priority]
+
+    def queued(self, priority: int) -> int:
+        """Return the number of waiting requests of a class.
+
+        Args:
+        ----
+            priority: class of the requests
+
+        Returns:
+        -------
+            int
+
+        """
+        return self._queued[priority]
+
+    def _reads(self) -> int:
+        """Return the number of running reads."""
+        return self._active[PRIORITY_STATUS] + self._active[PRIORITY_BACKGROUND]
+
+    def _can_start(self, priority: int) -> bool:
+        """Return True when a request of a class may start now."""
+        if self._active[priority] >= self.limits[priority]:
+            return False
+        return priority == PRIORITY_INTERACTIVE or self._reads() < self.max_reads
+
+    def _dispatch(self) -> None:
+        """Start the waiting requests that fit, highest priority first."""
+        skipped = []
+        while self._waiters:
+            entry = heapq.heappop(self._waiters)
+            priority, _sequence, future = entry
+            if future.done():
+                continue
+            if not self._can_start(priority):
+                skipped.append(entry)
+                continue
+            self._queued[priority] -= 1
+            self._active[priority] += 1
+            future.set_result(None)
+        for entry in skipped:
+            heapq.heappush(self._waiters, entry)
+
+    async def acquire(self, priority: int) -> None:
+        """Wait for a slot of a class.
+
+        Args:
+        ----
+            priority: class of the request
+
+        Raises:
+        ------
+            OpenMoticsQueueFullError: Too many requests of the class are waiting.
+
+        """
+        if self._queued[priority] == 0 and self._can_start(priority):
+            self._active[priority] += 1
+            return
+        if (max_queued := self.max_queued[priority]) is not None and self._queued[priority] >= max_queued:
+            msg = f"{self._queued[priority]} requests of priority {priority} are waiting for the gateway."
+            raise OpenMoticsQueueFullError(msg)
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._queued[priority] += 1
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed out just before the cancellation.
+                self.release(priority)
+            else:
+                self._queued[priority] -= 1
+            raise
+
+    def release(self, priority: int) -> None:
+        """Return a slot of a class.
+
+        Args:
+        ----
+            priority: class of the request
+
+        """
+        self._active[priority] -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, priority: int) -> AsyncIterator[None]:
+        """Hold a slot of a class while sending a request.
+
+        Args:
+        ----
+            priority: class of the request
+
+        Yields:
+        ------
+            None, while the request is sent.
+
+        """
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release(priority)
@@ -0,0 +1,273 @@
+"""Blocking facade running a client on a long-lived event loop thread.
+
+Synchronous code (scripts, task queue workers) would otherwise start a new
+event loop and session for every call, losing the open connections, the
+token and the caches each time. The facade starts one loop in a background
+thread, creates the client on it and runs every call there, so all threads
+share the same warm client:
+
+    with SyncClient(LocalGateway, username="u", password="p", localgw="gw") as client:
+        client.outputs.turn_on(3)
+        for reading in client.sensors.stream(60):
+            ...
+
+Every coroutine method of the client and of its domains (outputs, lights,
+sensors, ...) becomes a blocking call, async generators become blocking
+iterators. Other objects of the client, like ``client.index``, are wrapped
+too, their methods run on the loop thread. The facade may be used from any
+number of threads. The results of the calls are handed over as they are.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import threading
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable, Coroutine, Iterator
+    from typing import Self
+
+    from pyhaopenmotics.client.baseclient import BaseClient
+
+
+async def _next_item(iterator: AsyncIterator[Any]) -> tuple[bool, Any]:
+    """Return whether the iterator produced an item, and the item."""
+    try:
+        return True, await anext(iterator)
+    except StopAsyncIteration:
+        return False, None
+
+
+async def _resolve(target: object, name: str) -> Any:
+    """Get an attribute on the loop thread, domains are built there."""
+    return getattr(target, name)
+
+
+async def _call(function: Callable[..., Any], args: tuple[Any, ...], kwargs: dict[str, Any]) -> Any:
+    """Call a synchronous method on the loop thread, which owns the state of the client."""
+    return function(*args, **kwargs)
+
+
+# Values returned as they are, they cannot be changed from another thread.
+_IMMUTABLE_TYPES = (str, bytes, int, float, bool, tuple, frozenset, type(None))
+
+
+class _SyncProxy:
+    """Blocking view on a client, one of its domains or another of its objects.
+
+    Methods and domains are resolved on the loop thread once and then kept
+    per name, so a call like ``client.outputs.turn_on(3)`` only crosses to
+    the loop thread for the call itself. Plain attributes are read on the
+    loop thread on every access, they may change.
+    """
+
+    def __init__(self, runner: SyncClient, target: object) -> None:
+        """Init the proxy.
+
+        Args:
+        ----
+            runner: SyncClient running the calls
+            target: client, domain or other object of the client
+
+        """
+        self._runner = runner
+        self._target = target
+        self._resolved: dict[str, Any] = {}
+
+    def _wrap(self, value: Any) -> Any:
+        """Return the blocking version of a value read from the target."""
+        if inspect.iscoroutinefunction(value):
+
+            def call(*args: Any, **kwargs: Any) -> Any:
+                return self._runner.run(value(*args, **kwargs))
+
+            return call
+        if inspect.isasyncgenfunction(value):
+
+            def iterate(*args: Any, **kwargs: Any) -> Iterator[Any]:
+                return self._runner.iterate(value(*args, **kwargs))
+
+            return iterate
+        if callable(value):
+
+            def call_sync(*args: Any, **kwargs: Any) -> Any:
+                return self._runner.run(_call(value, args, kwargs))
+
+            return call_sync
+        if isinstance(value, _IMMUTABLE_TYPES):
+            return value
+        # Objects of the client (domains, the index, the cache, ...) are only
+        # used from the loop thread, through a proxy of their own.
+        return _SyncProxy(self._runner, value)
+
+    def __getattr__(self, name: str) -> Any:
+        """Return a blocking version of an attribute of the target.
+
+        Args:
+        ----
+            name: str
+
+        Returns:
+        -------
+            A blocking function for coroutine functions and methods, a function
+            returning a blocking iterator for async generators, a proxy for
+            domains and other objects, and the value itself for strings,
+            numbers and other immutable values.
+
+        """
+        if (resolved := self._resolved.get(name)) is not None:
+            return resolved
+        value = self._runner.run(_resolve(self._target, name))
+        wrapped = self._wrap(value)
+        # Domains keep a reference to their client.
+        if inspect.ismethod(value) or hasattr(value, "_omcloud"):
+            self._resolved[name] = wrapped
+        return wrapped
+
+
+class SyncClient:
+    """Run a client on an event loop thread and expose blocking calls."""
+
+    def __init__(
+        self,
+        client_class: Callable[..., BaseClient],
+        *args: Any,
+        timeout: float | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Start the loop thread and create the client on it.
+
+        Args:
+        ----
+            client_class: LocalGateway, OpenMoticsCloud or a factory of a client
+            *args: positional arguments of the client
+            timeout: max seconds a blocking call waits, None to wait as long as the client does
+            **kwargs: keyword arguments of the client
+
+        """
+        self.timeout = timeout
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name="pyhaopenmotics-sync", daemon=True)
+        self._thread.start()
+
+        async def create() -> BaseClient:
+            return client_class(*args, **kwargs)
+
+        try:
+            self.client = self.run(create())
+        except BaseException:
+            self._stop_loop()
+            raise
+        self._proxy = _SyncProxy(self, self.client)
+
+    def _run_loop(self) -> None:
+        """Run the event loop until the facade is closed."""
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def run(self, coro: Coroutine[Any, Any, Any]) -> Any:
+        """Run a coroutine on the loop thread and wait for its result.
+
+        Args:
+        ----
+            coro: coroutine
+
+        Returns:
+        -------
+            The result of the coroutine.
+
+        Raises:
+        ------
+            RuntimeError: The facade is closed, or called from the loop thread, which would deadlock.
+            TimeoutError: The call took longer than the timeout, it is cancelled.
+
+        """
+        if self._loop.is_closed():
+            coro.close()
+            msg = "The client is closed"
+            raise RuntimeError(msg)
+        if threading.current_thread() is self._thread:
+            coro.close()
+            msg = "Blocking calls cannot be made from the event loop thread, await the client instead"
+            raise RuntimeError(msg)
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result(self.timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def iterate(self, iterator: AsyncIterator[Any]) -> Iterator[Any]:
+        """Iterate an async iterator of the client in a blocking way.
+
+        Args:
+        ----
+            iterator: async iterator, e.g. an async generator
+
+        Yields:
+        ------
+            The items of the iterator.
+
+        """
+        try:
+            while True:
+                found, item = self.run(_next_item(iterator))
+                if not found:
+                    return
+                yield item
+        finally:
+            if (aclose := getattr(iterator, "aclose", None)) is not None:
+                self.run(aclose())
+
+    def __getattr__(self, name: str) -> Any:
+        """Return a blocking version of an attribute of the client.
+
+        Args:
+        ----
+            name: str
+
+        Returns:
+        -------
+            See _SyncProxy.
+
+        """
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._proxy, name)
+
+    def close(self) -> None:
+        """Close the client and stop the loop thread."""
+        if self._loop.is_closed():
+            return
+        try:
+            self.run(self.client.close())
+        finally:
+            self._stop_loop()
+
+    def _stop_loop(self) -> None:
+        """Stop the loop thread and close the loop."""
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def __enter__(self) -> Self:
+        """Enter.
+
+        Returns
+        -------
+            The facade.
+
+        """
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        """Exit.
+
+        Args:
+        ----
+            *_exc_info: Exec type.
+
+        """
+        self.close()
@@ -1,13 +1,31 @@
 """Directory holding cloud."""
 
-from pyhaopenmotics.cloud.groupactions import OpenMoticsGroupActions
-from pyhaopenmotics.cloud.inputs import OpenMoticsInputs
-from pyhaopenmotics.cloud.installations import OpenMoticsInstallations
-from pyhaopenmotics.cloud.lights import OpenMoticsLights
-from pyhaopenmotics.cloud.outputs import OpenMoticsOutputs
-from pyhaopenmotics.cloud.sensors import OpenMoticsSensors
-from pyhaopenmotics.cloud.shutters import OpenMoticsShutters
-from pyhaopenmotics.cloud.thermostats import OpenMoticsThermostats
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from pyhaopenmotics.helpers.lazy import lazy_module
+
+if TYPE_CHECKING:
+    from pyhaopenmotics.cloud.groupactions import OpenMoticsGroupActions
+    from pyhaopenmotics.cloud.inputs import OpenMoticsInputs
+    from pyhaopenmotics.cloud.installations import OpenMoticsInstallations
+    from pyhaopenmotics.cloud.lights import OpenMoticsLights
+    from pyhaopenmotics.cloud.outputs import OpenMoticsOutputs
+    from pyhaopenmotics.cloud.sensors import OpenMoticsSensors
+    from pyhaopenmotics.cloud.shutters import OpenMoticsShutters
+    from pyhaopenmotics.cloud.thermostats import OpenMoticsThermostats
+
+_LAZY_IMPORTS = {
+    "OpenMoticsGroupActions": "pyhaopenmotics.cloud.groupactions",
+    "OpenMoticsInputs": "pyhaopenmotics.cloud.inputs",
+    "OpenMoticsInstallations": "pyhaopenmotics.cloud.installations",
+    "OpenMoticsLights": "pyhaopenmotics.cloud.lights",
+    "OpenMoticsOutputs": "pyhaopenmotics.cloud.outputs",
+    "OpenMoticsSensors": "pyhaopenmotics.cloud.sensors",
+    "OpenMoticsShutters": "pyhaopenmotics.cloud.shutters",
+    "OpenMoticsThermostats": "pyhaopenmotics.cloud.thermostats",
+}
 
 __all__ = [
     "OpenMoticsGroupActions",
@@ -19,3 +37,5 @@ __all__ = [
     "OpenMoticsShutters",
     "OpenMoticsThermostats",
 ]
+
+__getattr__, __dir__ = lazy_module(__name__, _LAZY_IMPORTS)
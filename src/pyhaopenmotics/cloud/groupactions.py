@@ -6,6 +6,7 @@ from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
 from pyhaopenmotics.cloud.models.groupaction import GroupAction
+from pyhaopenmotics.helpers.registry import GroupActionRegistry
 
 if TYPE_CHECKING:
     from pyhaopenmotics.client.openmoticscloud import (
@@ -29,6 +30,30 @@ class OpenMoticsGroupActions:
 
         """
         self._omcloud = omcloud
+        self._registry = GroupActionRegistry()
+
+    @property
+    def registry(self) -> GroupActionRegistry:
+        """Get the cached group action registry.
+
+        Returns
+        -------
+            GroupActionRegistry
+
+        """
+        return self._registry
+
+    def invalidate(self) -> None:
+        """Drop the cached group action configuration.
+
+        Call this when the group action configuration of the installation changed.
+        """
+        self._registry.invalidate()
+
+    async def _ensure_loaded(self) -> None:
+        """Download the group action configuration if it is not cached."""
+        if not self._registry.loaded:
+            await self.get_all()
 
     async def get_all(
         self,
@@ -64,7 +89,7 @@ class OpenMoticsGroupActions:
         #  }
 
         """
-        path = f"/base/installations/{self._omcloud.installation_id}/groupactions"
+        path = self._omcloud.routes.path("groupactions")
         if groupactions_filter:
             query_params = {"filter": groupactions_filter}
             body = await self._omcloud.get(
@@ -74,7 +99,10 @@ class OpenMoticsGroupActions:
         else:
             body = await self._omcloud.get(path)
 
-        return [GroupAction.from_dict(groupaction) for groupaction in body["data"]]
+        groupactions = [GroupAction.from_dict(groupaction) for groupaction in body["data"]]
+        if not groupactions_filter:
+            self._registry.load(groupactions)
+        return groupactions
 
     async def get_by_id(
         self,
@@ -91,7 +119,10 @@ class OpenMoticsGroupActions:
             Returns a groupaction with id
 
         """
-        path = f"/base/installations/{self._omcloud.installation_id}/groupactions/{groupaction_id}"
+        if self._registry.loaded and (groupaction := self._registry.by_id(groupaction_id)) is not None:
+            return groupaction
+
+        path = self._omcloud.routes.path("groupactions/{}", groupaction_id)
 
         body = await self._omcloud.get(path)
 
@@ -99,31 +130,39 @@ class OpenMoticsGroupActions:
 
     async def trigger(
         self,
-        groupaction_id: int,
+        groupaction_id: int | str,
     ) -> Any:
         """Trigger a specified groupaction object.
 
+        Names are resolved from the cached configuration, ids are sent as is.
+
         Args:
         ----
-            groupaction_id: int
+            groupaction_id: id or name of the groupaction
 
         Returns:
         -------
             Returns a groupaction with id
 
         """
-        # E501 line too long
-        path = f"/base/installations/{self._omcloud.installation_id}/groupactions/{groupaction_id}/trigger"
+        if isinstance(groupaction_id, str):
+            await self._ensure_loaded()
+            if (resolved := self._registry.resolve(groupaction_id)) is None:
+                return None
+            groupaction_id = resolved
+        path = self._omcloud.routes.path("groupactions/{}/trigger", groupaction_id)
         return await self._omcloud.post(path)
 
     async def by_usage(
         self,
         groupaction_usage: str,
-    ) -> Any:
+    ) -> list[GroupAction]:
         """Return a specified groupaction object.
 
         The usage filter allows the GroupActions to be filtered for their
-        intended usage.
+        intended usage. The cloud filters on the usage, the configuration
+        holds none, so every usage is requested once and then cached in the
+        registry.
 
         Args:
         ----
@@ -131,12 +170,20 @@ class OpenMoticsGroupActions:
 
         Returns:
         -------
-            Returns a groupaction with id
+            Returns the groupactions with this usage
 
         """
-        path = f"/base/installations/{self._omcloud.installation_id}/groupactions"
+        if self._registry.has_usage(groupaction_usage):
+            return self._registry.by_usage(groupaction_usage)
+
+        path = self._omcloud.routes.path("groupactions")
         query_params = {"usage": groupaction_usage.upper()}
-        return await self._omcloud.get(path, params=query_params)
+        body = await self._omcloud.get(path, params=query_params)
+        self._registry.load_usage(
+            groupaction_usage,
+            [GroupAction.from_dict(groupaction) for groupaction in body["data"]],
+        )
+        return self._registry.by_usage(groupaction_usage)
 
     async def scenes(self) -> Any:
         """Return all scenes object.
@@ -6,11 +6,15 @@ from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 from pyhaopenmotics.cloud.models.input import OMInput
+from pyhaopenmotics.helpers.filters import cloud_filter
+from pyhaopenmotics.helpers.index import DOMAIN_INPUTS
+from pyhaopenmotics.helpers.inputevents import CLOUD_POLL_INTERVAL, InputEventEngine
 
 if TYPE_CHECKING:
     from pyhaopenmotics.client.openmoticscloud import (
         OpenMoticsCloud,  # pylint: disable=R0401
     )
+    from pyhaopenmotics.helpers.filters import EntityFilter
 
 
 @dataclass
@@ -29,26 +33,29 @@ class OpenMoticsInputs:
 
         """
         self._omcloud = omcloud
+        # Change event_engine.poll_interval to poll faster or slower.
+        self.event_engine = InputEventEngine(self.poll_states, poll_interval=CLOUD_POLL_INTERVAL)
 
     async def get_all(
         self,
-        input_filter: str | None = None,
+        input_filter: EntityFilter | str | None = None,
     ) -> list[OMInput]:
         """Get a list of all input objects.
 
         Args:
         ----
-            input_filter: str
+            input_filter: EntityFilter, or a raw (URL encoded JSON) filter string
 
         Returns:
         -------
             A list of inputs
 
         """
-        path = f"/base/installations/{self._omcloud.installation_id}/inputs"
+        path = self._omcloud.routes.path("inputs")
 
-        if input_filter:
-            query_params = {"filter": input_filter}
+        query, residual = cloud_filter(input_filter)
+        if query:
+            query_params = {"filter": query}
             body = await self._omcloud.get(
                 path=path,
                 params=query_params,
@@ -56,7 +63,21 @@ class OpenMoticsInputs:
         else:
             body = await self._omcloud.get(path)
 
-        return [OMInput.from_dict(ominput) for ominput in body["data"]]
+        inputs = [OMInput.from_dict(ominput) for ominput in body["data"]]
+        self._omcloud.index.update(DOMAIN_INPUTS, inputs, complete=query is None)
+        return inputs if residual is None else residual.apply(inputs)
+
+    async def poll_states(self) -> dict[int, bool]:
+        """Get the state of all inputs, bypassing the cache.
+
+        Returns
+        -------
+            dict of input id to True when pressed
+
+        """
+        path = self._omcloud.routes.path("inputs")
+        body = await self._omcloud.get(path, cached=False)
+        return {ominput["id"]: bool((ominput.get("status") or {}).get("on")) for ominput in body["data"]}
 
     async def get_by_id(
         self,
@@ -73,7 +94,7 @@ class OpenMoticsInputs:
             Returns a input with id
 
         """
-        path = f"/base/installations/{self._omcloud.installation_id}/inputs/{input_id}"
+        path = self._omcloud.routes.path("inputs/{}", input_id)
         body = await self._omcloud.get(path)
 
         return OMInput.from_dict(body["data"])
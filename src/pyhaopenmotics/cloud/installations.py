@@ -5,7 +5,9 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
+from pyhaopenmotics.client.routes import INSTALLATIONS_PATH
 from pyhaopenmotics.cloud.models.installation import Installation
+from pyhaopenmotics.helpers.features import FeatureMap
 
 if TYPE_CHECKING:
     from pyhaopenmotics.client.openmoticscloud import (
@@ -54,7 +56,7 @@ class OpenMoticsInstallations:
                 platform: CLASSIC|CORE|CORE_PLUS|ESAFE
 
         """
-        path = "/base/installations"
+        path = INSTALLATIONS_PATH
         if installation_filter:
             query_params = {"filter": installation_filter}
             body = await self._omcloud.get(
@@ -64,7 +66,10 @@ class OpenMoticsInstallations:
         else:
             body = await self._omcloud.get(path)
 
-        return [Installation.from_dict(installation) for installation in body["data"]]
+        installations = [Installation.from_dict(installation) for installation in body["data"]]
+        for installation in installations:
+            self._record_features(installation)
+        return installations
 
     async def get_by_id(
         self,
@@ -81,7 +86,20 @@ class OpenMoticsInstallations:
             a single Installation object
 
         """
-        path = f"/base/installations/{installation_id}"
+        path = self._omcloud.routes_for(installation_id).prefix
         body = await self._omcloud.get(path)
 
-        return Installation.from_dict(body["data"])
+        installation = Installation.from_dict(body["data"])
+        self._record_features(installation)
+        return installation
+
+    def _record_features(self, installation: Installation) -> None:
+        """Store the gateway features of an installation in the client.
+
+        Args:
+        ----
+            installation: Installation
+
+        """
+        if installation.gateway_features is not None:
+            self._omcloud.feature_maps[installation.idx] = FeatureMap(installation.gateway_features)
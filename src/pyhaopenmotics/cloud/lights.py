@@ -6,11 +6,14 @@ from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
 from pyhaopenmotics.cloud.models.light import Light
+from pyhaopenmotics.helpers.filters import cloud_filter
+from pyhaopenmotics.helpers.index import DOMAIN_LIGHTS
 
 if TYPE_CHECKING:
     from pyhaopenmotics.client.openmoticscloud import (
         OpenMoticsCloud,  # pylint: disable=R0401
     )
+    from pyhaopenmotics.helpers.filters import EntityFilter
 
 
 @dataclass
@@ -32,23 +35,24 @@ class OpenMoticsLights:
 
     async def get_all(
         self,
-        light_filter: str | None = None,
+        light_filter: EntityFilter | str | None = None,
     ) -> list[Light]:
         """Get a list of all light objects.
 
         Args:
         ----
-            light_filter: str
+            light_filter: EntityFilter, or a raw (URL encoded JSON) filter string
 
         Returns:
         -------
             Dict with all lights
 
         """
-        path = f"/base/installations/{self._omcloud.installation_id}/lights"
+        path = self._omcloud.routes.path("lights")
 
-        if light_filter:
-            query_params = {"filter": light_filter}
+        query, residual = cloud_filter(light_filter)
+        if query:
+            query_params = {"filter": query}
             body = await self._omcloud.get(
                 path=path,
                 params=query_params,
@@ -56,7 +60,9 @@ class OpenMoticsLights:
         else:
             body = await self._omcloud.get(path)
 
-        return [Light.from_dict(light) for light in body["data"]]
+        lights = [Light.from_dict(light) for light in body["data"]]
+        self._omcloud.index.update(DOMAIN_LIGHTS, lights, complete=query is None)
+        return lights if residual is None else residual.apply(lights)
 
     async def get_by_id(
         self,
@@ -73,7 +79,7 @@ class OpenMoticsLights:
             Returns a light with id
 
         """
-        path = f"/base/installations/{self._omcloud.installation_id}/lights/{light_id}"
+        path = self._omcloud.routes.path("lights/{}", light_id)
         body = await self._omcloud.get(path)
 
         return Light.from_dict(body["data"])
@@ -93,8 +99,11 @@ class OpenMoticsLights:
             Returns a light with id
 
         """
-        path = f"/base/installations/{self._omcloud.installation_id}/lights/{light_id}/toggle"
-        return await self._omcloud.post(path)
+        path = self._omcloud.routes.path("lights/{}/toggle", light_id)
+        current = self._omcloud.index.get(DOMAIN_LIGHTS, light_id)
+        on = getattr(getattr(current, "status", None), "on", None)
+        with self._omcloud.index.optimistic(DOMAIN_LIGHTS, light_id, {} if on is None else {"on": not on}):
+            return await self._omcloud.post(path)
 
     async def turn_on(
         self,
@@ -114,14 +123,17 @@ class OpenMoticsLights:
 
         """
         payload = {}
+        expected: dict[str, Any] = {"on": True}
 
         if value is not None:
             value = min(value, 100)
             value = max(0, value)
             payload = {"value": value}
+            expected["value"] = value
 
-        path = f"/base/installations/{self._omcloud.installation_id}/lights/{light_id}/turn_on"
-        return await self._omcloud.post(path, json=payload)
+        path = self._omcloud.routes.path("lights/{}/turn_on", light_id)
+        with self._omcloud.index.optimistic(DOMAIN_LIGHTS, light_id, expected):
+            return await self._omcloud.post(path, json=payload)
 
     async def turn_off(
         self,
@@ -140,8 +152,9 @@ class OpenMoticsLights:
         """
         if light_id is None:
             # Turn off all lights
-            path = f"/base/installations/{self._omcloud.installation_id}/lights/turn_off"
-        else:
-            # Turn off light with id
-            path = f"/base/installations/{self._omcloud.installation_id}/lights/{light_id}/turn_off"
-        return await self._omcloud.post(path)
+            path = self._omcloud.routes.path("lights/turn_off")
+            return await self._omcloud.post(path)
+        # Turn off light with id
+        path = self._omcloud.routes.path("lights/{}/turn_off", light_id)
+        with self._omcloud.index.optimistic(DOMAIN_LIGHTS, light_id, {"on": False}):
+            return await self._omcloud.post(path)
@@ -1,14 +1,37 @@
 """Init file for the models."""
 
-from pyhaopenmotics.cloud.models.groupaction import GroupAction
-from pyhaopenmotics.cloud.models.input import OMInput
-from pyhaopenmotics.cloud.models.installation import Installation
-from pyhaopenmotics.cloud.models.light import Light
-from pyhaopenmotics.cloud.models.location import Location
-from pyhaopenmotics.cloud.models.output import Output
-from pyhaopenmotics.cloud.models.sensor import Sensor
-from pyhaopenmotics.cloud.models.shutter import Shutter
-from pyhaopenmotics.cloud.models.thermostat import ThermostatGroup, ThermostatUnit
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from pyhaopenmotics.helpers.lazy import lazy_module
+
+if TYPE_CHECKING:
+    from pyhaopenmotics.cloud.models.groupaction import GroupAction
+    from pyhaopenmotics.cloud.models.input import OMInput
+    from pyhaopenmotics.cloud.models.installation import Installation
+    from pyhaopenmotics.cloud.models.light import Light
+    from pyhaopenmotics.cloud.models.location import Location
+    from pyhaopenmotics.cloud.models.output import Output
+    from pyhaopenmotics.cloud.models.sensor import Sensor
+    from pyhaopenmotics.cloud.models.shutter import Shutter
+    from pyhaopenmotics.cloud.models.thermostat import (
+        ThermostatGroup,
+        ThermostatUnit,
+    )
+
+_LAZY_IMPORTS = {
+    "GroupAction": "pyhaopenmotics.cloud.models.groupaction",
+    "OMInput": "pyhaopenmotics.cloud.models.input",
+    "Installation": "pyhaopenmotics.cloud.models.installation",
+    "Light": "pyhaopenmotics.cloud.models.light",
+    "Location": "pyhaopenmotics.cloud.models.location",
+    "Output": "pyhaopenmotics.cloud.models.output",
+    "Sensor": "pyhaopenmotics.cloud.models.sensor",
+    "Shutter": "pyhaopenmotics.cloud.models.shutter",
+    "ThermostatGroup": "pyhaopenmotics.cloud.models.thermostat",
+    "ThermostatUnit": "pyhaopenmotics.cloud.models.thermostat",
+}
 
 __all__ = [
     "GroupAction",
@@ -22,3 +45,5 @@ __all__ = [
     "ThermostatGroup",
     "ThermostatUnit",
 ]
+
+__getattr__, __dir__ = lazy_module(__name__, _LAZY_IMPORTS)
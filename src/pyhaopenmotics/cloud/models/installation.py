@@ -90,6 +90,7 @@ class Installation(DataClassORJSONMixin):
     network: Network | None = field(default=None)
     flags: dict[str, Any] | None = field(default=None)
     features: dict[str, Any] | None = field(default=None)
+    gateway_features: list[str] | None = field(default=None)
 
     def __str__(self) -> str:
         """Represent the class objects as a string.
@@ -6,11 +6,14 @@ from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
 from pyhaopenmotics.cloud.models.output import Output
+from pyhaopenmotics.helpers.filters import cloud_filter
+from pyhaopenmotics.helpers.index import DOMAIN_OUTPUTS
 
 if TYPE_CHECKING:
     from pyhaopenmotics.client.openmoticscloud import (
         OpenMoticsCloud,  # pylint: disable=R0401
     )
+    from pyhaopenmotics.helpers.filters import EntityFilter
 
 
 @dataclass
@@ -32,23 +35,24 @@ class OpenMoticsOutputs:
 
     async def get_all(
         self,
-        output_filter: str | None = None,
+        output_filter: EntityFilter | str | None = None,
     ) -> list[Output]:
         """Get a list of all output objects.
 
         Args:
         ----
-            output_filter: str
+            output_filter: EntityFilter, or a raw (URL encoded JSON) filter string
 
         Returns:
         -------
             A list of outputs
 
         """
-        path = f"/base/installations/{self._omcloud.installation_id}/outputs"
+        path = self._omcloud.routes.path("outputs")
 
-        if output_filter:
-            query_params = {"filter": output_filter}
+        query, residual = cloud_filter(output_filter)
+        if query:
+            query_params = {"filter": query}
             body = await self._omcloud.get(
                 path=path,
                 params=query_params,
@@ -56,7 +60,9 @@ class OpenMoticsOutputs:
         else:
             body = await self._omcloud.get(path)
 
-        return [Output.from_dict(output) for output in body["data"]]
+        outputs = [Output.from_dict(output) for output in body["data"]]
+        self._omcloud.index.update(DOMAIN_OUTPUTS, outputs, complete=query is None)
+        return outputs if residual is None else residual.apply(outputs)
 
     async def get_by_id(
         self,
@@ -73,7 +79,7 @@ class OpenMoticsOutputs:
             Returns a output with id
 
         """
-        path = f"/base/installations/{self._omcloud.installation_id}/outputs/{output_id}"
+        path = self._omcloud.routes.path("outputs/{}", output_id)
         body = await self._omcloud.get(path)
 
         return Output.from_dict(body["data"])
@@ -93,8 +99,11 @@ class OpenMoticsOutputs:
             Returns a output with id
 
         """
-        path = f"/base/installations/{self._omcloud.installation_id}/outputs/{output_id}/toggle"
-        return await self._omcloud.post(path)
+        path = self._omcloud.routes.path("outputs/{}/toggle", output_id)
+        current = self._omcloud.index.get(DOMAIN_OUTPUTS, output_id)
+        on = getattr(getattr(current, "status", None), "on", None)
+        with self._omcloud.index.optimistic(DOMAIN_OUTPUTS, output_id, {} if on is None else {"on": not on}):
+            return await self._omcloud.post(path)
 
     async def turn_on(
         self,
@@ -114,15 +123,18 @@ class OpenMoticsOutputs:
 
         """
         payload = {}
+        expected: dict[str, Any] = {"on": True}
 
         if value is not None:
             # value: <0 - 100>
             value = min(value, 100)
             value = max(0, value)
             payload = {"value": value}
+            expected["value"] = value
 
-        path = f"/base/installations/{self._omcloud.installation_id}/outputs/{output_id}/turn_on"
-        return await self._omcloud.post(path, json=payload)
+        path = self._omcloud.routes.path("outputs/{}/turn_on", output_id)
+        with self._omcloud.index.optimistic(DOMAIN_OUTPUTS, output_id, expected):
+            return await self._omcloud.post(path, json=payload)
 
     async def turn_off(
         self,
@@ -141,8 +153,9 @@ class OpenMoticsOutputs:
         """
         if output_id is None:
             # Turn off all lights
-            path = f"/base/installations/{self._omcloud.installation_id}/outputs/turn_off"
-        else:
-            # Turn off light with id
-            path = f"/base/installations/{self._omcloud.installation_id}/outputs/{output_id}/turn_off"
-        return await self._omcloud.post(path)
+            path = self._omcloud.routes.path("outputs/turn_off")
+            return await self._omcloud.post(path)
+        # Turn off light with id
+        path = self._omcloud.routes.path("outputs/{}/turn_off", output_id)
+        with self._omcloud.index.optimistic(DOMAIN_OUTPUTS, output_id, {"on": False}):
+            return await self._omcloud.post(path)
@@ -6,11 +6,14 @@ from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 from pyhaopenmotics.cloud.models.sensor import Sensor
+from pyhaopenmotics.helpers.filters import cloud_filter
+from pyhaopenmotics.helpers.index import DOMAIN_SENSORS
 
 if TYPE_CHECKING:
     from pyhaopenmotics.client.openmoticscloud import (
         OpenMoticsCloud,  # pylint: disable=R0401
     )
+    from pyhaopenmotics.helpers.filters import EntityFilter
 
 
 @dataclass
@@ -32,23 +35,24 @@ class OpenMoticsSensors:
 
     async def get_all(
         self,
-        sensor_filter: str | None = None,
+        sensor_filter: EntityFilter | str | None = None,
     ) -> list[Sensor]:
         """Get a list of all sensor objects.
 
         Args:
         ----
-            sensor_filter: str
+            sensor_filter: EntityFilter, or a raw (URL encoded JSON) filter string
 
         Returns:
         -------
             Dict with all sensors
 
         """
-        path = f"/base/installations/{self._omcloud.installation_id}/sensors"
+        path = self._omcloud.routes.path("sensors")
 
-        if sensor_filter:
-            query_params = {"filter": sensor_filter}
+        query, residual = cloud_filter(sensor_filter)
+        if query:
+            query_params = {"filter": query}
             body = await self._omcloud.get(
                 path=path,
                 params=query_params,
@@ -56,7 +60,9 @@ class OpenMoticsSensors:
         else:
             body = await self._omcloud.get(path)
 
-        return [Sensor.from_dict(sensor) for sensor in body["data"]]
+        sensors = [Sensor.from_dict(sensor) for sensor in body["data"]]
+        self._omcloud.index.update(DOMAIN_SENSORS, sensors, complete=query is None)
+        return sensors if residual is None else residual.apply(sensors)
 
     async def get_by_id(
         self,
@@ -73,7 +79,7 @@ class OpenMoticsSensors:
             Returns a sensor with id
 
         """
-        path = f"/base/installations/{self._omcloud.installation_id}/sensors/{sensor_id}"
+        path = self._omcloud.routes.path("sensors/{}", sensor_id)
         body = await self._omcloud.get(path)
 
         return Sensor.from_dict(body["data"])
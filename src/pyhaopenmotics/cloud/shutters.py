@@ -2,16 +2,25 @@
 
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
+from pyhaopenmotics.errors import OpenMoticsUnsupportedError
+from pyhaopenmotics.helpers.features import FEATURE_SHUTTER_POSITIONS
+from pyhaopenmotics.helpers.filters import cloud_filter
+from pyhaopenmotics.helpers.index import DOMAIN_SHUTTERS
+
 from .models.shutter import Shutter
 
+# Seconds a requested position waits for a read confirming it, shutters can
+# take up to a minute to get there.
+POSITION_PENDING_TIMEOUT = 60.0
+
 if TYPE_CHECKING:
     from pyhaopenmotics.client.openmoticscloud import (
         OpenMoticsCloud,  # pylint: disable=R0401
     )
+    from pyhaopenmotics.helpers.filters import EntityFilter
 
 
 @dataclass
@@ -33,13 +42,13 @@ class OpenMoticsShutters:
 
     async def get_all(
         self,
-        shutter_filter: str | None = None,
+        shutter_filter: EntityFilter | str | None = None,
     ) -> list[Shutter]:
         """List all Shutter objects.
 
         Args:
         ----
-            shutter_filter: Optional filter
+            shutter_filter: EntityFilter, or a raw (URL encoded JSON) filter string
 
         Returns:
         -------
@@ -51,9 +60,10 @@ class OpenMoticsShutters:
                 managed by an internal process.
 
         """
-        path = f"/base/installations/{self._omcloud.installation_id}/shutters"
-        if shutter_filter:
-            query_params = {"filter": shutter_filter}
+        path = self._omcloud.routes.path("shutters")
+        query, residual = cloud_filter(shutter_filter)
+        if query:
+            query_params = {"filter": query}
             body = await self._omcloud.get(
                 path=path,
                 params=query_params,
@@ -61,7 +71,9 @@ class OpenMoticsShutters:
         else:
             body = await self._omcloud.get(path)
 
-        return [Shutter.from_dict(shutter) for shutter in body["data"]]
+        shutters = [Shutter.from_dict(shutter) for shutter in body["data"]]
+        self._omcloud.index.update(DOMAIN_SHUTTERS, shutters, complete=query is None)
+        return shutters if residual is None else residual.apply(shutters)
 
     async def get_by_id(
         self,
@@ -78,7 +90,7 @@ class OpenMoticsShutters:
             Returns a shutter with id
 
         """
-        path = f"/base/installations/{self._omcloud.installation_id}/shutters/{shutter_id}"
+        path = self._omcloud.routes.path("shutters/{}", shutter_id)
         body = await self._omcloud.get(path)
 
         return Shutter.from_dict(body["data"])
@@ -98,7 +110,7 @@ class OpenMoticsShutters:
             Returns a shutter with id
 
         """
-        path = f"/base/installations/{self._omcloud.installation_id}/shutters/{shutter_id}/open"
+        path = self._omcloud.routes.path("shutters/{}/open", shutter_id)
         return await self._omcloud.post(path)
 
     async def move_down(
@@ -116,7 +128,7 @@ class OpenMoticsShutters:
             Returns a shutter with id
 
         """
-        path = f"/base/installations/{self._omcloud.installation_id}/shutters/{shutter_id}/close"
+        path = self._omcloud.routes.path("shutters/{}/close", shutter_id)
         return await self._omcloud.post(path)
 
     async def stop(
@@ -134,7 +146,7 @@ class OpenMoticsShutters:
             Returns a shutter with id
 
         """
-        path = f"/base/installations/{self._omcloud.installation_id}/shutters/{shutter_id}/stop"
+        path = self._omcloud.routes.path("shutters/{}/stop", shutter_id)
         return await self._omcloud.post(path)
 
     async def change_position(
@@ -157,15 +169,23 @@ class OpenMoticsShutters:
         -------
             Returns a shutter with id
 
+        Raises:
+        ------
+            OpenMoticsUnsupportedError: The gateway does not support shutter positions.
+
         """
-        # E501 line too long
-        path = f"/base/installations/{self._omcloud.installation_id}/shutters/{shutter_id}/change_position"
-        payload = json.dumps(
-            {
-                "position": position,
-            },
-        )
-        return await self._omcloud.post(path, json=payload)
+        if not self._omcloud.features.supports(FEATURE_SHUTTER_POSITIONS):
+            msg = "The gateway does not support shutter positions."
+            raise OpenMoticsUnsupportedError(msg)
+        path = self._omcloud.routes.path("shutters/{}/change_position", shutter_id)
+        payload = {"position": position}
+        with self._omcloud.index.optimistic(
+            DOMAIN_SHUTTERS,
+            shutter_id,
+            {"position": position},
+            timeout=POSITION_PENDING_TIMEOUT,
+        ):
+            return await self._omcloud.post(path, json=payload)
 
     async def change_relative_position(
         self,
@@ -187,14 +207,16 @@ class OpenMoticsShutters:
         -------
             Returns a shutter with id
 
+        Raises:
+        ------
+            OpenMoticsUnsupportedError: The gateway does not support shutter positions.
+
         """
-        # E501 line too long
-        path = f"/base/installations/{self._omcloud.installation_id}/shutters/{shutter_id}/change_relative_position"
-        payload = json.dumps(
-            {
-                "offset": offset,
-            },
-        )
+        if not self._omcloud.features.supports(FEATURE_SHUTTER_POSITIONS):
+            msg = "The gateway does not support shutter positions."
+            raise OpenMoticsUnsupportedError(msg)
+        path = self._omcloud.routes.path("shutters/{}/change_relative_position", shutter_id)
+        payload = {"offset": offset}
         return await self._omcloud.post(path, json=payload)
 
     async def lock(
@@ -219,7 +241,7 @@ class OpenMoticsShutters:
             Returns the lock_type as response.
 
         """
-        path = f"/base/installations/{self._omcloud.installation_id}/shutters/{shutter_id}/lock"
+        path = self._omcloud.routes.path("shutters/{}/lock", shutter_id)
         return await self._omcloud.post(path)
 
     async def unlock(
@@ -237,7 +259,7 @@ class OpenMoticsShutters:
             Returns a shutter with id
 
         """
-        path = f"/base/installations/{self._omcloud.installation_id}/shutters/{shutter_id}/unlock"
+        path = self._omcloud.routes.path("shutters/{}/unlock", shutter_id)
         return await self._omcloud.post(path)
 
     async def preset(
@@ -261,12 +283,8 @@ class OpenMoticsShutters:
             Returns a shutter with id
 
         """
-        path = f"/base/installations/{self._omcloud.installation_id}/shutters/{shutter_id}/preset"
-        payload = json.dumps(
-            {
-                "position": position,
-            },
-        )
+        path = self._omcloud.routes.path("shutters/{}/preset", shutter_id)
+        payload = {"position": position}
         return await self._omcloud.post(path, json=payload)
 
     async def move_to_preset(
@@ -286,5 +304,5 @@ class OpenMoticsShutters:
             Returns a shutter with id
 
         """
-        path = f"/base/installations/{self._omcloud.installation_id}/shutters/{shutter_id}/move"
+        path = self._omcloud.routes.path("shutters/{}/move", shutter_id)
         return await self._omcloud.post(path)
@@ -6,6 +6,7 @@ from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
 from pyhaopenmotics.cloud.models.thermostat import ThermostatGroup, ThermostatUnit
+from pyhaopenmotics.helpers.index import DOMAIN_THERMOSTATS
 
 if TYPE_CHECKING:
     from pyhaopenmotics.client.openmoticscloud import (
@@ -48,7 +49,7 @@ class OpenMoticsThermostats:
             Returns something
 
         """
-        path = f"/base/installations/{self._omcloud.installation_id}/thermostats/mode"
+        path = self._omcloud.routes.path("thermostats/mode")
         payload = {"mode": mode}
         return await self._omcloud.post(path, json=payload)
 
@@ -67,7 +68,7 @@ class OpenMoticsThermostats:
             Returns something
 
         """
-        path = f"/base/installations/{self._omcloud.installation_id}/thermostats/state"
+        path = self._omcloud.routes.path("thermostats/state")
         payload = {"state": state}
         return await self._omcloud.post(path, json=payload)
 
@@ -103,7 +104,7 @@ class OpenMoticsThermostatGroups:
             Dict with all thermostats
 
         """
-        path = f"/base/installations/{self._omcloud.installation_id}/thermostats/groups"
+        path = self._omcloud.routes.path("thermostats/groups")
 
         body = await self._omcloud.get(path)
 
@@ -124,7 +125,7 @@ class OpenMoticsThermostatGroups:
             Returns a thermostatgroup_id with id
 
         """
-        path = f"/base/installations/{self._omcloud.installation_id}/thermostats/groups/{thermostatgroup_id}"
+        path = self._omcloud.routes.path("thermostats/groups/{}", thermostatgroup_id)
         body = await self._omcloud.get(path)
 
         return ThermostatGroup.from_dict(body["data"])
@@ -146,7 +147,7 @@ class OpenMoticsThermostatGroups:
             Returns a output with id
 
         """
-        path = f"/base/installations/{self._omcloud.installation_id}/thermostats/groups/{thermostatgroup_id}/mode"
+        path = self._omcloud.routes.path("thermostats/groups/{}/mode", thermostatgroup_id)
         payload = {"mode": mode}
         return await self._omcloud.post(path, json=payload)
 
@@ -181,11 +182,13 @@ class OpenMoticsThermostatUnits:
             Dict with all thermostatunits
 
         """
-        path = f"/base/installations/{self._omcloud.installation_id}/thermostats/units"
+        path = self._omcloud.routes.path("thermostats/units")
 
         body = await self._omcloud.get(path)
 
-        return [ThermostatUnit.from_dict(thermostatunit) for thermostatunit in body["data"]]
+        thermostatunits = [ThermostatUnit.from_dict(thermostatunit) for thermostatunit in body["data"]]
+        self._omcloud.index.update(DOMAIN_THERMOSTATS, thermostatunits)
+        return thermostatunits
 
     async def get_by_id(
         self,
@@ -202,7 +205,7 @@ class OpenMoticsThermostatUnits:
             Returns a thermostatunit with id
 
         """
-        path = f"/base/installations/{self._omcloud.installation_id}/thermostats/units/{thermostatunit_id}"
+        path = self._omcloud.routes.path("thermostats/units/{}", thermostatunit_id)
         body = await self._omcloud.get(path)
 
         return ThermostatUnit.from_dict(body["data"])
@@ -224,7 +227,7 @@ class OpenMoticsThermostatUnits:
             Returns a thermostatunit with id
 
         """
-        path = f"/base/installations/{self._omcloud.installation_id}/thermostats/units/{thermostatunit_id}/state"
+        path = self._omcloud.routes.path("thermostats/units/{}/state", thermostatunit_id)
         payload = {"state": state}
         return await self._omcloud.post(path, json=payload)
 
@@ -245,9 +248,10 @@ class OpenMoticsThermostatUnits:
             Returns a thermostatunit with id
 
         """
-        path = f"/base/installations/{self._omcloud.installation_id}/thermostats/units/{thermostatunit_id}/setpoint"
+        path = self._omcloud.routes.path("thermostats/units/{}/setpoint", thermostatunit_id)
         payload = {"temperature": temperature}
-        return await self._omcloud.post(path, json=payload)
+        with self._omcloud.index.optimistic(DOMAIN_THERMOSTATS, thermostatunit_id, {"current_setpoint": temperature}):
+            return await self._omcloud.post(path, json=payload)
 
     async def set_preset(
         self,
@@ -266,7 +270,7 @@ class OpenMoticsThermostatUnits:
             Returns a thermostatunit with id
 
         """
-        path = f"/base/installations/{self._omcloud.installation_id}/thermostats/units/{thermostatunit_id}/preset"
+        path = self._omcloud.routes.path("thermostats/units/{}/preset", thermostatunit_id)
         payload = {"preset": preset}
         return await self._omcloud.post(path, json=payload)
 
@@ -297,7 +301,7 @@ class OpenMoticsThermostatUnits:
             Returns a thermostatunit with id
 
         """
-        path = f"/base/installations/{self._omcloud.installation_id}/thermostats/units/{thermostatunit_id}/preset/config"
+        path = self._omcloud.routes.path("thermostats/units/{}/preset/config", thermostatunit_id)
         payload = {
             "heating": {
                 "AWAY": heating_away_temp,
@@ -17,5 +17,17 @@ class OpenMoticsConnectionTimeoutError(OpenMoticsConnectionError):
     """OpenMotics connection Timeout exception."""
 
 
+class OpenMoticsCircuitOpenError(OpenMoticsConnectionError):
+    """OpenMotics exception raised while the circuit of a gateway is open."""
+
+
+class OpenMoticsQueueFullError(OpenMoticsError):
+    """OpenMotics exception raised when too many requests are waiting for the gateway."""
+
+
+class OpenMoticsUnsupportedError(OpenMoticsError):
+    """OpenMotics exception raised when the gateway does not support a feature."""
+
+
 class AuthenticationError(Exception):
     """Exception is raised when the user credentials are not valid."""
@@ -0,0 +1,371 @@
+"""Export the changes of the entity index as a stream of records.
+
+Each record holds a monotonic timestamp, the gateway, the domain, the id of
+the entity and only the fields that changed, e.g.::
+
+    {"ts":1234.5,"gateway":"192.168.0.2:443","domain":"outputs","id":3,"changed":{"status":{"on":true}}}
+
+Optimistic states applied after a command carry ``"pending":true``; the
+record of the read confirming or rolling back such a state does not.
+
+Records are encoded as NDJSON (with orjson) or msgpack (optional ``msgpack``
+extra) and written in batches to a sink: a rotating file, a Unix socket, a
+multiprocessing connection or any binary stream such as a pipe or stdout.
+Sinks write blocking, so a started exporter with a ``flush_interval`` writes
+its batches from a worker thread, off the event loop. Without a flush
+interval, and on an explicit ``flush``, the batch is written in the caller.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import os
+import socket
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO, Protocol
+
+import orjson
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from multiprocessing.connection import Connection
+    from typing import Self
+
+    from pyhaopenmotics.helpers.index import EntityChange, EntityIndex
+
+_LOGGER = logging.getLogger(__name__)
+
+FORMAT_NDJSON = "ndjson"
+FORMAT_MSGPACK = "msgpack"
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_FLUSH_INTERVAL = 1.0
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 5
+
+
+class Sink(Protocol):
+    """Destination of the encoded records, its writes may block."""
+
+    def write(self, data: bytes) -> None:
+        """Write a batch of encoded records, never from two threads at once."""
+
+    def close(self) -> None:
+        """Release the sink."""
+
+
+class StreamSink:
+    """Write records to a binary stream, e.g. a pipe or ``sys.stdout.buffer``."""
+
+    def __init__(self, stream: BinaryIO) -> None:
+        """Init the sink.
+
+        Args:
+        ----
+            stream: writable binary stream
+
+        """
+        self.stream = stream
+
+    def write(self, data: bytes) -> None:
+        """Write a batch of encoded records.
+
+        Args:
+        ----
+            data: bytes
+
+        """
+        self.stream.write(data)
+        self.stream.flush()
+
+    def close(self) -> None:
+        """Flush the stream, it is owned by the caller."""
+        self.stream.flush()
+
+
+class RotatingFileSink:
+    """Append records to a file, rotated once it grows beyond ``max_bytes``.
+
+    Rotated files are renamed to ``<path>.1``, ``<path>.2``, ... and only
+    ``backup_count`` of them are kept.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        backup_count: int = DEFAULT_BACKUP_COUNT,
+    ) -> None:
+        """Init the sink.
+
+        Args:
+        ----
+            path: file to write to
+            max_bytes: size after which the file is rotated
+            backup_count: number of rotated files to keep
+
+        """
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._file: BinaryIO = self.path.open("ab")
+
+    def _rotate(self) -> None:
+        """Move the current file to the first backup."""
+        self._file.close()
+        for index in range(self.backup_count - 1, 0, -1):
+            source = self.path.with_name(f"{self.path.name}.{index}")
+            if source.exists():
+                source.replace(self.path.with_name(f"{self.path.name}.{index + 1}"))
+        if self.backup_count > 0:
+            self.path.replace(self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink()
+        self._file = self.path.open("ab")
+
+    def write(self, data: bytes) -> None:
+        """Write a batch of encoded records.
+
+        Args:
+        ----
+            data: bytes
+
+        """
+        if self._file.tell() and self._file.tell() + len(data) > self.max_bytes:
+            self._rotate()
+        self._file.write(data)
+        self._file.flush()
+
+    def close(self) -> None:
+        """Close the file."""
+        self._file.close()
+
+
+class UnixSocketSink:
+    """Send records to a listening Unix socket."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        """Init the sink and connect.
+
+        Args:
+        ----
+            path: path of the Unix socket
+
+        """
+        self.path = os.fspath(path)
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.connect(self.path)
+
+    def write(self, data: bytes) -> None:
+        """Write a batch of encoded records.
+
+        Args:
+        ----
+            data: bytes
+
+        """
+        self._socket.sendall(data)
+
+    def close(self) -> None:
+        """Close the socket."""
+        self._socket.close()
+
+
+class ConnectionSink:
+    """Send every batch as one message over a multiprocessing connection."""
+
+    def __init__(self, connection: Connection) -> None:
+        """Init the sink.
+
+        Args:
+        ----
+            connection: writable end of a ``multiprocessing.Pipe``
+
+        """
+        self.connection = connection
+
+    def write(self, data: bytes) -> None:
+        """Send a batch of encoded records.
+
+        Args:
+        ----
+            data: bytes
+
+        """
+        self.connection.send_bytes(data)
+
+    def close(self) -> None:
+        """Close the connection, the reader gets EOFError."""
+        self.connection.close()
+
+
+def _get_encoder(fmt: str) -> Callable[[dict[str, Any]], bytes]:
+    """Return the function encoding a single record.
+
+    Args:
+    ----
+        fmt: FORMAT_NDJSON or FORMAT_MSGPACK
+
+    Returns:
+    -------
+        Callable
+
+    Raises:
+    ------
+        ImportError: msgpack is requested but not installed.
+        ValueError: unknown format.
+
+    """
+    if fmt == FORMAT_NDJSON:
+        return lambda record: orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+    if fmt == FORMAT_MSGPACK:
+        try:
+            import msgpack  # pylint: disable=import-outside-toplevel
+        except ImportError as exception:
+            msg = "msgpack is not installed, install pyhaopenmotics[msgpack]."
+            raise ImportError(msg) from exception
+        return msgpack.Packer().pack
+    msg = f"Unknown change stream format: {fmt}"
+    raise ValueError(msg)
+
+
+class ChangeStreamExporter:
+    """Write the changes of an entity index to a sink in batches."""
+
+    def __init__(
+        self,
+        index: EntityIndex,
+        sink: Sink,
+        *,
+        gateway: str,
+        fmt: str = FORMAT_NDJSON,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+    ) -> None:
+        """Init the exporter.
+
+        Args:
+        ----
+            index: EntityIndex of a client, e.g. ``client.index``
+            sink: StreamSink, RotatingFileSink, UnixSocketSink, ...
+            gateway: name of the gateway in the records
+            fmt: FORMAT_NDJSON or FORMAT_MSGPACK
+            batch_size: records buffered before they are written
+            flush_interval: seconds after which buffered records are written anyway
+
+        """
+        self.index = index
+        self.sink = sink
+        self.gateway = gateway
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._encode = _get_encoder(fmt)
+        self._buffer: list[bytes] = []
+        self._unsubscribe: Callable[[], None] | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._batch_full = asyncio.Event()
+
+    def start(self) -> None:
+        """Subscribe to the index and write the batches from a task, if flush_interval is set."""
+        if self._unsubscribe is None:
+            self._unsubscribe = self.index.subscribe(self._on_change)
+        if self._task is None and self.flush_interval > 0:
+            self._task = asyncio.get_running_loop().create_task(self._write_batches())
+
+    async def stop(self) -> None:
+        """Unsubscribe, write the buffered records and close the sink."""
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        if self._task is not None:
+            # The task writes the last batch and ends.
+            self._batch_full.set()
+            await self._task
+            self._task = None
+        self.flush()
+        self.sink.close()
+
+    def _on_change(self, change: EntityChange) -> None:
+        """Encode a change and buffer it.
+
+        Args:
+        ----
+            change: EntityChange
+
+        """
+        record: dict[str, Any] = {
+            "ts": change.timestamp,
+            "gateway": self.gateway,
+            "domain": change.domain,
+            "id": change.idx,
+            "changed": change.changed,
+        }
+        if change.removed:
+            record["removed"] = True
+        if change.pending:
+            record["pending"] = True
+        self._buffer.append(self._encode(record))
+        if len(self._buffer) >= self.batch_size:
+            if self._task is None:
+                self.flush()
+            else:
+                self._batch_full.set()
+
+    def _take_batch(self) -> bytes | None:
+        """Return the buffered records as one batch and empty the buffer.
+
+        Returns
+        -------
+            bytes, or None when nothing is buffered
+
+        """
+        if not self._buffer:
+            return None
+        data = b"".join(self._buffer)
+        self._buffer.clear()
+        return data
+
+    def flush(self) -> None:
+        """Write the buffered records to the sink in a single, blocking write."""
+        if (data := self._take_batch()) is None:
+            return
+        try:
+            self.sink.write(data)
+        except OSError:
+            _LOGGER.exception("Writing %d bytes of changes failed", len(data))
+
+    async def _write_batches(self) -> None:
+        """Write the buffer from a worker thread when a batch is full or flush_interval passed."""
+        while self._unsubscribe is not None:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._batch_full.wait(), self.flush_interval)
+            self._batch_full.clear()
+            if (data := self._take_batch()) is None:
+                continue
+            try:
+                await asyncio.to_thread(self.sink.write, data)
+            except OSError:
+                _LOGGER.exception("Writing %d bytes of changes failed", len(data))
+
+    async def __aenter__(self) -> Self:
+        """Start the exporter.
+
+        Returns
+        -------
+            The ChangeStreamExporter object.
+
+        """
+        self.start()
+        return self
+
+    async def __aexit__(self, *_exc_info: object) -> None:
+        """Stop the exporter.
+
+        Args:
+        ----
+            _exc_info: Exec type.
+
+        """
+        await self.stop()
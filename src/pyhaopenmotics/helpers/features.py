@@ -0,0 +1,153 @@
+"""Features and actions supported by an OpenMotics gateway."""
+
+from __future__ import annotations
+
+from typing import Any
+
+FEATURE_SHUTTER_POSITIONS = "shutter_positions"
+FEATURE_INPUT_STATES = "input_states"
+FEATURE_100_STEPS_DIMMER = "100_steps_dimmer"
+
+
+def error_status(exception: BaseException) -> int | None:
+    """Return the HTTP status of the response a request failed with.
+
+    Args:
+    ----
+        exception: the error raised by the client
+
+    Returns:
+    -------
+        The status, or None when the request got no response.
+
+    """
+    cause = exception.__cause__
+    if (response := getattr(cause, "response", None)) is not None:
+        # httpx, used by the HTTP/2 transport
+        return getattr(response, "status_code", None)
+    return getattr(cause, "status", None)
+
+
+def is_unsupported_error(exception: BaseException) -> bool:
+    """Return True when a request failed because the gateway does not know the action.
+
+    Args:
+    ----
+        exception: the error raised by the client
+
+    Returns:
+    -------
+        bool
+
+    """
+    return error_status(exception) == 404
+
+
+class FeatureMap:
+    """Features of a gateway, plus the actions it turned out not to support.
+
+    The features come from the ``get_features`` action of the gateway or from
+    ``gateway_features`` of the cloud installation. Until they are known,
+    every feature is assumed to be supported, so nothing is skipped on a
+    gateway that was not probed. Actions answered with a 404 are remembered,
+    so they are not requested again on the next poll.
+
+    The map can be stored with ``to_dict`` and passed back to the client on
+    the next start, which saves the probe.
+    """
+
+    def __init__(
+        self,
+        features: list[str] | None = None,
+        unsupported_actions: list[str] | None = None,
+    ) -> None:
+        """Init the feature map.
+
+        Args:
+        ----
+            features: the gateway features, None when not probed yet
+            unsupported_actions: actions the gateway does not know
+
+        """
+        self.features: set[str] | None = None if features is None else set(features)
+        self.unsupported_actions: set[str] = set(unsupported_actions or [])
+
+    @property
+    def probed(self) -> bool:
+        """Return True when the gateway features are known.
+
+        Returns
+        -------
+            bool
+
+        """
+        return self.features is not None
+
+    def supports(self, feature: str) -> bool:
+        """Return True when the gateway supports (or may support) a feature.
+
+        Args:
+        ----
+            feature: e.g. shutter_positions
+
+        Returns:
+        -------
+            bool
+
+        """
+        return self.features is None or feature in self.features
+
+    def action_supported(self, action: str) -> bool:
+        """Return False when the gateway is known not to support an action.
+
+        Args:
+        ----
+            action: e.g. get_thermostat_configurations
+
+        Returns:
+        -------
+            bool
+
+        """
+        return action not in self.unsupported_actions
+
+    def mark_unsupported(self, action: str) -> None:
+        """Remember the gateway does not support an action.
+
+        Args:
+        ----
+            action: e.g. get_thermostat_configurations
+
+        """
+        self.unsupported_actions.add(action)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the feature map as a dict, for storage.
+
+        Returns
+        -------
+            dict
+
+        """
+        return {
+            "features": None if self.features is None else sorted(self.features),
+            "unsupported_actions": sorted(self.unsupported_actions),
+        }
+
+    @staticmethod
+    def from_dict(data: dict[str, Any]) -> FeatureMap:
+        """Return a FeatureMap from a stored dict.
+
+        Args:
+        ----
+            data: dict created by to_dict
+
+        Returns:
+        -------
+            A FeatureMap object.
+
+        """
+        return FeatureMap(
+            features=data.get("features"),
+            unsupported_actions=data.get("unsupported_actions"),
+        )
@@ -0,0 +1,213 @@
+"""Typed filters for the get_all methods of the domains."""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field, fields, replace
+from functools import cached_property
+from typing import Any
+
+# Attributes holding the type of an entity, depending on the domain.
+_TYPE_ATTRIBUTES = ("output_type", "shutter_type", "physical_quantity")
+
+
+def entity_type(entity: Any) -> Any:
+    """Return the type of an entity, e.g. OUTLET or temperature.
+
+    Args:
+    ----
+        entity: an Output, Light, Shutter, Sensor, ... object
+
+    Returns:
+    -------
+        type, or None
+
+    """
+    for attribute in _TYPE_ATTRIBUTES:
+        if (value := getattr(entity, attribute, None)) is not None:
+            return value
+    return None
+
+
+def entity_room(entity: Any) -> Any:
+    """Return the room id of an entity.
+
+    Args:
+    ----
+        entity: an Output, Light, Shutter, Sensor, ... object
+
+    Returns:
+    -------
+        room id, or None
+
+    """
+    if (location := getattr(entity, "location", None)) is not None:
+        return getattr(location, "room_id", None)
+    return getattr(entity, "room", None)
+
+
+def entity_floor(entity: Any) -> Any:
+    """Return the floor id of an entity.
+
+    Args:
+    ----
+        entity: an Output, Light, Shutter, Sensor, ... object
+
+    Returns:
+    -------
+        floor id, or None
+
+    """
+    if (location := getattr(entity, "location", None)) is not None:
+        return getattr(location, "floor_id", None)
+    return None
+
+
+def _as_tuple(value: Any) -> tuple[Any, ...]:
+    """Return a single value or an iterable of values as a tuple."""
+    if value is None:
+        return ()
+    if isinstance(value, str | int) or not isinstance(value, Iterable):
+        return (value,)
+    return tuple(value)
+
+
+@dataclass(frozen=True)
+class EntityFilter:
+    """Filter on the type, room, floor, capabilities or state of entities.
+
+    Every criterion that is given must match; within a criterion, any of the
+    values may match. Capabilities must all be present. ``state`` maps
+    attributes of the entity status to their expected value, e.g.
+    ``{"on": True}``.
+
+    Examples
+    --------
+        EntityFilter(types="LIGHT", rooms=(1, 2), state={"on": True})
+
+    """
+
+    types: tuple[str, ...] = ()
+    rooms: tuple[int, ...] = ()
+    floors: tuple[int, ...] = ()
+    capabilities: tuple[str, ...] = ()
+    state: dict[str, Any] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        """Accept single values and lists for the criteria."""
+        for name in ("types", "rooms", "floors", "capabilities"):
+            object.__setattr__(self, name, _as_tuple(getattr(self, name)))
+
+    def __bool__(self) -> bool:
+        """Return True when the filter has at least one criterion."""
+        return any(getattr(self, criterion.name) for criterion in fields(self))
+
+    @cached_property
+    def predicate(self) -> Callable[[Any], bool]:
+        """Return the filter compiled to a predicate.
+
+        Only the given criteria are checked, so an empty filter costs a
+        single call per entity.
+
+        Returns
+        -------
+            Callable taking an entity and returning True when it matches.
+
+        """
+        checks: list[Callable[[Any], bool]] = []
+        if self.types:
+            types = frozenset(self.types)
+            checks.append(lambda entity: entity_type(entity) in types)
+        if self.rooms:
+            rooms = frozenset(self.rooms)
+            checks.append(lambda entity: entity_room(entity) in rooms)
+        if self.floors:
+            floors = frozenset(self.floors)
+            checks.append(lambda entity: entity_floor(entity) in floors)
+        if self.capabilities:
+            capabilities = frozenset(self.capabilities)
+            checks.append(lambda entity: capabilities.issubset(getattr(entity, "capabilities", None) or ()))
+        if self.state:
+            state = tuple(self.state.items())
+            checks.append(
+                lambda entity: all(getattr(entity.status, key, None) == value for key, value in state),
+            )
+        return lambda entity: all(check(entity) for check in checks)
+
+    def matches(self, entity: Any) -> bool:
+        """Return True when an entity matches the filter.
+
+        Args:
+        ----
+            entity: an Output, Light, Shutter, Sensor, ... object
+
+        Returns:
+        -------
+            bool
+
+        """
+        return self.predicate(entity)
+
+    def apply(self, entities: list[Any]) -> list[Any]:
+        """Return the entities matching the filter.
+
+        Args:
+        ----
+            entities: list of entities
+
+        Returns:
+        -------
+            list of entities
+
+        """
+        if not self:
+            return entities
+        predicate = self.predicate
+        return [entity for entity in entities if entity is not None and predicate(entity)]
+
+    def to_cloud(self) -> tuple[str | None, EntityFilter]:
+        """Compile the filter for the cloud API.
+
+        The cloud filters on a single type, room and floor. Those criteria are
+        sent in the ``filter`` query parameter; the others are returned as a
+        residual filter that has to be applied to the response.
+
+        Returns
+        -------
+            The URL-encodable JSON filter (or None) and the residual filter.
+
+        """
+        query: dict[str, Any] = {}
+        residual = self
+        if len(self.types) == 1:
+            query["type"] = self.types[0]
+            residual = replace(residual, types=())
+        location: dict[str, Any] = {}
+        if len(self.rooms) == 1:
+            location["room_id"] = self.rooms[0]
+            residual = replace(residual, rooms=())
+        if len(self.floors) == 1:
+            location["floor_id"] = self.floors[0]
+            residual = replace(residual, floors=())
+        if location:
+            query["location"] = location
+        return (json.dumps(query, separators=(",", ":")) if query else None), residual
+
+
+def cloud_filter(entity_filter: EntityFilter | str | None) -> tuple[str | None, EntityFilter | None]:
+    """Split a filter of a cloud get_all in its server and client part.
+
+    Args:
+    ----
+        entity_filter: EntityFilter, or a raw JSON filter string for the cloud API
+
+    Returns:
+    -------
+        The filter query parameter and the filter to apply to the response.
+
+    """
+    if entity_filter is None or isinstance(entity_filter, str):
+        return entity_filter or None, None
+    query, residual = entity_filter.to_cloud()
+    return query, (residual if residual else None)
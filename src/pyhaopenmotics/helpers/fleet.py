@@ -0,0 +1,255 @@
+"""Collect the state of a fleet of gateways in worker processes.
+
+Building the models of every response and diffing them against the index
+is CPU bound, so a single process polling hundreds of gateways keeps one
+core busy and falls behind. The collector shards the gateways over worker
+processes. Every worker runs its own event loop with a client per gateway,
+polls them and sends only the changes back to the parent: the change stream
+records (see ``changestream``), as one NDJSON batch per poll round over a
+pipe.
+
+    async with FleetCollector(gateways, interval=30) as collector:
+        async for record in collector.changes():
+            ...  # {"ts":..., "gateway":"gw1", "domain":"outputs", "id":3, "changed":{...}}
+
+Gateways are passed to the workers by pickling, so their client options
+cannot hold sessions, SSL contexts or token refresh methods.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import multiprocessing
+import os
+import time
+from dataclasses import dataclass, field
+from multiprocessing.connection import wait
+from typing import TYPE_CHECKING, Any
+
+import orjson
+
+from pyhaopenmotics.errors import OpenMoticsError
+from pyhaopenmotics.helpers.changestream import ChangeStreamExporter, ConnectionSink
+from pyhaopenmotics.helpers.index import DOMAIN_OUTPUTS, DOMAIN_SENSORS, DOMAIN_SHUTTERS
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Sequence
+    from multiprocessing.connection import Connection
+    from multiprocessing.context import SpawnProcess
+    from multiprocessing.synchronize import Event
+    from typing import Self
+
+    from pyhaopenmotics.client.baseclient import BaseClient
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 10.0
+DEFAULT_DOMAINS = (DOMAIN_OUTPUTS, DOMAIN_SENSORS, DOMAIN_SHUTTERS)
+# Records of a worker buffered before they are sent, a poll round is sent at once anyway.
+WORKER_BATCH_SIZE = 1000
+# Seconds the parent waits for data before checking for cancellation.
+RECEIVE_TIMEOUT = 1.0
+# Seconds a worker gets to close its clients before it is terminated.
+STOP_TIMEOUT = 10.0
+
+
+@dataclass(frozen=True)
+class FleetGateway:
+    """A gateway of the fleet and how to connect to it."""
+
+    # Name of the gateway in the change records.
+    name: str
+    # Keyword arguments of the client, e.g. {"localgw": "10.0.0.2", "username": ..., "password": ...}.
+    options: dict[str, Any] = field(default_factory=dict)
+    # True to use OpenMoticsCloud (options hold token and installation_id), else LocalGateway.
+    cloud: bool = False
+
+
+def shard_gateways(gateways: Sequence[FleetGateway], processes: int) -> list[list[FleetGateway]]:
+    """Spread the gateways round-robin over the worker processes.
+
+    Args:
+    ----
+        gateways: all gateways of the fleet
+        processes: number of worker processes
+
+    Returns:
+    -------
+        The gateways of every worker, without empty shards.
+
+    """
+    shards = [list(gateways[start::processes]) for start in range(max(processes, 1))]
+    return [shard for shard in shards if shard]
+
+
+def _create_client(gateway: FleetGateway) -> BaseClient:
+    """Create the client of a gateway inside a worker."""
+    if gateway.cloud:
+        from pyhaopenmotics.client.openmoticscloud import OpenMoticsCloud  # pylint: disable=import-outside-toplevel
+
+        return OpenMoticsCloud(**gateway.options)
+    from pyhaopenmotics.client.localgateway import LocalGateway  # pylint: disable=import-outside-toplevel
+
+    return LocalGateway(**gateway.options)
+
+
+async def _poll(client: BaseClient, name: str, domains: Sequence[str]) -> None:
+    """Refresh the domains of a client, which fills its index."""
+    for domain in domains:
+        try:
+            await getattr(client, domain).get_all()
+        except OpenMoticsError as exception:
+            _LOGGER.warning("Polling %s of %s failed: %s", domain, name, exception)
+
+
+async def _collect(
+    gateways: Sequence[FleetGateway],
+    connection: Connection,
+    stop: Event,
+    interval: float,
+    domains: Sequence[str],
+) -> None:
+    """Poll the gateways of a worker until stop is set."""
+    sink = ConnectionSink(connection)
+    clients = [_create_client(gateway) for gateway in gateways]
+    exporters = [
+        ChangeStreamExporter(client.index, sink, gateway=gateway.name, batch_size=WORKER_BATCH_SIZE, flush_interval=0)
+        for client, gateway in zip(clients, gateways, strict=True)
+    ]
+    for exporter in exporters:
+        exporter.start()
+    try:
+        while not stop.is_set():
+            started = time.monotonic()
+            await asyncio.gather(
+                *(_poll(client, gateway.name, domains) for client, gateway in zip(clients, gateways, strict=True)),
+            )
+            for exporter in exporters:
+                exporter.flush()
+            await asyncio.to_thread(stop.wait, max(interval - (time.monotonic() - started), 0))
+    finally:
+        for exporter in exporters:
+            exporter.flush()
+        # The exporters share the sink, so it is closed once.
+        sink.close()
+        for client in clients:
+            await client.close()
+
+
+def _run_worker(
+    gateways: Sequence[FleetGateway],
+    connection: Connection,
+    stop: Event,
+    interval: float,
+    domains: Sequence[str],
+) -> None:
+    """Entry point of a worker process."""
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(_collect(gateways, connection, stop, interval, domains))
+
+
+class FleetCollector:
+    """Poll a fleet of gateways in worker processes and merge their changes."""
+
+    def __init__(
+        self,
+        gateways: Sequence[FleetGateway],
+        *,
+        processes: int | None = None,
+        interval: float = DEFAULT_INTERVAL,
+        domains: Sequence[str] = DEFAULT_DOMAINS,
+    ) -> None:
+        """Init the collector.
+
+        Args:
+        ----
+            gateways: all gateways of the fleet
+            processes: number of worker processes, defaults to the number of cores
+            interval: seconds between two polls of a gateway
+            domains: domains that are polled, e.g. ("outputs", "sensors")
+
+        """
+        self.gateways = list(gateways)
+        self.processes = processes or os.cpu_count() or 1
+        self.interval = interval
+        self.domains = tuple(domains)
+        self._context = multiprocessing.get_context("spawn")
+        self._stop = self._context.Event()
+        self._workers: list[SpawnProcess] = []
+        self._connections: list[Connection] = []
+
+    def start(self) -> None:
+        """Start a worker process per shard of gateways."""
+        if self._workers:
+            return
+        self._stop.clear()
+        for shard in shard_gateways(self.gateways, self.processes):
+            reader, writer = self._context.Pipe(duplex=False)
+            worker = self._context.Process(
+                target=_run_worker,
+                args=(shard, writer, self._stop, self.interval, self.domains),
+                name=f"pyhaopenmotics-fleet-{len(self._workers)}",
+                daemon=True,
+            )
+            worker.start()
+            # Only the worker writes, so the reader sees EOF when it exits.
+            writer.close()
+            self._workers.append(worker)
+            self._connections.append(reader)
+
+    async def changes(self) -> AsyncIterator[dict[str, Any]]:
+        """Yield the change records of all workers as they arrive.
+
+        Yields
+        ------
+            change stream record
+
+        """
+        connections = list(self._connections)
+        while connections:
+            ready = await asyncio.to_thread(wait, connections, RECEIVE_TIMEOUT)
+            for connection in ready:
+                try:
+                    data = connection.recv_bytes()  # type: ignore[union-attr]
+                except EOFError:
+                    _LOGGER.debug("A fleet worker stopped sending changes")
+                    connections.remove(connection)  # type: ignore[arg-type]
+                    continue
+                for line in data.splitlines():
+                    yield orjson.loads(line)
+
+    async def stop(self) -> None:
+        """Stop the workers, they close their clients first."""
+        self._stop.set()
+        for worker in self._workers:
+            await asyncio.to_thread(worker.join, STOP_TIMEOUT)
+            if worker.is_alive():
+                _LOGGER.warning("Terminating fleet worker %s", worker.name)
+                worker.terminate()
+        for connection in self._connections:
+            connection.close()
+        self._workers.clear()
+        self._connections.clear()
+
+    async def __aenter__(self) -> Self:
+        """Start the collector.
+
+        Returns
+        -------
+            The collector.
+
+        """
+        self.start()
+        return self
+
+    async def __aexit__(self, *_exc_info: object) -> None:
+        """Stop the collector.
+
+        Args:
+        ----
+            *_exc_info: Exec type.
+
+        """
+        await self.stop()
@@ -0,0 +1,473 @@
+"""Index of the entities of a gateway by room and floor."""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field, is_dataclass, replace
+from typing import TYPE_CHECKING, Any
+
+from pyhaopenmotics.helpers.filters import entity_floor, entity_room, entity_type
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+DOMAIN_OUTPUTS = "outputs"
+DOMAIN_LIGHTS = "lights"
+DOMAIN_SHUTTERS = "shutters"
+DOMAIN_SENSORS = "sensors"
+DOMAIN_INPUTS = "inputs"
+DOMAIN_THERMOSTATS = "thermostats"
+
+# Seconds an optimistic state waits for a read confirming it.
+DEFAULT_PENDING_TIMEOUT = 5.0
+
+# Key of an entity in the index: (domain, id).
+EntityKey = tuple[str, int]
+
+
+@dataclass
+class EntityChange:
+    """Change of a single entity in the index."""
+
+    domain: str
+    idx: int
+    changed: dict[str, Any]
+    removed: bool = False
+    pending: bool = False
+    timestamp: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class PendingUpdate:
+    """Optimistic state of an entity, waiting for a read to confirm it."""
+
+    expected: dict[str, Any]
+    # Latest state read from the gateway, restored on a rollback.
+    actual: Any
+    expires_at: float
+
+
+def _entity_fields(entity: Any) -> dict[str, Any]:
+    """Return the fields of an entity as a dict."""
+    if is_dataclass(entity) and not isinstance(entity, type):
+        return asdict(entity)
+    return dict(vars(entity))
+
+
+def diff_entities(old: Any, new: Any) -> dict[str, Any]:
+    """Return the fields of an entity that changed.
+
+    Nested dicts, like the status, only hold the keys that changed.
+
+    Args:
+    ----
+        old: previous state of the entity, or None
+        new: new state of the entity
+
+    Returns:
+    -------
+        dict of changed fields
+
+    """
+    new_fields = _entity_fields(new)
+    if old is None:
+        return new_fields
+    old_fields = _entity_fields(old)
+    changed: dict[str, Any] = {}
+    for name, value in new_fields.items():
+        previous = old_fields.get(name)
+        if value == previous:
+            continue
+        if isinstance(value, dict) and isinstance(previous, dict):
+            changed[name] = {key: item for key, item in value.items() if previous.get(key) != item}
+        else:
+            changed[name] = value
+    return changed
+
+
+def _status_matches(entity: Any, expected: dict[str, Any]) -> bool:
+    """Return True when the status of an entity has the expected values."""
+    status = getattr(entity, "status", None)
+    return status is not None and all(getattr(status, name, None) == value for name, value in expected.items())
+
+
+def _with_status(entity: Any, expected: dict[str, Any]) -> Any:
+    """Return a copy of an entity with the expected values in its status."""
+    if getattr(entity, "status", None) is None:
+        return entity
+    return replace(entity, status=replace(entity.status, **expected))
+
+
+class EntityIndex:
+    """Latest known state of all entities, indexed by room and floor.
+
+    The domains feed the index with the result of every ``get_all``, so an
+    update costs O(entities in the domain). Only entities that were added,
+    removed or moved touch the room and floor buckets, and a room query costs
+    O(entities in the room).
+
+    An index holds a single installation, the ids of the entities are only
+    unique within their installation. Clients keep an index per installation,
+    see ``BaseClient.index_for``.
+    """
+
+    def __init__(self) -> None:
+        """Init the index."""
+        self._entities: dict[EntityKey, Any] = {}
+        self._ids: dict[str, set[int]] = {}
+        self._locations: dict[EntityKey, tuple[Any, Any]] = {}
+        self._rooms: dict[Any, dict[EntityKey, Any]] = {}
+        self._floors: dict[Any, dict[EntityKey, Any]] = {}
+        self._listeners: list[Callable[[EntityChange], None]] = []
+        self._pending: dict[EntityKey, PendingUpdate] = {}
+
+    def __len__(self) -> int:
+        """Return the number of indexed entities."""
+        return len(self._entities)
+
+    def get(self, domain: str, idx: int) -> Any:
+        """Return the latest known state of an entity.
+
+        Args:
+        ----
+            domain: e.g. outputs
+            idx: id of the entity
+
+        Returns:
+        -------
+            The entity, or None when unknown.
+
+        """
+        return self._entities.get((domain, idx))
+
+    def subscribe(self, listener: Callable[[EntityChange], None]) -> Callable[[], None]:
+        """Call a listener for every entity that changes.
+
+        Changes are only computed while there are listeners.
+
+        Args:
+        ----
+            listener: called with an EntityChange
+
+        Returns:
+        -------
+            A function that removes the listener.
+
+        """
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def _notify(self, change: EntityChange) -> None:
+        """Pass a change to all listeners."""
+        for listener in list(self._listeners):
+            listener(change)
+
+    def upsert(self, domain: str, entity: Any) -> None:
+        """Add an entity or replace its state with the one read from the gateway.
+
+        A read matching the pending optimistic state of the entity confirms
+        it. Until the optimistic state expires, other reads only update the
+        fields it does not cover; after that, the read wins.
+
+        Args:
+        ----
+            domain: e.g. outputs
+            entity: an Output, Light, Shutter, Sensor, ... object
+
+        """
+        key = (domain, entity.idx)
+        if (pending := self._pending.get(key)) is None:
+            self._store(key, entity)
+        elif _status_matches(entity, pending.expected) or pending.expires_at <= time.monotonic():
+            del self._pending[key]
+            self._store(key, entity, was_pending=True)
+        else:
+            pending.actual = entity
+            self._store(key, _with_status(entity, pending.expected), pending=True, was_pending=True)
+
+    def _store(self, key: EntityKey, entity: Any, *, pending: bool = False, was_pending: bool = False) -> None:
+        """Store the state of an entity and notify the listeners of the changes."""
+        domain, idx = key
+        room, floor = entity_room(entity), entity_floor(entity)
+        previous = self._locations.get(key)
+        if previous is not None and previous != (room, floor):
+            self._unlink(key, previous)
+        if self._listeners:
+            changed = diff_entities(self._entities.get(key), entity)
+            if changed or pending != was_pending:
+                self._notify(EntityChange(domain, idx, changed, pending=pending))
+        self._entities[key] = entity
+        self._ids.setdefault(domain, set()).add(idx)
+        self._locations[key] = (room, floor)
+        self._rooms.setdefault(room, {})[key] = entity
+        self._floors.setdefault(floor, {})[key] = entity
+
+    def remove(self, domain: str, idx: int) -> None:
+        """Remove an entity from the index.
+
+        Args:
+        ----
+            domain: e.g. outputs
+            idx: id of the entity
+
+        """
+        key = (domain, idx)
+        self._pending.pop(key, None)
+        if self._entities.pop(key, None) is not None:
+            self._ids[domain].discard(idx)
+            self._unlink(key, self._locations.pop(key))
+            if self._listeners:
+                self._notify(EntityChange(domain, idx, {}, removed=True))
+
+    def _unlink(self, key: EntityKey, location: tuple[Any, Any]) -> None:
+        """Remove an entity from its room and floor buckets."""
+        room, floor = location
+        self._rooms.get(room, {}).pop(key, None)
+        self._floors.get(floor, {}).pop(key, None)
+
+    def update(self, domain: str, entities: list[Any], *, complete: bool = True) -> None:
+        """Update the index with the entities of a domain.
+
+        Args:
+        ----
+            domain: e.g. outputs
+            entities: the entities returned by get_all
+            complete: True when the list holds all entities of the domain, the
+                entities that are missing are then removed.
+
+        """
+        self.expire_pending()
+        seen = set()
+        for entity in entities:
+            if entity is None:
+                continue
+            self.upsert(domain, entity)
+            seen.add(entity.idx)
+        if complete:
+            for idx in sorted(self._ids.get(domain, set()) - seen):
+                self.remove(domain, idx)
+
+    def apply_pending(
+        self,
+        domain: str,
+        idx: int,
+        expected: dict[str, Any],
+        timeout: float = DEFAULT_PENDING_TIMEOUT,
+    ) -> bool:
+        """Apply the expected outcome of a command to the status of an entity.
+
+        Args:
+        ----
+            domain: e.g. outputs
+            idx: id of the entity
+            expected: status fields and their expected value, e.g. {"on": True}
+            timeout: seconds to wait for a read confirming the state
+
+        Returns:
+        -------
+            True when applied, False when the entity or its status is unknown.
+
+        """
+        key = (domain, idx)
+        if (current := self._entities.get(key)) is None or getattr(current, "status", None) is None:
+            return False
+        expected = {name: value for name, value in expected.items() if hasattr(current.status, name)}
+        if not expected:
+            return False
+        if (pending := self._pending.get(key)) is not None:
+            actual = pending.actual
+            expected = {**pending.expected, **expected}
+        else:
+            actual = current
+        self._pending[key] = PendingUpdate(expected, actual, time.monotonic() + timeout)
+        self._store(key, _with_status(current, expected), pending=True, was_pending=pending is not None)
+        return True
+
+    def is_pending(self, domain: str, idx: int) -> bool:
+        """Return True when the state of an entity is optimistic.
+
+        Args:
+        ----
+            domain: e.g. outputs
+            idx: id of the entity
+
+        Returns:
+        -------
+            bool
+
+        """
+        self.expire_pending()
+        return (domain, idx) in self._pending
+
+    def rollback(self, domain: str, idx: int) -> None:
+        """Restore the state read last, e.g. when a command failed.
+
+        Args:
+        ----
+            domain: e.g. outputs
+            idx: id of the entity
+
+        """
+        key = (domain, idx)
+        if (pending := self._pending.pop(key, None)) is not None:
+            self._store(key, pending.actual, was_pending=True)
+
+    def expire_pending(self) -> None:
+        """Roll back the optimistic states that were not confirmed in time."""
+        now = time.monotonic()
+        for key in [key for key, pending in self._pending.items() if pending.expires_at <= now]:
+            self.rollback(*key)
+
+    @contextmanager
+    def optimistic(
+        self,
+        domain: str,
+        idx: int,
+        expected: dict[str, Any],
+        timeout: float = DEFAULT_PENDING_TIMEOUT,
+    ) -> Iterator[None]:
+        """Apply the expected outcome of a command, and roll it back if the command fails.
+
+        Args:
+        ----
+            domain: e.g. outputs
+            idx: id of the entity
+            expected: status fields and their expected value, e.g. {"on": True}
+            timeout: seconds to wait for a read confirming the state
+
+        Yields:
+        ------
+            None, while the command is sent.
+
+        Examples:
+        --------
+            with index.optimistic(DOMAIN_OUTPUTS, 3, {"on": True}):
+                await client.exec_action("set_output", data=data)
+
+        """
+        applied = self.apply_pending(domain, idx, expected, timeout)
+        try:
+            yield
+        except BaseException:
+            if applied:
+                self.rollback(domain, idx)
+            raise
+
+    def in_room(self, room_id: int, domain: str | None = None) -> list[Any]:
+        """Return the entities in a room.
+
+        Args:
+        ----
+            room_id: int
+            domain: optionally only return the entities of this domain
+
+        Returns:
+        -------
+            list of entities
+
+        """
+        bucket = self._rooms.get(room_id, {})
+        return [entity for key, entity in bucket.items() if domain is None or key[0] == domain]
+
+    def on_floor(self, floor_id: int, domain: str | None = None) -> list[Any]:
+        """Return the entities on a floor.
+
+        Args:
+        ----
+            floor_id: int
+            domain: optionally only return the entities of this domain
+
+        Returns:
+        -------
+            list of entities
+
+        """
+        bucket = self._floors.get(floor_id, {})
+        return [entity for key, entity in bucket.items() if domain is None or key[0] == domain]
+
+    def rooms(self) -> list[Any]:
+        """Return the ids of the rooms holding entities.
+
+        Returns
+        -------
+            list of room ids
+
+        """
+        return [room for room, bucket in self._rooms.items() if bucket]
+
+    def floors(self) -> list[Any]:
+        """Return the ids of the floors holding entities.
+
+        Returns
+        -------
+            list of floor ids
+
+        """
+        return [floor for floor, bucket in self._floors.items() if bucket]
+
+    def lights_on(self, room_id: int) -> list[Any]:
+        """Return the lights that are on in a room.
+
+        Lights are known both as lights and as outputs of type LIGHT; each of
+        them is only returned once.
+
+        Args:
+        ----
+            room_id: int
+
+        Returns:
+        -------
+            list of Light or Output objects
+
+        """
+        lights: dict[int, Any] = {}
+        for (domain, idx), entity in self._rooms.get(room_id, {}).items():
+            if domain == DOMAIN_LIGHTS or (domain == DOMAIN_OUTPUTS and entity_type(entity) == "LIGHT"):
+                status = getattr(entity, "status", None)
+                if status is not None and getattr(status, "on", False):
+                    lights.setdefault(idx, entity)
+        return list(lights.values())
+
+    def average_temperature(self, floor_id: int) -> float | None:
+        """Return the average temperature measured on a floor.
+
+        Args:
+        ----
+            floor_id: int
+
+        Returns:
+        -------
+            The average temperature, or None without temperature sensors.
+
+        """
+        temperatures = [
+            temperature
+            for entity in self.on_floor(floor_id, DOMAIN_SENSORS)
+            if entity_type(entity) in {None, "temperature"}
+            and (status := getattr(entity, "status", None)) is not None
+            and (temperature := getattr(status, "temperature", None)) is not None
+        ]
+        if not temperatures:
+            return None
+        return sum(temperatures) / len(temperatures)
+
+    def average_temperature_per_floor(self) -> dict[Any, float]:
+        """Return the average temperature of every floor with temperature sensors.
+
+        Returns
+        -------
+            dict of floor id to temperature
+
+        """
+        averages = {floor: self.average_temperature(floor) for floor in self.floors()}
+        return {floor: average for floor, average in averages.items() if average is not None}
+
+    def clear(self) -> None:
+        """Empty the index."""
+        self._entities.clear()
+        self._ids.clear()
+        self._pending.clear()
+        self._locations.clear()
+        self._rooms.clear()
+        self._floors.clear()
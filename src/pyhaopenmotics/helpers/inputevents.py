@@ -0,0 +1,302 @@
+"""Detect presses of inputs and publish them as an async stream.
+
+The engine is fed with the state of the inputs, either by websocket events
+or by polling the input status. It detects the edges and derives:
+    * pressed / released: every rising and falling edge
+    * short_press: released before long_press_time
+    * long_press: held for long_press_time, published while still held
+    * double_click: a short press starting within double_click_time after
+      the previous short press was released
+
+A single poll serves all subscribers, and polling only runs while someone
+is subscribed and no websocket feeds the engine.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from pyhaopenmotics.errors import OpenMoticsError, OpenMoticsUnsupportedError
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable, Collection
+
+_LOGGER = logging.getLogger(__name__)
+
+EVENT_PRESSED = "pressed"
+EVENT_RELEASED = "released"
+EVENT_SHORT_PRESS = "short_press"
+EVENT_LONG_PRESS = "long_press"
+EVENT_DOUBLE_CLICK = "double_click"
+
+# Websocket event holding the new state of an input.
+WS_INPUT_CHANGE = "INPUT_CHANGE"
+
+DEFAULT_POLL_INTERVAL = 0.1
+# A cloud poll is a full, uncached read of all inputs, presses shorter than
+# the interval are only seen through the websocket.
+CLOUD_POLL_INTERVAL = 2.0
+DEFAULT_LONG_PRESS_TIME = 0.8
+DEFAULT_DOUBLE_CLICK_TIME = 0.4
+DEFAULT_QUEUE_SIZE = 100
+# Seconds to wait before polling again after a failed poll.
+POLL_ERROR_DELAY = 5.0
+
+
+@dataclass(frozen=True)
+class InputEvent:
+    """Press or edge of an input."""
+
+    input_id: int
+    event_type: str
+    timestamp: float
+    # Seconds the input was held, for released, short_press and long_press.
+    duration: float | None = None
+
+
+@dataclass
+class _InputState:
+    """Press state of a single input."""
+
+    on: bool = False
+    pressed_at: float | None = None
+    long_sent: bool = False
+    last_short_release: float | None = None
+
+
+@dataclass
+class _Subscriber:
+    """Queue of a subscriber and the inputs it listens to."""
+
+    queue: asyncio.Queue[InputEvent]
+    input_ids: frozenset[int] | None = None
+    dropped: int = field(default=0)
+
+
+class InputEventEngine:
+    """Turn input states into press events for any number of subscribers."""
+
+    def __init__(
+        self,
+        poll: Callable[[], Awaitable[dict[int, bool]]] | None = None,
+        *,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        long_press_time: float = DEFAULT_LONG_PRESS_TIME,
+        double_click_time: float = DEFAULT_DOUBLE_CLICK_TIME,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+    ) -> None:
+        """Init the engine.
+
+        Args:
+        ----
+            poll: coroutine function returning the state of all inputs by id
+            poll_interval: seconds between two polls
+            long_press_time: seconds an input is held for a long press
+            double_click_time: max seconds between two short presses of a double click
+            queue_size: events buffered per subscriber, the oldest are dropped
+
+        """
+        self.poll = poll
+        self.poll_interval = poll_interval
+        self.long_press_time = long_press_time
+        self.double_click_time = double_click_time
+        self.queue_size = queue_size
+        self.websocket_active = False
+        self._states: dict[int, _InputState] = {}
+        self._subscribers: list[_Subscriber] = []
+        self._task: asyncio.Task[None] | None = None
+
+    def feed(self, input_id: int, on: bool, timestamp: float | None = None) -> list[InputEvent]:  # noqa: FBT001
+        """Process the state of an input and publish the resulting events.
+
+        Args:
+        ----
+            input_id: int
+            on: True while the input is pressed
+            timestamp: monotonic time of the state, defaults to now
+
+        Returns:
+        -------
+            The published events.
+
+        """
+        now = time.monotonic() if timestamp is None else timestamp
+        state = self._states.setdefault(input_id, _InputState())
+        events = self._check_long_press(input_id, state, now)
+        if on == state.on:
+            self._publish(events)
+            return events
+
+        state.on = on
+        if on:
+            state.pressed_at = now
+            state.long_sent = False
+            events.append(InputEvent(input_id, EVENT_PRESSED, now))
+        else:
+            duration = None if state.pressed_at is None else now - state.pressed_at
+            events.append(InputEvent(input_id, EVENT_RELEASED, now, duration))
+            if duration is not None and not state.long_sent:
+                events.append(InputEvent(input_id, EVENT_SHORT_PRESS, now, duration))
+                if (
+                    state.last_short_release is not None
+                    and state.pressed_at - state.last_short_release <= self.double_click_time  # type: ignore[operator]
+                ):
+                    events.append(InputEvent(input_id, EVENT_DOUBLE_CLICK, now))
+                    state.last_short_release = None
+                else:
+                    state.last_short_release = now
+            state.pressed_at = None
+        self._publish(events)
+        return events
+
+    def _check_long_press(self, input_id: int, state: _InputState, now: float) -> list[InputEvent]:
+        """Return the long press of an input held long enough."""
+        if not state.on or state.long_sent or state.pressed_at is None:
+            return []
+        if (duration := now - state.pressed_at) < self.long_press_time:
+            return []
+        state.long_sent = True
+        state.last_short_release = None
+        return [InputEvent(input_id, EVENT_LONG_PRESS, now, duration)]
+
+    def tick(self, timestamp: float | None = None) -> list[InputEvent]:
+        """Publish the long presses of inputs that are still held.
+
+        Args:
+        ----
+            timestamp: monotonic time, defaults to now
+
+        Returns:
+        -------
+            The published events.
+
+        """
+        now = time.monotonic() if timestamp is None else timestamp
+        events = [
+            event for input_id, state in self._states.items() for event in self._check_long_press(input_id, state, now)
+        ]
+        self._publish(events)
+        return events
+
+    def handle_event(self, event: dict[str, Any]) -> None:
+        """Process a websocket event, other events than input changes are ignored.
+
+        Args:
+        ----
+            event: e.g. {"type": "INPUT_CHANGE", "data": {"id": 3, "status": true}}
+
+        """
+        if event.get("type") != WS_INPUT_CHANGE:
+            return
+        data = event.get("data") or {}
+        if (input_id := data.get("id")) is None:
+            return
+        status = data.get("status")
+        if isinstance(status, dict):
+            status = status.get("on")
+        self.feed(int(input_id), bool(status))
+
+    def set_websocket_active(self, active: bool) -> None:  # noqa: FBT001
+        """Switch between websocket events and polling.
+
+        Args:
+        ----
+            active: True while a websocket feeds the engine
+
+        """
+        self.websocket_active = active
+        self._update_polling()
+
+    def _publish(self, events: list[InputEvent]) -> None:
+        """Put events on the queues of the subscribers."""
+        for event in events:
+            for subscriber in self._subscribers:
+                if subscriber.input_ids is not None and event.input_id not in subscriber.input_ids:
+                    continue
+                if subscriber.queue.full():
+                    subscriber.queue.get_nowait()
+                    subscriber.dropped += 1
+                subscriber.queue.put_nowait(event)
+
+    async def events(self, input_ids: Collection[int] | None = None) -> AsyncIterator[InputEvent]:
+        """Subscribe to the events of all or some inputs.
+
+        Args:
+        ----
+            input_ids: only publish the events of these inputs
+
+        Yields:
+        ------
+            InputEvent
+
+        Examples:
+        --------
+            async for event in client.inputs.event_engine.events([3]):
+                if event.event_type == EVENT_DOUBLE_CLICK:
+                    ...
+
+        """
+        subscriber = _Subscriber(
+            asyncio.Queue(self.queue_size),
+            None if input_ids is None else frozenset(input_ids),
+        )
+        self._subscribers.append(subscriber)
+        self._update_polling()
+        try:
+            while True:
+                yield await subscriber.queue.get()
+        finally:
+            self._subscribers.remove(subscriber)
+            if subscriber.dropped:
+                _LOGGER.debug("Dropped %d input events of a slow subscriber", subscriber.dropped)
+            self._update_polling()
+
+    def _update_polling(self) -> None:
+        """Start or stop polling, depending on the subscribers and the websocket."""
+        polling = self.poll is not None and bool(self._subscribers) and not self.websocket_active
+        if polling and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._poll_loop())
+        elif not polling and self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _poll_loop(self) -> None:
+        """Poll the input states and feed them to the engine.
+
+        The first poll only sets the known states, so inputs that are already
+        pressed do not publish a press.
+        """
+        first = True
+        while True:
+            try:
+                states = await self.poll()  # type: ignore[misc]
+            except OpenMoticsUnsupportedError:
+                _LOGGER.exception("The gateway cannot report input states, input events are not available")
+                self._task = None
+                return
+            except OpenMoticsError:
+                _LOGGER.debug("Polling the input states failed", exc_info=True)
+                await asyncio.sleep(POLL_ERROR_DELAY)
+                continue
+            now = time.monotonic()
+            for input_id, on in states.items():
+                if first and input_id not in self._states:
+                    self._states[input_id] = _InputState(on=on)
+                else:
+                    self.feed(input_id, on, now)
+            first = False
+            self.tick(now)
+            await asyncio.sleep(self.poll_interval)
+
+    async def stop(self) -> None:
+        """Stop polling."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
@@ -0,0 +1,73 @@
+"""Lazy attributes of packages (PEP 562).
+
+A package lists its public names and the modules holding them, the modules
+are imported on first access of a name, so importing the package does not
+pull in every submodule and its dependencies:
+
+    _LAZY_IMPORTS = {"LocalGateway": "pyhaopenmotics.client.localgateway"}
+
+    __getattr__, __dir__ = lazy_module(__name__, _LAZY_IMPORTS)
+"""
+
+from __future__ import annotations
+
+import importlib
+import sys
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+def lazy_module(
+    module_name: str,
+    lazy_imports: dict[str, str],
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """Build the module level __getattr__ and __dir__ of a package.
+
+    Args:
+    ----
+        module_name: __name__ of the package
+        lazy_imports: dict of attribute name to the module defining it
+
+    Returns:
+    -------
+        The __getattr__ and __dir__ functions of the package.
+
+    """
+
+    def __getattr__(name: str) -> Any:  # noqa: N807
+        """Import the requested attribute on first access.
+
+        Args:
+        ----
+            name: str
+
+        Returns:
+        -------
+            The requested attribute.
+
+        Raises:
+        ------
+            AttributeError: The attribute does not exist.
+
+        """
+        if (source := lazy_imports.get(name)) is None:
+            msg = f"module {module_name!r} has no attribute {name!r}"
+            raise AttributeError(msg)
+        value = getattr(importlib.import_module(source), name)
+        # Later accesses find the attribute without calling __getattr__.
+        setattr(sys.modules[module_name], name, value)
+        return value
+
+    def __dir__() -> list[str]:  # noqa: N807
+        """Return the attributes of the package, including the lazy ones.
+
+        Returns
+        -------
+            list of attribute names
+
+        """
+        return sorted([*vars(sys.modules[module_name]), *lazy_imports])
+
+    return __getattr__, __dir__
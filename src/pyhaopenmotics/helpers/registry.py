@@ -0,0 +1,187 @@
+"""Cached registry of OpenMotics group actions."""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+# Seconds a downloaded group action configuration is used, edits made in the
+# portal or on the gateway show up after this time at the latest.
+DEFAULT_MAX_AGE = 300.0
+
+
+class GroupActionRegistry:
+    """Group actions indexed by id, name and usage.
+
+    The registry is filled from a single configuration download and then
+    answers lookups without network access. The configuration, and every
+    list of group actions cached per usage, is used for ``max_age`` seconds.
+    Call ``invalidate`` to drop it earlier, e.g. after changing the group
+    action configuration.
+    """
+
+    def __init__(self, max_age: float | None = DEFAULT_MAX_AGE) -> None:
+        """Init the registry.
+
+        Args:
+        ----
+            max_age: lifetime of the cached configuration in seconds, None to keep it until invalidated
+
+        """
+        self.max_age = max_age
+        self._loaded_at: float | None = None
+        self._by_id: dict[int, Any] = {}
+        self._by_name: dict[str, list[Any]] = {}
+        self._by_usage: dict[str, tuple[float, list[Any]]] = {}
+
+    def _expired(self, loaded_at: float) -> bool:
+        """Return True when data loaded at the given moment is too old."""
+        return self.max_age is not None and time.monotonic() - loaded_at > self.max_age
+
+    @property
+    def loaded(self) -> bool:
+        """Return True when the registry holds a valid configuration.
+
+        Returns
+        -------
+            bool
+
+        """
+        if self._loaded_at is None:
+            return False
+        if self._expired(self._loaded_at):
+            # The group actions per usage have their own age.
+            self._loaded_at = None
+            self._by_id = {}
+            self._by_name = {}
+            return False
+        return True
+
+    def load(self, groupactions: list[Any]) -> None:
+        """Replace the registry content.
+
+        Args:
+        ----
+            groupactions: list of GroupAction objects
+
+        """
+        self._by_id = {}
+        self._by_name = {}
+        for groupaction in groupactions:
+            if groupaction is None:
+                continue
+            self._by_id[groupaction.idx] = groupaction
+            self._by_name.setdefault(str(groupaction.name).casefold(), []).append(groupaction)
+        self._loaded_at = time.monotonic()
+
+    def load_usage(self, usage: str, groupactions: list[Any]) -> None:
+        """Store the group actions for a given usage.
+
+        Args:
+        ----
+            usage: e.g. SCENE
+            groupactions: list of GroupAction objects
+
+        """
+        self._by_usage[usage.upper()] = (
+            time.monotonic(),
+            [groupaction for groupaction in groupactions if groupaction is not None],
+        )
+
+    def has_usage(self, usage: str) -> bool:
+        """Return True when the group actions for a usage are cached.
+
+        Args:
+        ----
+            usage: e.g. SCENE
+
+        Returns:
+        -------
+            bool
+
+        """
+        if (cached := self._by_usage.get(usage.upper())) is None:
+            return False
+        if self._expired(cached[0]):
+            del self._by_usage[usage.upper()]
+            return False
+        return True
+
+    def all(self) -> list[Any]:
+        """Return all cached group actions.
+
+        Returns
+        -------
+            list of GroupAction objects
+
+        """
+        return list(self._by_id.values())
+
+    def by_id(self, groupaction_id: int) -> Any:
+        """Return the group action with the given id.
+
+        Args:
+        ----
+            groupaction_id: int
+
+        Returns:
+        -------
+            GroupAction or None
+
+        """
+        return self._by_id.get(groupaction_id)
+
+    def by_name(self, name: str) -> list[Any]:
+        """Return all group actions with the given name (case insensitive).
+
+        Args:
+        ----
+            name: str
+
+        Returns:
+        -------
+            list of GroupAction objects
+
+        """
+        return list(self._by_name.get(name.casefold(), []))
+
+    def by_usage(self, usage: str) -> list[Any]:
+        """Return the cached group actions for a usage.
+
+        Args:
+        ----
+            usage: e.g. SCENE
+
+        Returns:
+        -------
+            list of GroupAction objects
+
+        """
+        if (cached := self._by_usage.get(usage.upper())) is None:
+            return []
+        return list(cached[1])
+
+    def resolve(self, groupaction: int | str) -> int | None:
+        """Resolve a group action id or name to an id.
+
+        Args:
+        ----
+            groupaction: id or name of the group action
+
+        Returns:
+        -------
+            The id, or None when the name is unknown.
+
+        """
+        if isinstance(groupaction, int):
+            return groupaction
+        if (matches := self._by_name.get(groupaction.casefold())) is None:
+            return None
+        return matches[0].idx
+
+    def invalidate(self) -> None:
+        """Drop the cached configuration."""
+        self._loaded_at = None
+        self._by_id = {}
+        self._by_name = {}
+        self._by_usage = {}
@@ -0,0 +1,156 @@
+"""Only pass on the sensor readings that matter.
+
+A reading is emitted when:
+    * it is the first reading of the sensor
+    * it differs at least ``deadband`` from the last emitted value, and at
+      least ``min_interval`` seconds passed since then
+    * the value changes faster than ``max_rate`` per second since the
+      previous reading, whatever the deadband and interval
+    * ``max_interval`` seconds passed since the last emitted reading
+
+Settings are looked up per sensor, then per physical quantity, then the
+default is used. By default temperatures have a deadband of 0.1 °C and
+humidity and brightness of 1 %.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+@dataclass(frozen=True)
+class SensorReading:
+    """Value of a sensor at a moment."""
+
+    sensor_id: int
+    physical_quantity: str
+    value: float
+    # Monotonic time of the reading.
+    timestamp: float
+
+
+@dataclass(frozen=True)
+class StreamSettings:
+    """When a sensor emits a reading."""
+
+    deadband: float = 0.0
+    min_interval: float = 0.0
+    # Change per second that is emitted at once, None to disable.
+    max_rate: float | None = None
+    # Seconds after which a reading is emitted anyway, None to disable.
+    max_interval: float | None = None
+
+
+DEFAULT_QUANTITY_SETTINGS = {
+    "temperature": StreamSettings(deadband=0.1),
+    "humidity": StreamSettings(deadband=1.0),
+    "brightness": StreamSettings(deadband=1.0),
+}
+
+
+@dataclass
+class _Track:
+    """Last emitted and last seen reading of a sensor."""
+
+    emitted: SensorReading
+    previous: SensorReading
+
+
+class SensorStreamFilter:
+    """Drop the readings within the deadband or interval of their sensor."""
+
+    def __init__(
+        self,
+        default: StreamSettings | None = None,
+        per_quantity: dict[str, StreamSettings] | None = None,
+        per_sensor: dict[int, StreamSettings] | None = None,
+    ) -> None:
+        """Init the filter.
+
+        Args:
+        ----
+            default: settings of sensors without specific settings
+            per_quantity: settings per physical quantity, e.g. temperature
+            per_sensor: settings per sensor id
+
+        """
+        self.default = StreamSettings() if default is None else default
+        self.per_quantity = DEFAULT_QUANTITY_SETTINGS | (per_quantity or {})
+        self.per_sensor = per_sensor or {}
+        self._tracks: dict[int, _Track] = {}
+
+    def settings_for(self, reading: SensorReading) -> StreamSettings:
+        """Return the settings of the sensor of a reading.
+
+        Args:
+        ----
+            reading: SensorReading
+
+        Returns:
+        -------
+            StreamSettings
+
+        """
+        if (settings := self.per_sensor.get(reading.sensor_id)) is not None:
+            return settings
+        return self.per_quantity.get(reading.physical_quantity, self.default)
+
+    def accept(self, reading: SensorReading) -> bool:
+        """Return True when a reading should be emitted.
+
+        Args:
+        ----
+            reading: SensorReading
+
+        Returns:
+        -------
+            bool
+
+        """
+        if (track := self._tracks.get(reading.sensor_id)) is None:
+            self._tracks[reading.sensor_id] = _Track(reading, reading)
+            return True
+        settings = self.settings_for(reading)
+        previous, track.previous = track.previous, reading
+        since_emitted = reading.timestamp - track.emitted.timestamp
+
+        change = abs(reading.value - track.emitted.value)
+        emit = change > 0 and change >= settings.deadband and since_emitted >= settings.min_interval
+        if not emit and settings.max_rate is not None and (elapsed := reading.timestamp - previous.timestamp) > 0:
+            emit = abs(reading.value - previous.value) / elapsed >= settings.max_rate
+        if not emit and settings.max_interval is not None:
+            emit = since_emitted >= settings.max_interval
+        if emit:
+            track.emitted = reading
+        return emit
+
+    def filter(self, readings: Iterable[SensorReading]) -> list[SensorReading]:
+        """Return the readings that should be emitted.
+
+        Args:
+        ----
+            readings: readings of one or more sensors
+
+        Returns:
+        -------
+            list of SensorReading
+
+        """
+        return [reading for reading in readings if self.accept(reading)]
+
+    def reset(self, sensor_id: int | None = None) -> None:
+        """Forget the emitted readings, so the next reading is emitted.
+
+        Args:
+        ----
+            sensor_id: only forget this sensor
+
+        """
+        if sensor_id is None:
+            self._tracks.clear()
+        else:
+            self._tracks.pop(sensor_id, None)
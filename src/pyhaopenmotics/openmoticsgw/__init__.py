@@ -1,12 +1,29 @@
 """Directory holding openmoticsgw."""
 
-from pyhaopenmotics.openmoticsgw.groupactions import OpenMoticsGroupActions
-from pyhaopenmotics.openmoticsgw.inputs import OpenMoticsInputs
-from pyhaopenmotics.openmoticsgw.lights import OpenMoticsLights
-from pyhaopenmotics.openmoticsgw.outputs import OpenMoticsOutputs
-from pyhaopenmotics.openmoticsgw.sensors import OpenMoticsSensors
-from pyhaopenmotics.openmoticsgw.shutters import OpenMoticsShutters
-from pyhaopenmotics.openmoticsgw.thermostats import OpenMoticsThermostats
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from pyhaopenmotics.helpers.lazy import lazy_module
+
+if TYPE_CHECKING:
+    from pyhaopenmotics.openmoticsgw.groupactions import OpenMoticsGroupActions
+    from pyhaopenmotics.openmoticsgw.inputs import OpenMoticsInputs
+    from pyhaopenmotics.openmoticsgw.lights import OpenMoticsLights
+    from pyhaopenmotics.openmoticsgw.outputs import OpenMoticsOutputs
+    from pyhaopenmotics.openmoticsgw.sensors import OpenMoticsSensors
+    from pyhaopenmotics.openmoticsgw.shutters import OpenMoticsShutters
+    from pyhaopenmotics.openmoticsgw.thermostats import OpenMoticsThermostats
+
+_LAZY_IMPORTS = {
+    "OpenMoticsGroupActions": "pyhaopenmotics.openmoticsgw.groupactions",
+    "OpenMoticsInputs": "pyhaopenmotics.openmoticsgw.inputs",
+    "OpenMoticsLights": "pyhaopenmotics.openmoticsgw.lights",
+    "OpenMoticsOutputs": "pyhaopenmotics.openmoticsgw.outputs",
+    "OpenMoticsSensors": "pyhaopenmotics.openmoticsgw.sensors",
+    "OpenMoticsShutters": "pyhaopenmotics.openmoticsgw.shutters",
+    "OpenMoticsThermostats": "pyhaopenmotics.openmoticsgw.thermostats",
+}
 
 __all__ = [
     "OpenMoticsGroupActions",
@@ -17,3 +34,5 @@ __all__ = [
     "OpenMoticsShutters",
     "OpenMoticsThermostats",
 ]
+
+__getattr__, __dir__ = lazy_module(__name__, _LAZY_IMPORTS)
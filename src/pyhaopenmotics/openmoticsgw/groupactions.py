@@ -5,6 +5,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
+from pyhaopenmotics.helpers.registry import GroupActionRegistry
+
 from .models.groupaction import GroupAction
 
 if TYPE_CHECKING:
@@ -27,6 +29,30 @@ class OpenMoticsGroupActions:
 
         """
         self._omcloud = omcloud
+        self._registry = GroupActionRegistry()
+
+    @property
+    def registry(self) -> GroupActionRegistry:
+        """Get the cached group action registry.
+
+        Returns
+        -------
+            GroupActionRegistry
+
+        """
+        return self._registry
+
+    def invalidate(self) -> None:
+        """Drop the cached group action configuration.
+
+        Call this when the group action configuration of the gateway changed.
+        """
+        self._registry.invalidate()
+
+    async def _ensure_loaded(self) -> None:
+        """Download the group action configuration if it is not cached."""
+        if not self._registry.loaded:
+            await self.get_all()
 
     async def get_all(
         self,
@@ -49,12 +75,14 @@ class OpenMoticsGroupActions:
 
         """
         data = await self._omcloud.exec_action("get_group_action_configurations")
+        groupactions = [GroupAction.from_dict(device) for device in data["config"]]
+        self._registry.load(groupactions)
 
         if groupaction_filter is not None:
             # implemented later
             pass
 
-        return [GroupAction.from_dict(device) for device in data["config"]]  # pyright: ignore[reportReturnType]
+        return groupactions  # pyright: ignore[reportReturnType]
 
     async def get_by_id(
         self,
@@ -71,28 +99,37 @@ class OpenMoticsGroupActions:
             Returns a groupaction with id
 
         """
-        for groupaction in await self.get_all():
-            if groupaction.idx == groupaction_id:
-                return groupaction
-        return None
+        await self._ensure_loaded()
+        return self._registry.by_id(groupaction_id)
 
     async def trigger(
         self,
-        groupaction_id: int,
+        groupaction_id: int | str,
     ) -> Any:
         """Trigger a specified groupaction object.
 
+        Names are resolved from the cached configuration, ids are sent as is.
+
         Args:
         ----
-            groupaction_id: int
+            groupaction_id: id or name of the groupaction
 
         Returns:
         -------
             Returns a groupaction with id
 
         """
+        if isinstance(groupaction_id, str):
+            await self._ensure_loaded()
+            if (resolved := self._registry.resolve(groupaction_id)) is None:
+                return None
+            groupaction_id = resolved
         data = {"group_action_id": groupaction_id}
-        return await self._omcloud.exec_action("do_group_action", data=data)
+        result = await self._omcloud.exec_action("do_group_action", data=data)
+        if isinstance(result, dict) and result.get("success") is False:
+            # The cached configuration might be outdated.
+            self._registry.invalidate()
+        return result
 
     async def by_usage(
         self,
@@ -112,7 +149,8 @@ class OpenMoticsGroupActions:
             Returns a groupaction with id
 
         """
-        return [groupaction for groupaction in await self.get_all() if groupaction.name == groupaction_usage]
+        await self._ensure_loaded()
+        return self._registry.by_name(groupaction_usage)
 
     async def scenes(self) -> Any:
         """Return all scenes object.
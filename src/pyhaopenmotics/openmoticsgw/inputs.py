@@ -5,11 +5,16 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
+from pyhaopenmotics.errors import OpenMoticsUnsupportedError
 from pyhaopenmotics.helpers import merge_dicts
+from pyhaopenmotics.helpers.features import FEATURE_INPUT_STATES
+from pyhaopenmotics.helpers.index import DOMAIN_INPUTS
+from pyhaopenmotics.helpers.inputevents import InputEventEngine
 
 from .models.input import OMInput
 
 if TYPE_CHECKING:
+    from pyhaopenmotics.helpers.filters import EntityFilter
     from pyhaopenmotics.localgateway import LocalGateway  # pylint: disable=R0401
 
 
@@ -30,6 +35,7 @@ class OpenMoticsInputs:
         """
         self._omcloud = omcloud
         self._input_configs: list[Any] = []
+        self.event_engine = InputEventEngine(self.poll_states)
 
     @property
     def input_configs(self) -> list[Any]:
@@ -55,13 +61,13 @@ class OpenMoticsInputs:
 
     async def get_all(
         self,
-        input_filter: str | None = None,
+        input_filter: EntityFilter | None = None,
     ) -> list[OMInput]:
         """Get a list of all input objects.
 
         Args:
         ----
-            input_filter: str
+            input_filter: EntityFilter
 
         Returns:
         -------
@@ -73,16 +79,38 @@ class OpenMoticsInputs:
             if goc["success"] is True:
                 self.input_configs = goc["config"]
 
-        inputs_status = await self._omcloud.exec_action("get_input_status")
-        status = inputs_status["status"]
+        status = []
+        if self._omcloud.features.supports(FEATURE_INPUT_STATES):
+            inputs_status = await self._omcloud.exec_action("get_input_status")
+            status = inputs_status["status"]
 
         data = merge_dicts(self.input_configs, "status", status)
 
+        inputs = [OMInput.from_dict(device) for device in data]
+        self._omcloud.index.update(DOMAIN_INPUTS, inputs)
+
         if input_filter is not None:
-            # implemented later
-            pass
+            inputs = input_filter.apply(inputs)
+
+        return inputs  # pyright: ignore[reportReturnType]
+
+    async def poll_states(self) -> dict[int, bool]:
+        """Get the state of all inputs, bypassing the cache.
+
+        Returns
+        -------
+            dict of input id to True when pressed
 
-        return [OMInput.from_dict(device) for device in data]  # pyright: ignore[reportReturnType]
+        Raises
+        ------
+            OpenMoticsUnsupportedError: The gateway does not report input states.
+
+        """
+        if not self._omcloud.features.supports(FEATURE_INPUT_STATES):
+            msg = "The gateway does not report input states."
+            raise OpenMoticsUnsupportedError(msg)
+        inputs_status = await self._omcloud.exec_action("get_input_status", cached=False)
+        return {item.get("id", position): item.get("status") == 1 for position, item in enumerate(inputs_status["status"])}
 
     async def get_by_id(
         self,
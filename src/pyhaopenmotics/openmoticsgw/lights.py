@@ -2,13 +2,20 @@
 
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
+
+from pyhaopenmotics.helpers.index import DOMAIN_OUTPUTS
+
+from .models.const import OutputType
+from .models.light import Light
 
 if TYPE_CHECKING:
-    from pyhaopenmotics.localgateway import LocalGateway  # pylint: disable=R0401
+    from collections.abc import Iterable
 
-    from .models.light import Light
+    from pyhaopenmotics.helpers.filters import EntityFilter
+    from pyhaopenmotics.localgateway import LocalGateway  # pylint: disable=R0401
 
 
 @dataclass
@@ -16,6 +23,10 @@ class OpenMoticsLights:
     """Object holding information of the OpenMotics lights.
 
     All actions related to lights or a specific light.
+
+    The gateway has no lights of its own, they are the outputs of type LIGHT.
+    They are taken from the outputs in the index, which every output poll
+    fills, so reading the lights makes no request of its own.
     """
 
     def __init__(self, omcloud: LocalGateway) -> None:
@@ -30,21 +41,161 @@ class OpenMoticsLights:
 
     async def get_all(
         self,
-        light_filter: str | None = None,  # pylint: disable=unused-argument
+        light_filter: EntityFilter | None = None,
+        *,
+        refresh: bool = True,
     ) -> list[Light]:
         """Get a list of all light objects.
 
+        Like outputs.get_all, the status of the outputs is polled first.
+
         Args:
         ----
-            light_filter: str
+            light_filter: EntityFilter
+            refresh: False to take the last known state from the index, the
+                outputs are polled anyway when none are loaded
 
         Returns:
         -------
             list with all lights
 
         """
+        outputs = await self._omcloud.outputs.get_by_type(OutputType.LIGHT, refresh=refresh)
+        lights = [Light.from_output(output) for output in outputs]
+
         if light_filter is not None:
-            # implemented later
-            pass
+            lights = light_filter.apply(lights)
+
+        return lights
+
+    async def get_by_id(
+        self,
+        light_id: int,
+    ) -> Light | None:
+        """Get light by id.
+
+        Args:
+        ----
+            light_id: int
+
+        Returns:
+        -------
+            Returns a light with id
+
+        """
+        for light in await self.get_all():
+            if light.idx == light_id:
+                return light
+        return None
+
+    async def toggle(
+        self,
+        light_id: int,
+    ) -> Any:
+        """Toggle a specified light object.
+
+        Args:
+        ----
+            light_id: int
+
+        Returns:
+        -------
+            Returns a light with id
+
+        """
+        if (light := await self.get_by_id(light_id)) is None:
+            return None
+        if light.status.on:
+            return await self.turn_off(light_id)
+        return await self.turn_on(light_id)
+
+    async def turn_on(
+        self,
+        light_id: int,
+        brightness: int | None = None,
+    ) -> Any:
+        """Turn on a specified light object.
+
+        The brightness is only sent to dimmers, other lights are just turned
+        on. A brightness of 0 turns the light off.
+
+        Args:
+        ----
+            light_id: int
+            brightness: <0 - 100>
+
+        Returns:
+        -------
+            Returns a light with id
+
+        """
+        if brightness is not None and brightness <= 0:
+            return await self.turn_off(light_id)
+        output = self._omcloud.index.get(DOMAIN_OUTPUTS, light_id)
+        if output is not None and "RANGE" not in output.capabilities:
+            brightness = None
+        return await self._omcloud.outputs.turn_on(light_id, brightness)
+
+    async def turn_off(
+        self,
+        light_id: int,
+    ) -> Any:
+        """Turn off a specified light object.
+
+        Args:
+        ----
+            light_id: int
+
+        Returns:
+        -------
+            Returns a light with id
+
+        """
+        return await self._omcloud.outputs.turn_off(light_id)
+
+    async def _light_ids(self, light_ids: Iterable[int] | None) -> list[int]:
+        """Return the given light ids, or the ids of all lights."""
+        if light_ids is not None:
+            return list(light_ids)
+        return [light.idx for light in await self.get_all()]
+
+    async def turn_on_all(
+        self,
+        light_ids: Iterable[int] | None = None,
+        brightness: int | None = None,
+    ) -> list[Any]:
+        """Turn on several lights at once.
+
+        The commands are sent concurrently, each light is updated in the
+        index as soon as its command is sent.
 
-        return []
+        Args:
+        ----
+            light_ids: ids of the lights, all lights when omitted
+            brightness: <0 - 100>, for the dimmers
+
+        Returns:
+        -------
+            The responses, in the order of the lights.
+
+        """
+        ids = await self._light_ids(light_ids)
+        return await asyncio.gather(*(self.turn_on(light_id, brightness) for light_id in ids))
+
+    async def turn_off_all(
+        self,
+        light_ids: Iterable[int] | None = None,
+    ) -> list[Any]:
+        """Turn off several lights at once.
+
+        Args:
+        ----
+            light_ids: ids of the lights, all lights when omitted
+
+        Returns:
+        -------
+            The responses, in the order of the lights.
+
+        """
+        ids = await self._light_ids(light_ids)
+        return await asyncio.gather(*(self.turn_off(light_id) for light_id in ids))
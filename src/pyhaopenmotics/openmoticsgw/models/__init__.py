@@ -1,25 +1,51 @@
 """Init file for the models."""
 
-from pyhaopenmotics.openmoticsgw.models.groupaction import GroupAction
-from pyhaopenmotics.openmoticsgw.models.input import OMInput
-from pyhaopenmotics.openmoticsgw.models.light import Light
-from pyhaopenmotics.openmoticsgw.models.location import Location
-from pyhaopenmotics.openmoticsgw.models.output import Output
-from pyhaopenmotics.openmoticsgw.models.sensor import Sensor
-from pyhaopenmotics.openmoticsgw.models.shutter import Shutter
-from pyhaopenmotics.openmoticsgw.models.thermostat import (
-    ThermostatGroup,
-    ThermostatUnit,
-)
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from pyhaopenmotics.helpers.lazy import lazy_module
+
+if TYPE_CHECKING:
+    from pyhaopenmotics.openmoticsgw.models.const import ModuleType, OutputType
+    from pyhaopenmotics.openmoticsgw.models.groupaction import GroupAction
+    from pyhaopenmotics.openmoticsgw.models.input import OMInput
+    from pyhaopenmotics.openmoticsgw.models.light import Light
+    from pyhaopenmotics.openmoticsgw.models.location import Location
+    from pyhaopenmotics.openmoticsgw.models.output import Output
+    from pyhaopenmotics.openmoticsgw.models.sensor import Sensor
+    from pyhaopenmotics.openmoticsgw.models.shutter import Shutter
+    from pyhaopenmotics.openmoticsgw.models.thermostat import (
+        ThermostatGroup,
+        ThermostatUnit,
+    )
+
+_LAZY_IMPORTS = {
+    "GroupAction": "pyhaopenmotics.openmoticsgw.models.groupaction",
+    "OMInput": "pyhaopenmotics.openmoticsgw.models.input",
+    "Light": "pyhaopenmotics.openmoticsgw.models.light",
+    "Location": "pyhaopenmotics.openmoticsgw.models.location",
+    "ModuleType": "pyhaopenmotics.openmoticsgw.models.const",
+    "Output": "pyhaopenmotics.openmoticsgw.models.output",
+    "OutputType": "pyhaopenmotics.openmoticsgw.models.const",
+    "Sensor": "pyhaopenmotics.openmoticsgw.models.sensor",
+    "Shutter": "pyhaopenmotics.openmoticsgw.models.shutter",
+    "ThermostatGroup": "pyhaopenmotics.openmoticsgw.models.thermostat",
+    "ThermostatUnit": "pyhaopenmotics.openmoticsgw.models.thermostat",
+}
 
 __all__ = [
     "GroupAction",
     "Light",
     "Location",
+    "ModuleType",
     "OMInput",
     "Output",
+    "OutputType",
     "Sensor",
     "Shutter",
     "ThermostatGroup",
     "ThermostatUnit",
 ]
+
+__getattr__, __dir__ = lazy_module(__name__, _LAZY_IMPORTS)
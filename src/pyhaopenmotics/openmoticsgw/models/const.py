@@ -5,31 +5,45 @@
     'input': list of input module types (I,T,L).
 """
 
+from __future__ import annotations
+
+from enum import IntEnum, StrEnum
+
 OPENMOTICS_OUTPUT_TYPES = ["O", "R", "D"]
 OPENMOTICS_INPUT_TYPES = ["I", "T", "L"]
 
 
 # https://wiki.openmotics.com/index.php/Modules
-OPENMOTICS_OUTPUT_TYPE_TO_NAME = {
-    0: "OUTLET",
-    1: "VALVE",
-    2: "ALARM",
-    3: "APPLIANCE",
-    4: "PUMP",
-    5: "HVAC",
-    6: "GENERIC",
-    7: "MOTOR",
-    8: "VENTILATION",
-    9: "HEATER",
-    127: "SHUTTER_RELAY",
-    255: "LIGHT",
-}
-
-OPENMOTICS_MODULE_TYPE_TO_NAME = {
-    "O": "OUTPUT",
-    "R": "ROLLER",  # Also known as Shutter
-    "D": "DIMMER",
-    "I": "INPUT",
-    "T": "TEMPERATURE",
-    "L": "UNKNOWN",
-}
+class OutputType(IntEnum):
+    """Type of an output, the ``type`` of its configuration."""
+
+    OUTLET = 0
+    VALVE = 1
+    ALARM = 2
+    APPLIANCE = 3
+    PUMP = 4
+    HVAC = 5
+    GENERIC = 6
+    MOTOR = 7
+    VENTILATION = 8
+    HEATER = 9
+    SHUTTER_RELAY = 127
+    LIGHT = 255
+
+
+class ModuleType(StrEnum):
+    """Type of a module, the ``module_type`` letter of a configuration."""
+
+    OUTPUT = "O"
+    ROLLER = "R"  # Also known as Shutter
+    DIMMER = "D"
+    INPUT = "I"
+    TEMPERATURE = "T"
+    UNKNOWN = "L"
+
+
+OPENMOTICS_OUTPUT_TYPE_TO_NAME = {output_type.value: output_type.name for output_type in OutputType}
+OPENMOTICS_OUTPUT_NAME_TO_TYPE = {output_type.name: output_type.value for output_type in OutputType}
+
+OPENMOTICS_MODULE_TYPE_TO_NAME = {module_type.value: module_type.name for module_type in ModuleType}
+OPENMOTICS_MODULE_NAME_TO_TYPE = {module_type.name: module_type.value for module_type in ModuleType}
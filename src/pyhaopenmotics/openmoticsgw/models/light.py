@@ -3,10 +3,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from .location import Location
 
+if TYPE_CHECKING:
+    from .output import Output
+
 
 @dataclass
 class Status:
@@ -89,6 +92,36 @@ class Light:
             version=data.get("version", "0.0"),
         )
 
+    @staticmethod
+    def from_output(output: Output) -> Light:
+        """Return Light object of an output of type LIGHT.
+
+        Args:
+        ----
+            output: The Output.
+
+        Returns:
+        -------
+            A Light object, sharing the location and capabilities of the output.
+
+        """
+        return Light(
+            idx=output.idx,
+            local_id=output.local_id,
+            name=output.name,
+            location=output.location,
+            capabilities=output.capabilities,
+            metadata=output.metadata,
+            status=Status(
+                on=output.status.on,
+                locked=output.status.locked,
+                manual_override=output.status.manual_override,
+                value=output.status.value,
+            ),
+            last_state_change=output.last_state_change,
+            version=output.version,
+        )
+
     def __str__(self) -> str:
         """Represent the class objects as a string.
 
@@ -3,10 +3,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from .location import Location
 
+if TYPE_CHECKING:
+    from pyhaopenmotics.helpers.sensorstream import SensorReading
+
 
 @dataclass
 class Status:
@@ -37,6 +40,68 @@ class Status:
         )
 
 
+@dataclass(frozen=True)
+class SensorConfig:
+    """Immutable configuration of a sensor.
+
+    The configuration is parsed once when it is loaded, and shared by
+    reference by all snapshots.
+    """
+
+    idx: int
+    name: str
+    physical_quantity: str
+    unit: str | None
+    room: int | None
+    offset: float
+
+    @staticmethod
+    def from_dict(data: dict[str, Any]) -> SensorConfig:
+        """Return SensorConfig object from OpenMotics API response.
+
+        Args:
+        ----
+            data: The data from the OpenMotics API.
+
+        Returns:
+        -------
+            A SensorConfig object.
+
+        """
+        return SensorConfig(
+            idx=data.get("id", 0),
+            name=data.get("name", "None"),
+            physical_quantity=data.get("physical_quantity", "None"),
+            unit=data.get("unit"),
+            room=data.get("room"),
+            offset=data.get("offset") or 0.0,
+        )
+
+
+@dataclass(frozen=True)
+class SensorSnapshot:
+    """Immutable state of a sensor at a poll.
+
+    Snapshots only hold immutable values, so they can be shared between
+    tasks and pickled to worker threads or processes.
+    """
+
+    config: SensorConfig
+    # None when the sensor did not report a value.
+    reading: SensorReading | None
+
+    @property
+    def value(self) -> float | None:
+        """Get the value of the sensor.
+
+        Returns
+        -------
+            The value, or None without reading.
+
+        """
+        return None if self.reading is None else self.reading.value
+
+
 @dataclass
 class Sensor:
     """Class holding an OpenMotics Sensor.
@@ -6,10 +6,13 @@ from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
 from pyhaopenmotics.helpers import merge_dicts
+from pyhaopenmotics.helpers.index import DOMAIN_OUTPUTS
 
+from .models.const import OPENMOTICS_MODULE_TYPE_TO_NAME, OPENMOTICS_OUTPUT_TYPE_TO_NAME, ModuleType, OutputType
 from .models.output import Output
 
 if TYPE_CHECKING:
+    from pyhaopenmotics.helpers.filters import EntityFilter
     from pyhaopenmotics.localgateway import LocalGateway  # pylint: disable=R0401
 
 
@@ -30,6 +33,8 @@ class OpenMoticsOutputs:
         """
         self._omcloud = omcloud
         self._output_configs: list[Any] = []
+        self._ids_by_type: dict[OutputType, tuple[int, ...]] = {}
+        self._ids_by_module_type: dict[ModuleType, tuple[int, ...]] = {}
 
     @property
     def output_configs(self) -> list[Any]:
@@ -53,15 +58,86 @@ class OpenMoticsOutputs:
         """
         self._output_configs = output_configs
 
+        # The outputs are partitioned by type once per configuration load.
+        ids_by_type: dict[OutputType, list[int]] = {}
+        ids_by_module_type: dict[ModuleType, list[int]] = {}
+        for config in output_configs:
+            if (output_type := config.get("type", 0)) in OPENMOTICS_OUTPUT_TYPE_TO_NAME:
+                ids_by_type.setdefault(OutputType(output_type), []).append(config["id"])
+            if (module_type := config.get("module_type")) in OPENMOTICS_MODULE_TYPE_TO_NAME:
+                ids_by_module_type.setdefault(ModuleType(module_type), []).append(config["id"])
+        self._ids_by_type = {key: tuple(ids) for key, ids in ids_by_type.items()}
+        self._ids_by_module_type = {key: tuple(ids) for key, ids in ids_by_module_type.items()}
+
+    def ids_by_type(self, output_type: OutputType | int | str) -> tuple[int, ...]:
+        """Get the ids of the outputs of a type.
+
+        Args:
+        ----
+            output_type: OutputType, its value (e.g. 4) or its name (e.g. "PUMP")
+
+        Returns:
+        -------
+            tuple of output ids, empty until the configurations are loaded
+
+        """
+        if isinstance(output_type, str):
+            output_type = OutputType[output_type]
+        return self._ids_by_type.get(OutputType(output_type), ())
+
+    def ids_by_module_type(self, module_type: ModuleType | str) -> tuple[int, ...]:
+        """Get the ids of the outputs on a type of module.
+
+        Args:
+        ----
+            module_type: ModuleType or its letter, e.g. "D" for the dimmers
+
+        Returns:
+        -------
+            tuple of output ids, empty until the configurations are loaded
+
+        """
+        return self._ids_by_module_type.get(ModuleType(module_type), ())
+
+    async def get_by_type(
+        self,
+        output_type: OutputType | int | str,
+        *,
+        refresh: bool = False,
+    ) -> list[Output]:
+        """Get the outputs of a type, e.g. all pumps.
+
+        The outputs are taken from the index, which every output poll fills,
+        so no request is made unless refresh is set or nothing is loaded yet.
+
+        Args:
+        ----
+            output_type: OutputType, its value or its name
+            refresh: True to poll the outputs first
+
+        Returns:
+        -------
+            list of Output
+
+        """
+        if refresh or len(self.output_configs) == 0:
+            await self.get_all()
+        index = self._omcloud.index
+        return [
+            output
+            for output_id in self.ids_by_type(output_type)
+            if (output := index.get(DOMAIN_OUTPUTS, output_id)) is not None
+        ]
+
     async def get_all(
         self,
-        output_filter: str | None = None,
+        output_filter: EntityFilter | None = None,
     ) -> list[Output]:
         """Get a list of all output objects.
 
         Args:
         ----
-            output_filter: str
+            output_filter: EntityFilter
 
         Returns:
         -------
@@ -78,11 +154,13 @@ class OpenMoticsOutputs:
 
         data = merge_dicts(self.output_configs, "status", status)
 
+        outputs = [Output.from_dict(device) for device in data]
+        self._omcloud.index.update(DOMAIN_OUTPUTS, outputs)
+
         if output_filter is not None:
-            # implemented later
-            pass
+            outputs = output_filter.apply(outputs)
 
-        return [Output.from_dict(device) for device in data]  # pyright: ignore[reportReturnType]
+        return outputs  # pyright: ignore[reportReturnType]
 
     async def get_by_id(
         self,
@@ -151,9 +229,12 @@ class OpenMoticsOutputs:
             value = max(0, value)
 
         data = {"id": output_id, "is_on": True}
+        expected: dict[str, Any] = {"on": True}
         if value is not None:
             data["dimmer"] = value
-        return await self._omcloud.exec_action("set_output", data=data)
+            expected["value"] = value
+        with self._omcloud.index.optimistic(DOMAIN_OUTPUTS, output_id, expected):
+            return await self._omcloud.exec_action("set_output", data=data)
 
     async def turn_off(
         self,
@@ -171,4 +252,5 @@ class OpenMoticsOutputs:
 
         """
         data = {"id": output_id, "is_on": False}
-        return await self._omcloud.exec_action("set_output", data=data)
+        with self._omcloud.index.optimistic(DOMAIN_OUTPUTS, output_id, {"on": False}):
+            return await self._omcloud.exec_action("set_output", data=data)
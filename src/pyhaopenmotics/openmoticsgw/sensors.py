@@ -2,11 +2,19 @@
 
 from __future__ import annotations
 
+import asyncio
+import time
 from typing import TYPE_CHECKING, Any
 
-from pyhaopenmotics.openmoticsgw.models.sensor import Sensor
+from pyhaopenmotics.helpers.index import DOMAIN_SENSORS
+from pyhaopenmotics.helpers.sensorstream import SensorReading, SensorStreamFilter
+from pyhaopenmotics.openmoticsgw.models.sensor import Sensor, SensorConfig, SensorSnapshot
 
 if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from pyhaopenmotics.helpers.filters import EntityFilter
+    from pyhaopenmotics.helpers.sensorstream import StreamSettings
     from pyhaopenmotics.localgateway import LocalGateway  # pylint: disable=R0401
 
 
@@ -26,6 +34,7 @@ class OpenMoticsSensors:
         """
         self._omcloud = omcloud
         self._sensor_configs: list[Any] = []
+        self._configs: tuple[SensorConfig, ...] = ()
 
     @property
     def sensor_configs(self) -> list[Any]:
@@ -48,48 +57,143 @@ class OpenMoticsSensors:
 
         """
         self._sensor_configs = sensor_configs
+        self._configs = tuple(SensorConfig.from_dict(config) for config in sensor_configs)
+
+    @property
+    def configs(self) -> tuple[SensorConfig, ...]:
+        """Get the immutable sensor configurations.
+
+        Returns
+        -------
+            tuple of SensorConfig
+
+        """
+        return self._configs
+
+    async def _load_configs(self) -> None:
+        """Get the sensor configurations, unless they are known."""
+        if len(self.sensor_configs) == 0:
+            goc = await self._omcloud.exec_action("get_sensor_configurations")
+            if goc["success"] is True:
+                self.sensor_configs = goc["config"]
+
+    async def _get_values(self) -> dict[int, Any]:
+        """Get the value of every sensor by id.
+
+        Returns
+        -------
+            dict of sensor id to value
+
+        """
+        sensors_statuses = await self._omcloud.exec_action("get_sensor_status")
+        return {s["id"]: s.get("value") for s in sensors_statuses["status"]}
 
     async def get_all(
         self,
-        sensor_filter: str | None = None,
+        sensor_filter: EntityFilter | None = None,
     ) -> list[Sensor]:
         """Get a list of all sensor objects.
 
         Args:
         ----
-            sensor_filter: str
+            sensor_filter: EntityFilter
 
         Returns:
         -------
             Dict with all sensors
 
         """
-        if len(self.sensor_configs) == 0:
-            goc = await self._omcloud.exec_action("get_sensor_configurations")
-            if goc["success"] is True:
-                self.sensor_configs = goc["config"]
+        await self._load_configs()
+        values = await self._get_values()
 
-        sensors_statuses = await self._omcloud.exec_action("get_sensor_status")
-        statuses = {s["id"]: s for s in sensors_statuses["status"]}
-
-        data = []
-        for config in self.sensor_configs:
-            sensor_config = config
-            sensor_status = statuses.get(config["id"])
-            if sensor_status:
-                sensor_config["status"] = {
-                    sensor_config.get("physical_quantity"): sensor_status.get("value"),
-                }
-            data.append(sensor_config)
+        # The loaded configs are shared, every sensor gets a dict of its own.
+        data = [
+            config | {"status": {config.get("physical_quantity"): values[config["id"]]}}
+            if config["id"] in values
+            else config
+            for config in self.sensor_configs
+        ]
 
         sensors = [Sensor.from_dict(device) for device in data]
+        self._omcloud.index.update(DOMAIN_SENSORS, sensors)
 
         if sensor_filter is not None:
-            # implemented later
-            pass
+            sensors = sensor_filter.apply(sensors)
 
         return sensors  # pyright: ignore[reportReturnType]
 
+    async def get_readings(self) -> list[SensorReading]:
+        """Get the current value of every sensor that reports one.
+
+        Unlike get_all, no Sensor objects are built, which keeps tight polls cheap.
+
+        Returns
+        -------
+            list of SensorReading
+
+        """
+        await self._load_configs()
+        values = await self._get_values()
+        timestamp = time.monotonic()
+        return [
+            SensorReading(config.idx, config.physical_quantity, value, timestamp)
+            for config in self.configs
+            if (value := values.get(config.idx)) is not None
+        ]
+
+    async def get_snapshot(self) -> tuple[SensorSnapshot, ...]:
+        """Get an immutable snapshot of all sensors.
+
+        The configs are shared by all snapshots until they are reloaded, so a
+        poll only allocates the readings. Snapshots can be kept, passed to
+        other threads or pickled, later polls never change them.
+
+        Returns
+        -------
+            tuple of SensorSnapshot
+
+        """
+        await self._load_configs()
+        values = await self._get_values()
+        timestamp = time.monotonic()
+        return tuple(
+            SensorSnapshot(
+                config,
+                None
+                if (value := values.get(config.idx)) is None
+                else SensorReading(config.idx, config.physical_quantity, value, timestamp),
+            )
+            for config in self.configs
+        )
+
+    async def stream(
+        self,
+        interval: float = 10.0,
+        *,
+        default: StreamSettings | None = None,
+        per_quantity: dict[str, StreamSettings] | None = None,
+        per_sensor: dict[int, StreamSettings] | None = None,
+    ) -> AsyncIterator[SensorReading]:
+        """Poll the sensors and yield only the readings that matter.
+
+        Args:
+        ----
+            interval: seconds between two polls
+            default: StreamSettings of sensors without specific settings
+            per_quantity: StreamSettings per physical quantity, e.g. {"temperature": StreamSettings(0.2)}
+            per_sensor: StreamSettings per sensor id
+
+        Yields:
+        ------
+            SensorReading
+
+        """
+        stream_filter = SensorStreamFilter(default, per_quantity, per_sensor)
+        while True:
+            for reading in stream_filter.filter(await self.get_readings()):
+                yield reading
+            await asyncio.sleep(interval)
+
     async def get_by_id(
         self,
         sensor_id: int,
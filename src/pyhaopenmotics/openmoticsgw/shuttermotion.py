@@ -0,0 +1,330 @@
+"""Client-side motion model for OpenMotics shutters.
+
+The gateway only reports a shutter position when it is asked for it. While a
+shutter is moving, the position can be interpolated locally from the
+configured travel times (``timer_up`` / ``timer_down``), so callers do not
+have to poll ``get_shutter_status`` every second to follow the movement.
+
+Positions follow the gateway convention: 0 is fully up, ``steps - 1`` is
+fully down. Shutters without a ``steps`` configuration are tracked on a
+0 - 100 scale.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+DIRECTION_UP = "UP"
+DIRECTION_DOWN = "DOWN"
+DIRECTION_STOP = "STOP"
+
+DEFAULT_STEPS = 101
+# Fallback travel time when the configuration holds no (or a zero) timer.
+DEFAULT_TRAVEL_TIME = 30.0
+# Poll interval while every tracked shutter is idle.
+IDLE_POLL_INTERVAL = 30.0
+# Never poll faster than this while a shutter is moving.
+MIN_POLL_INTERVAL = 1.0
+# Extra time granted after the expected end of a movement before polling.
+END_OF_TRAVEL_MARGIN = 1.0
+
+_STATE_TO_DIRECTION = {
+    "GOING_UP": DIRECTION_UP,
+    "GOING_DOWN": DIRECTION_DOWN,
+    "UP": DIRECTION_STOP,
+    "DOWN": DIRECTION_STOP,
+    "STOP": DIRECTION_STOP,
+    "STOPPED": DIRECTION_STOP,
+}
+
+
+@dataclass
+class ShutterMotion:
+    """Motion state of a single shutter."""
+
+    shutter_id: int
+    timer_up: float = DEFAULT_TRAVEL_TIME
+    timer_down: float = DEFAULT_TRAVEL_TIME
+    steps: int = DEFAULT_STEPS
+    position: float = 0.0
+    direction: str = DIRECTION_STOP
+    target: float | None = None
+    started_at: float = field(default_factory=time.monotonic)
+
+    @staticmethod
+    def from_config(config: dict[str, Any]) -> ShutterMotion:
+        """Return ShutterMotion object from a shutter configuration.
+
+        Both the flat local configuration and the nested cloud
+        ``configuration`` layout are supported.
+
+        Args:
+        ----
+            config: The shutter configuration from the OpenMotics API.
+
+        Returns:
+        -------
+            A ShutterMotion object.
+
+        """
+        conf = config.get("configuration") or config
+        steps = conf.get("steps") or DEFAULT_STEPS
+        return ShutterMotion(
+            shutter_id=config.get("id", 0),
+            timer_up=float(conf.get("timer_up") or DEFAULT_TRAVEL_TIME),
+            timer_down=float(conf.get("timer_down") or DEFAULT_TRAVEL_TIME),
+            steps=int(steps),
+        )
+
+    @property
+    def max_position(self) -> float:
+        """Return the fully down position.
+
+        Returns
+        -------
+            float
+
+        """
+        return float(self.steps - 1)
+
+    @property
+    def moving(self) -> bool:
+        """Return True when the shutter is (estimated to be) moving.
+
+        Returns
+        -------
+            bool
+
+        """
+        return self.direction != DIRECTION_STOP
+
+    def _speed(self) -> float:
+        """Return the travel speed in positions per second."""
+        timer = self.timer_up if self.direction == DIRECTION_UP else self.timer_down
+        return self.max_position / timer
+
+    def _end_position(self) -> float:
+        """Return the position where the current movement ends."""
+        if self.target is not None:
+            return self.target
+        return 0.0 if self.direction == DIRECTION_UP else self.max_position
+
+    def estimate(self, now: float | None = None) -> float:
+        """Estimate the position at a given moment.
+
+        Args:
+        ----
+            now: monotonic timestamp, defaults to the current time
+
+        Returns:
+        -------
+            The estimated position.
+
+        """
+        if not self.moving:
+            return self.position
+        if now is None:
+            now = time.monotonic()
+        travelled = (now - self.started_at) * self._speed()
+        end = self._end_position()
+        if self.direction == DIRECTION_UP:
+            return max(end, self.position - travelled)
+        return min(end, self.position + travelled)
+
+    def remaining(self, now: float | None = None) -> float:
+        """Return the seconds until the current movement is expected to end.
+
+        Args:
+        ----
+            now: monotonic timestamp, defaults to the current time
+
+        Returns:
+        -------
+            Seconds left, 0 when the shutter is not moving.
+
+        """
+        if not self.moving:
+            return 0.0
+        # A shutter with a single step has no travel, its moves are instant.
+        if (speed := self._speed()) <= 0:
+            return 0.0
+        if now is None:
+            now = time.monotonic()
+        return abs(self._end_position() - self.estimate(now)) / speed
+
+    def settle(self, now: float | None = None) -> None:
+        """Mark the movement as finished once the end position is reached.
+
+        Args:
+        ----
+            now: monotonic timestamp, defaults to the current time
+
+        """
+        if self.moving and self.remaining(now) <= 0:
+            self.position = self._end_position()
+            self.direction = DIRECTION_STOP
+            self.target = None
+
+    def start(
+        self,
+        direction: str,
+        target: float | None = None,
+        now: float | None = None,
+    ) -> None:
+        """Start a movement from the currently estimated position.
+
+        Args:
+        ----
+            direction: UP, DOWN or STOP
+            target: optional position where the movement stops
+            now: monotonic timestamp, defaults to the current time
+
+        """
+        if now is None:
+            now = time.monotonic()
+        self.position = self.estimate(now)
+        self.started_at = now
+        self.direction = direction
+        self.target = None if target is None else min(max(target, 0.0), self.max_position)
+
+    def goto(self, position: float, now: float | None = None) -> None:
+        """Start a movement towards an absolute position.
+
+        Args:
+        ----
+            position: the target position
+            now: monotonic timestamp, defaults to the current time
+
+        """
+        current = self.estimate(now)
+        if position < current:
+            self.start(DIRECTION_UP, target=position, now=now)
+        elif position > current:
+            self.start(DIRECTION_DOWN, target=position, now=now)
+        else:
+            self.start(DIRECTION_STOP, now=now)
+
+    def update_from_status(self, status: dict[str, Any], now: float | None = None) -> None:
+        """Correct the model with a status reported by the gateway.
+
+        Args:
+        ----
+            status: the shutter status from the OpenMotics API
+            now: monotonic timestamp, defaults to the current time
+
+        """
+        if now is None:
+            now = time.monotonic()
+        state = str(status.get("state")).upper()
+        direction = _STATE_TO_DIRECTION.get(state, self.direction)
+        position = status.get("position")
+        if position is None and state == "UP":
+            position = 0.0
+        elif position is None and state == "DOWN":
+            position = self.max_position
+        self.position = self.estimate(now) if position is None else float(position)
+        self.started_at = now
+        if direction != self.direction or direction == DIRECTION_STOP:
+            self.target = None
+        self.direction = direction
+
+
+class ShutterMotionTracker:
+    """Track the motion of all shutters of a gateway."""
+
+    def __init__(self, idle_interval: float = IDLE_POLL_INTERVAL) -> None:
+        """Init the tracker.
+
+        Args:
+        ----
+            idle_interval: poll interval when no shutter is moving
+
+        """
+        self.idle_interval = idle_interval
+        self._motions: dict[int, ShutterMotion] = {}
+
+    def __contains__(self, shutter_id: object) -> bool:
+        """Return True when the shutter is tracked."""
+        return shutter_id in self._motions
+
+    def load_configs(self, shutter_configs: list[dict[str, Any]]) -> None:
+        """(Re)load the timings from the shutter configurations.
+
+        Args:
+        ----
+            shutter_configs: list of shutter configurations
+
+        """
+        for config in shutter_configs:
+            motion = ShutterMotion.from_config(config)
+            if (known := self._motions.get(motion.shutter_id)) is not None:
+                motion.position = known.estimate()
+            self._motions[motion.shutter_id] = motion
+
+    def get(self, shutter_id: int) -> ShutterMotion:
+        """Return the motion of a shutter, creating a default one if needed.
+
+        Args:
+        ----
+            shutter_id: int
+
+        Returns:
+        -------
+            ShutterMotion
+
+        """
+        if (motion := self._motions.get(shutter_id)) is None:
+            motion = self._motions[shutter_id] = ShutterMotion(shutter_id=shutter_id)
+        return motion
+
+    def update_from_status(self, detail: dict[str, Any]) -> None:
+        """Correct all models with the ``detail`` of ``get_shutter_status``.
+
+        Args:
+        ----
+            detail: dict of shutter id (as str) to shutter status
+
+        """
+        now = time.monotonic()
+        for shutter_id, status in detail.items():
+            self.get(int(shutter_id)).update_from_status(status, now)
+
+    def estimate(self, shutter_id: int) -> int:
+        """Return the estimated position of a shutter.
+
+        Args:
+        ----
+            shutter_id: int
+
+        Returns:
+        -------
+            The estimated position, rounded to a step.
+
+        """
+        motion = self.get(shutter_id)
+        motion.settle()
+        return round(motion.estimate())
+
+    def poll_interval(self) -> float:
+        """Return the recommended delay before the next status poll.
+
+        While shutters are moving, the next poll is scheduled at the moment
+        the first movement is expected to end, instead of polling every
+        second. Once all movements ended, polling falls back to the idle
+        interval.
+
+        Returns
+        -------
+            Seconds until the next poll.
+
+        """
+        now = time.monotonic()
+        remaining = [motion.remaining(now) for motion in self._motions.values() if motion.moving]
+        if not remaining:
+            return self.idle_interval
+        return min(
+            self.idle_interval,
+            max(MIN_POLL_INTERVAL, min(remaining) + END_OF_TRAVEL_MARGIN),
+        )
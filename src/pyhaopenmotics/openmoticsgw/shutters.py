@@ -5,9 +5,15 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
+from pyhaopenmotics.errors import OpenMoticsUnsupportedError
+from pyhaopenmotics.helpers.features import FEATURE_SHUTTER_POSITIONS
+from pyhaopenmotics.helpers.index import DEFAULT_PENDING_TIMEOUT, DOMAIN_SHUTTERS
+
 from .models.shutter import Shutter
+from .shuttermotion import DIRECTION_DOWN, DIRECTION_STOP, DIRECTION_UP, ShutterMotionTracker
 
 if TYPE_CHECKING:
+    from pyhaopenmotics.helpers.filters import EntityFilter
     from pyhaopenmotics.localgateway import LocalGateway  # pylint: disable=R0401
 
 
@@ -28,6 +34,7 @@ class OpenMoticsShutters:
         """
         self._omcloud = omcloud
         self._shutter_configs: list[Any] = []
+        self._motion = ShutterMotionTracker()
 
     @property
     def shutter_configs(self) -> list[Any]:
@@ -50,16 +57,28 @@ class OpenMoticsShutters:
 
         """
         self._shutter_configs = shutter_configs
+        self._motion.load_configs(shutter_configs)
+
+    @property
+    def motion(self) -> ShutterMotionTracker:
+        """Get the motion tracker of the shutters.
+
+        Returns
+        -------
+            ShutterMotionTracker
+
+        """
+        return self._motion
 
     async def get_all(
         self,
-        shutter_filter: str | None = None,
+        shutter_filter: EntityFilter | None = None,
     ) -> list[Shutter]:
         """Get a list of all shutter objects.
 
         Args:
         ----
-            shutter_filter: str
+            shutter_filter: EntityFilter
 
         Returns:
         -------
@@ -73,20 +92,27 @@ class OpenMoticsShutters:
 
         shutters_status = await self._omcloud.exec_action("get_shutter_status")
         status = shutters_status["detail"]
+        if not self._omcloud.features.supports(FEATURE_SHUTTER_POSITIONS):
+            # Older gateways do not report positions, the motion model provides them.
+            status = {shutter_id: shutter_status | {"position": None} for shutter_id, shutter_status in status.items()}
+        self._motion.update_from_status(status)
 
         data = []
         for shutter in self.shutter_configs:
             shutter_id = str(shutter.get("id"))
             if shutter_id is not None and shutter_id in status:
-                data.append(shutter | {"status": status[shutter_id]})
+                shutter_status = status[shutter_id]
+                if shutter_status.get("position") is None:
+                    shutter_status = shutter_status | {"position": self._motion.estimate(int(shutter_id))}
+                data.append(shutter | {"status": shutter_status})
             else:
                 data.append(shutter)
 
         shutters = [Shutter.from_dict(device) for device in data]
+        self._omcloud.index.update(DOMAIN_SHUTTERS, shutters)
 
         if shutter_filter is not None:
-            # implemented later
-            pass
+            shutters = shutter_filter.apply(shutters)
 
         return shutters  # pyright: ignore[reportReturnType]
 
@@ -110,6 +136,37 @@ class OpenMoticsShutters:
                 return shutter
         return None
 
+    def estimate_position(
+        self,
+        shutter_id: int,
+    ) -> int:
+        """Estimate the current position of a shutter without a request.
+
+        The position is interpolated from the last known status and the
+        configured up/down timings.
+
+        Args:
+        ----
+            shutter_id: int
+
+        Returns:
+        -------
+            The estimated position (0 is fully up).
+
+        """
+        return self._motion.estimate(shutter_id)
+
+    def poll_interval(self) -> float:
+        """Return the recommended delay before the next status poll.
+
+        Returns
+        -------
+            Seconds until the next poll: short while shutters move,
+            long once all movements ended.
+
+        """
+        return self._motion.poll_interval()
+
     async def move_up(
         self,
         shutter_id: int,
@@ -126,7 +183,9 @@ class OpenMoticsShutters:
 
         """
         data = {"id": shutter_id}
-        return await self._omcloud.exec_action("do_shutter_up", data=data)
+        result = await self._omcloud.exec_action("do_shutter_up", data=data)
+        self._motion.get(shutter_id).start(DIRECTION_UP)
+        return result
 
     async def move_down(
         self,
@@ -144,7 +203,9 @@ class OpenMoticsShutters:
 
         """
         data = {"id": shutter_id}
-        return await self._omcloud.exec_action("do_shutter_down", data=data)
+        result = await self._omcloud.exec_action("do_shutter_down", data=data)
+        self._motion.get(shutter_id).start(DIRECTION_DOWN)
+        return result
 
     async def stop(
         self,
@@ -162,7 +223,9 @@ class OpenMoticsShutters:
 
         """
         data = {"id": shutter_id}
-        return await self._omcloud.exec_action("do_shutter_stop", data=data)
+        result = await self._omcloud.exec_action("do_shutter_stop", data=data)
+        self._motion.get(shutter_id).start(DIRECTION_STOP)
+        return result
 
     async def change_position(
         self,
@@ -184,6 +247,23 @@ class OpenMoticsShutters:
         -------
             Returns a shutter with id
 
+        Raises:
+        ------
+            OpenMoticsUnsupportedError: The gateway does not support shutter positions.
+
         """
+        if not self._omcloud.features.supports(FEATURE_SHUTTER_POSITIONS):
+            msg = "The gateway does not support shutter positions."
+            raise OpenMoticsUnsupportedError(msg)
         data = {"id": shutter_id, "position": position}
-        return await self._omcloud.exec_action("do_shutter_goto", data=data)
+        result = await self._omcloud.exec_action("do_shutter_goto", data=data)
+        motion = self._motion.get(shutter_id)
+        motion.goto(position)
+        # The estimated positions only match the target once the shutter arrived.
+        self._omcloud.index.apply_pending(
+            DOMAIN_SHUTTERS,
+            shutter_id,
+            {"position": position},
+            timeout=motion.remaining() + DEFAULT_PENDING_TIMEOUT,
+        )
+        return result
@@ -0,0 +1,262 @@
+"""Cached state of the thermostats of a local gateway.
+
+Gateways expose their thermostats through two API generations:
+
+* the unit API (``get_thermostat_unit_configurations`` /
+  ``get_thermostat_unit_status``), next to the thermostat group actions;
+* the classic API (``get_thermostat_configurations`` /
+  ``get_thermostat_status``), where all thermostats share one global group
+  and the status uses abbreviated keys (``act``, ``csetp``, ``output0``).
+
+The engine detects the generation once, downloads the configurations once
+and fetches all statuses concurrently. The result is kept as an indexed view,
+so looking up a group, a unit or the units of a group needs no extra request.
+Only a 404 (or an action the feature map rejects) counts as a missing API;
+other errors are raised and the generation is detected again on the next
+refresh.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from pyhaopenmotics.errors import OpenMoticsConnectionError
+from pyhaopenmotics.helpers.features import is_unsupported_error
+from pyhaopenmotics.helpers.index import DOMAIN_THERMOSTATS
+from pyhaopenmotics.openmoticsgw.models.thermostat import (
+    ThermostatGroup,
+    ThermostatUnit,
+)
+
+if TYPE_CHECKING:
+    from pyhaopenmotics.localgateway import LocalGateway  # pylint: disable=R0401
+
+_LOGGER = logging.getLogger(__name__)
+
+GENERATION_UNIT = "unit"
+GENERATION_CLASSIC = "classic"
+
+# Id of the global group of the classic API.
+CLASSIC_GROUP_ID = 0
+
+# Abbreviated keys of the classic status and their unit API counterpart.
+_CLASSIC_STATUS_KEYS = {
+    "act": "actual_temperature",
+    "csetp": "setpoint_temperature",
+    "output0": "output_0",
+    "output1": "output_1",
+}
+
+
+def normalize_classic_status(status: dict[str, Any]) -> dict[str, Any]:
+    """Return a classic thermostat status with the keys of the unit API.
+
+    Args:
+    ----
+        status: status of a single thermostat from get_thermostat_status
+
+    Returns:
+    -------
+        dict
+
+    """
+    normalized = {_CLASSIC_STATUS_KEYS.get(key, key): value for key, value in status.items()}
+    normalized.setdefault("preset", str(status.get("mode", "None")))
+    return normalized
+
+
+def merge_by_id(configs: list[dict[str, Any]], statuses: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Merge each status into the ``status`` key of the configuration with the same id.
+
+    Unlike ``merge_dicts``, this does not rely on both lists having the same
+    order: the gateway does not report thermostats without a sensor.
+
+    Args:
+    ----
+        configs: list of configurations
+        statuses: list of statuses
+
+    Returns:
+    -------
+        list of configurations
+
+    """
+    by_id = {status.get("id"): status for status in statuses}
+    return [config | {"status": by_id[config.get("id")]} if config.get("id") in by_id else config for config in configs]
+
+
+@dataclass
+class ThermostatView:
+    """Indexed snapshot of all thermostat groups and units."""
+
+    groups: dict[int, ThermostatGroup] = field(default_factory=dict)
+    units: dict[int, ThermostatUnit] = field(default_factory=dict)
+    units_by_group: dict[int, list[ThermostatUnit]] = field(default_factory=dict)
+
+    @staticmethod
+    def build(groups: list[ThermostatGroup | None], units: list[ThermostatUnit | None]) -> ThermostatView:
+        """Index groups and units.
+
+        Args:
+        ----
+            groups: list of ThermostatGroup objects
+            units: list of ThermostatUnit objects
+
+        Returns:
+        -------
+            A ThermostatView object.
+
+        """
+        view = ThermostatView()
+        for group in groups:
+            if group is not None:
+                view.groups[group.idx] = group
+                view.units_by_group[group.idx] = []
+        for unit in units:
+            if unit is not None:
+                view.units[unit.idx] = unit
+                view.units_by_group.setdefault(unit.location.thermostat_group_id, []).append(unit)
+        return view
+
+
+class ThermostatEngine:
+    """Fetch, cache and index the thermostats of a gateway."""
+
+    def __init__(self, omcloud: LocalGateway) -> None:
+        """Init the engine.
+
+        Args:
+        ----
+            omcloud: LocalGateway
+
+        """
+        self._omcloud = omcloud
+        self.generation: str | None = None
+        self.group_configs: list[Any] = []
+        self.unit_configs: list[Any] = []
+        self.view = ThermostatView()
+        self.refreshed = False
+
+    async def _try_action(self, action: str) -> dict[str, Any] | None:
+        """Execute an action, returning None when the gateway does not know it.
+
+        Actions the gateway already rejected are skipped without a request.
+
+        Args:
+        ----
+            action: name of the action
+
+        Returns:
+        -------
+            The response, or None.
+
+        Raises:
+        ------
+            OpenMoticsConnectionError: The request failed for another reason
+                than an unknown action, e.g. a timeout.
+
+        """
+        if not self._omcloud.features.action_supported(action):
+            return None
+        try:
+            response = await self._omcloud.exec_action(action)
+        except OpenMoticsConnectionError as exception:
+            if not is_unsupported_error(exception):
+                raise
+            _LOGGER.debug("Thermostat action %s is not available", action)
+            return None
+        if not isinstance(response, dict) or response.get("success") is False:
+            return None
+        return response
+
+    async def detect(self) -> str:
+        """Detect the thermostat API of the gateway and load its configurations.
+
+        The generation is only kept once all its configurations are loaded.
+
+        Returns
+        -------
+            GENERATION_UNIT or GENERATION_CLASSIC
+
+        Raises
+        ------
+            OpenMoticsConnectionError: A configuration could not be downloaded.
+
+        """
+        if self.generation is not None:
+            return self.generation
+
+        unit_config, group_config = await asyncio.gather(
+            self._try_action("get_thermostat_unit_configurations"),
+            self._try_action("get_thermostat_group_configurations"),
+        )
+        if unit_config is not None:
+            self.unit_configs = unit_config.get("config", [])
+            self.group_configs = [] if group_config is None else group_config.get("config", [])
+            self.generation = GENERATION_UNIT
+        else:
+            classic_config = await self._try_action("get_thermostat_configurations")
+            self.unit_configs = [] if classic_config is None else classic_config.get("config", [])
+            self.group_configs = [{"id": CLASSIC_GROUP_ID, "name": "Thermostats"}]
+            self.generation = GENERATION_CLASSIC
+        _LOGGER.debug("Thermostat API generation: %s", self.generation)
+        return self.generation
+
+    async def refresh(self) -> ThermostatView:
+        """Fetch the status of all groups and units and rebuild the view.
+
+        Returns
+        -------
+            ThermostatView
+
+        """
+        if await self.detect() == GENERATION_UNIT:
+            group_response, unit_response = await asyncio.gather(
+                self._omcloud.exec_action("get_thermostat_group_status"),
+                self._omcloud.exec_action("get_thermostat_unit_status"),
+            )
+            group_status = group_response.get("status", [])
+            unit_status = unit_response.get("status", [])
+        else:
+            classic = await self._omcloud.exec_action("get_thermostat_status")
+            group_status = [
+                {
+                    "id": CLASSIC_GROUP_ID,
+                    "mode": "COOLING" if classic.get("cooling") else "HEATING",
+                    "state": bool(classic.get("thermostats_on", False)),
+                },
+            ]
+            unit_status = [normalize_classic_status(status) for status in classic.get("status", [])]
+
+        groups = [ThermostatGroup.from_dict(device) for device in merge_by_id(self.group_configs, group_status)]
+        units = [ThermostatUnit.from_dict(device) for device in merge_by_id(self.unit_configs, unit_status)]
+        self.view = ThermostatView.build(groups, units)
+        self.refreshed = True
+        self._omcloud.index.update(DOMAIN_THERMOSTATS, units)
+        return self.view
+
+    async def get_view(self, *, refresh: bool = False) -> ThermostatView:
+        """Return the last view, it is only refreshed when asked or never loaded.
+
+        Args:
+        ----
+            refresh: True to fetch the statuses first
+
+        Returns:
+        -------
+            ThermostatView
+
+        """
+        if refresh or not self.refreshed:
+            return await self.refresh()
+        return self.view
+
+    def invalidate(self) -> None:
+        """Forget the configurations, they are downloaded again on the next refresh."""
+        self.generation = None
+        self.group_configs = []
+        self.unit_configs = []
+        self.refreshed = False
@@ -5,14 +5,16 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
-from pyhaopenmotics.helpers import merge_dicts
-from pyhaopenmotics.openmoticsgw.models.thermostat import (
-    ThermostatGroup,
-    ThermostatUnit,
-)
+from pyhaopenmotics.helpers.index import DOMAIN_THERMOSTATS
+from pyhaopenmotics.openmoticsgw.thermostatengine import ThermostatEngine
 
 if TYPE_CHECKING:
+    from pyhaopenmotics.helpers.filters import EntityFilter
     from pyhaopenmotics.localgateway import LocalGateway  # pylint: disable=R0401
+    from pyhaopenmotics.openmoticsgw.models.thermostat import (
+        ThermostatGroup,
+        ThermostatUnit,
+    )
 
 
 @dataclass
@@ -32,9 +34,10 @@ class OpenMoticsThermostats:
         """
         self._omcloud = omcloud
         self._thermostat_configs: list[Any] = []
+        self.engine = ThermostatEngine(self._omcloud)
 
-        self.groups = OpenMoticsThermostatGroups(self._omcloud)
-        self.units = OpenMoticsThermostatUnits(self._omcloud)
+        self.groups = OpenMoticsThermostatGroups(self._omcloud, self.engine)
+        self.units = OpenMoticsThermostatUnits(self._omcloud, self.engine)
 
     async def set_mode(
         self,
@@ -79,16 +82,17 @@ class OpenMoticsThermostatGroups:
     All actions related to thermostats or a specific thermostat.
     """
 
-    def __init__(self, omcloud: LocalGateway) -> None:
+    def __init__(self, omcloud: LocalGateway, engine: ThermostatEngine | None = None) -> None:
         """Init the installations object.
 
         Args:
         ----
             omcloud: LocalGateway
+            engine: ThermostatEngine shared with the thermostat units
 
         """
         self._omcloud = omcloud
-        self._thermostatgroup_configs: list[Any] = []
+        self._engine = ThermostatEngine(omcloud) if engine is None else engine
 
     @property
     def thermostatgroup_configs(self) -> list[Any]:
@@ -99,7 +103,7 @@ class OpenMoticsThermostatGroups:
             list of all thermostatgroup_configs
 
         """
-        return self._thermostatgroup_configs
+        return self._engine.group_configs
 
     @thermostatgroup_configs.setter
     def thermostatgroup_configs(self, thermostatgroup_configs: list[Any]) -> None:
@@ -110,60 +114,76 @@ class OpenMoticsThermostatGroups:
             thermostatgroup_configs: list
 
         """
-        self._thermostatgroup_configs = thermostatgroup_configs
+        self._engine.group_configs = thermostatgroup_configs
 
     async def get_all(
         self,
-        thermostatgroup_filter: str | None = None,
+        thermostatgroup_filter: EntityFilter | None = None,
     ) -> list[ThermostatGroup]:
         """Get a list of all ThermostatGroup objects.
 
         Args:
         ----
-            thermostatgroup_filter: str
+            thermostatgroup_filter: EntityFilter
 
         Returns:
         -------
             Dict with all ThermostatGroup
 
         """
-        if len(self.thermostatgroup_configs) == 0:
-            goc = await self._omcloud.exec_action("get_thermostat_group_configurations")
-            if goc["success"] is True:
-                self.thermostatgroup_configs = goc["config"]
-
-        thermostatgroup_status = await self._omcloud.exec_action("get_thermostat_group_status")
-        status = thermostatgroup_status["status"]
-
-        data = merge_dicts(self.thermostatgroup_configs, "status", status)
-
-        thermostatgroups = [ThermostatGroup.from_dict(device) for device in data]
+        view = await self._engine.refresh()
+        thermostatgroups = list(view.groups.values())
 
         if thermostatgroup_filter is not None:
-            # implemented later
-            pass
+            thermostatgroups = thermostatgroup_filter.apply(thermostatgroups)
 
-        return thermostatgroups  # pyright: ignore[reportReturnType]
+        return thermostatgroups
 
     async def get_by_id(
         self,
         thermostatgroup_id: int,
+        *,
+        refresh: bool = False,
     ) -> ThermostatGroup | None:
         """Get thermostat by id.
 
+        The group is taken from the last refresh, see get_all.
+
         Args:
         ----
             thermostatgroup_id: int
+            refresh: True to fetch the statuses first
 
         Returns:
         -------
             Returns a thermostatgroup with id
 
         """
-        for thermostatgroup in await self.get_all():
-            if thermostatgroup.idx == thermostatgroup_id:
-                return thermostatgroup
-        return None
+        view = await self._engine.get_view(refresh=refresh)
+        return view.groups.get(thermostatgroup_id)
+
+    async def get_units(
+        self,
+        thermostatgroup_id: int,
+        *,
+        refresh: bool = False,
+    ) -> list[ThermostatUnit]:
+        """Get the thermostat units of a group.
+
+        The units are taken from the last refresh, see get_all.
+
+        Args:
+        ----
+            thermostatgroup_id: int
+            refresh: True to fetch the statuses first
+
+        Returns:
+        -------
+            list of ThermostatUnit objects
+
+        """
+        view = await self._engine.get_view(refresh=refresh)
+        return list(view.units_by_group.get(thermostatgroup_id, []))
 
     async def set_mode(
         self,
@@ -192,16 +212,17 @@ class OpenMoticsThermostatUnits:
     All actions related to thermostats or a specific thermostat.
     """
 
-    def __init__(self, _omcloud: LocalGateway) -> None:
+    def __init__(self, _omcloud: LocalGateway, engine: ThermostatEngine | None = None) -> None:
         """Init the installations object.
 
         Args:
         ----
             _omcloud: LocalGateway
+            engine: ThermostatEngine shared with the thermostat groups
 
         """
         self._omcloud = _omcloud
-        self._thermostatunit_configs: list[Any] = []
+        self._engine = ThermostatEngine(_omcloud) if engine is None else engine
 
     @property
     def thermostatunit_configs(self) -> list[Any]:
@@ -212,7 +233,7 @@ class OpenMoticsThermostatUnits:
             list of all thermostatunit_configs
 
         """
-        return self._thermostatunit_configs
+        return self._engine.unit_configs
 
     @thermostatunit_configs.setter
     def thermostatunit_configs(self, thermostatunit_configs: list[Any]) -> None:
@@ -223,78 +244,53 @@ class OpenMoticsThermostatUnits:
             thermostatunit_configs: list
 
         """
-        self._thermostatunit_configs = thermostatunit_configs
+        self._engine.unit_configs = thermostatunit_configs
 
     async def get_all(
         self,
-        thermostatunit_filter: str | None = None,
+        thermostatunit_filter: EntityFilter | None = None,
     ) -> list[ThermostatUnit]:
         """Get a list of all ThermostatUnit objects.
 
         Args:
         ----
-            thermostatunit_filter: str
+            thermostatunit_filter: EntityFilter
 
         Returns:
         -------
             Dict with all ThermostatUnit
 
         """
-        ###############################################################################
-        # Code has changed in latest version of gateway:
-        #      get_thermostat_configurations does NOT exist anymore
-        # As the gateway is now closed source, we cannot see the new functions.
-        ###############################################################################
-        #
-        # Return an empty config to avoid errors
-        empty_device = [
-            {
-                "id": 0,
-                "name": "None",
-            },
-        ]
-        return [ThermostatUnit.from_dict(device) for device in empty_device]  # pyright: ignore[reportReturnType]
-
-        # TO BE FIXED
-        #
-        ###############################################################################
-        if len(self.thermostatunit_configs) == 0:
-            goc = await self._omcloud.exec_action("get_thermostat_configurations")
-            if goc["success"] is True:
-                self.thermostatunit_configs = goc["config"]
-
-        thermostatunit_status = await self._omcloud.exec_action("get_thermostat_status")
-        status = thermostatunit_status["status"]
-
-        data = merge_dicts(self.thermostatunit_configs, "status", status)
-
-        thermostatunits = [ThermostatUnit.from_dict(device) for device in data]
+        view = await self._engine.refresh()
+        thermostatunits = list(view.units.values())
 
         if thermostatunit_filter is not None:
-            # implemented later
-            pass
+            thermostatunits = thermostatunit_filter.apply(thermostatunits)
 
         return thermostatunits
 
     async def get_by_id(
         self,
         thermostatunit_id: int,
+        *,
+        refresh: bool = False,
     ) -> ThermostatUnit | None:
         """Get thermostatunit by id.
 
+        The unit is taken from the last refresh, see get_all.
+
         Args:
         ----
             thermostatunit_id: int
+            refresh: True to fetch the statuses first
 
         Returns:
         -------
             Returns a thermostatunit with id
 
         """
-        for thermostatunit in await self.get_all():
-            if thermostatunit.idx == thermostatunit_id:
-                return thermostatunit
-        return None
+        view = await self._engine.get_view(refresh=refresh)
+        return view.units.get(thermostatunit_id)
 
     async def set_state(
         self,
@@ -333,8 +329,9 @@ class OpenMoticsThermostatUnits:
             Returns a thermostatunit with id
 
         """
-        if thermostatunit_id or temperature:
-            pass
+        data = {"thermostat": thermostatunit_id, "temperature": temperature}
+        with self._omcloud.index.optimistic(DOMAIN_THERMOSTATS, thermostatunit_id, {"current_setpoint": temperature}):
+            return await self._omcloud.exec_action("set_current_setpoint", data=data)
 
     async def set_preset(
         self,
@@ -0,0 +1,74 @@
+"""Tests for the response cache."""
+
+import asyncio
+
+import pytest
+
+from pyhaopenmotics.client.cache import (
+    ResponseCache,
+    cache_key,
+    invalidated_actions,
+    invalidated_paths,
+)
+
+
+def test_invalidation_rules() -> None:
+    """Test commands invalidate the reads of their domain only."""
+    assert invalidated_actions("set_output") == ("get_output_",)
+    assert invalidated_actions("do_shutter_goto") == ("get_shutter_",)
+    assert invalidated_actions("do_group_action") == ("",)
+
+    assert invalidated_paths("/base/installations/1/outputs/2/turn_on") == (
+        "/base/installations/1/outputs",
+        "/base/installations/1/lights",
+    )
+    assert invalidated_paths("/base/installations/1/groupactions/3/trigger") == ("/base/installations/1",)
+    assert invalidated_paths("/base/other") == ("",)
+
+    assert cache_key("get_output_status") == "get_output_status"
+    assert cache_key("get_x", {"b": 2, "a": 1}) == cache_key("get_x", {"a": 1, "b": 2})
+
+
+@pytest.mark.asyncio
+async def test_deduplication_and_ttl() -> None:
+    """Test concurrent reads share a request and the response is reused."""
+    cache = ResponseCache(ttl=60)
+    calls = 0
+
+    async def fetch() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0)
+        return calls
+
+    results = await asyncio.gather(*(cache.fetch("get_output_status", "get_output_status", fetch) for _ in range(5)))
+    assert results == [1] * 5
+    assert await cache.fetch("get_output_status", "get_output_status", fetch) == 1
+    assert calls == 1
+
+    cache.invalidate("get_output_")
+    assert await cache.fetch("get_output_status", "get_output_status", fetch) == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_and_invalidated_inflight() -> None:
+    """Test errors are not cached, nor reads invalidated while in flight."""
+    cache = ResponseCache(ttl=60)
+
+    async def fail() -> None:
+        raise ValueError
+
+    with pytest.raises(ValueError):  # noqa: PT011
+        await cache.fetch("get_a", "get_a", fail)
+
+    async def slow() -> str:
+        await asyncio.sleep(0)
+        cache.invalidate("")
+        return "stale"
+
+    assert await cache.fetch("get_a", "get_a", slow) == "stale"
+
+    async def fresh() -> str:
+        return "fresh"
+
+    assert await cache.fetch("get_a", "get_a", fresh) == "fresh"
@@ -0,0 +1,115 @@
+"""Tests for the change stream exporter."""
+
+import asyncio
+import io
+import multiprocessing
+import threading
+from pathlib import Path
+
+import orjson
+import pytest
+
+from pyhaopenmotics.helpers.changestream import ChangeStreamExporter, ConnectionSink, RotatingFileSink, StreamSink
+from pyhaopenmotics.helpers.index import DOMAIN_OUTPUTS, EntityIndex
+from pyhaopenmotics.openmoticsgw.models.output import Output
+
+
+def _output(*, on: bool) -> Output | None:
+    """Return an output."""
+    return Output.from_dict({"id": 3, "name": "Hall", "type": 255, "room": 1, "status": {"status": int(on)}})
+
+
+def test_exporter_writes_deltas() -> None:
+    """Test only the changed fields are exported, in batches."""
+    index = EntityIndex()
+    stream = io.BytesIO()
+    exporter = ChangeStreamExporter(index, StreamSink(stream), gateway="gw", batch_size=10, flush_interval=0)
+    exporter.start()
+
+    index.update(DOMAIN_OUTPUTS, [_output(on=False)])
+    index.update(DOMAIN_OUTPUTS, [_output(on=False)])
+    index.update(DOMAIN_OUTPUTS, [_output(on=True)])
+    index.update(DOMAIN_OUTPUTS, [])
+    assert stream.getvalue() == b""
+
+    exporter.flush()
+    records = [orjson.loads(line) for line in stream.getvalue().splitlines()]
+    assert len(records) == 3
+    assert records[0]["changed"]["name"] == "Hall"
+    assert records[1]["changed"] == {"status": {"on": True}}
+    assert records[1]["gateway"] == "gw"
+    assert records[1]["domain"] == DOMAIN_OUTPUTS
+    assert records[1]["id"] == 3
+    assert records[2]["removed"] is True
+
+
+def test_rotating_file_sink(tmp_path: Path) -> None:
+    """Test the file is rotated once it is full."""
+    path = tmp_path / "changes.ndjson"
+    sink = RotatingFileSink(path, max_bytes=10, backup_count=2)
+    for _ in range(4):
+        sink.write(b"12345678\n")
+    sink.close()
+    assert path.read_bytes() == b"12345678\n"
+    assert (tmp_path / "changes.ndjson.1").exists()
+    assert (tmp_path / "changes.ndjson.2").exists()
+    assert not (tmp_path / "changes.ndjson.3").exists()
+
+
+def test_connection_sink() -> None:
+    """Test every batch is one message, and closing the sink ends the stream."""
+    reader, writer = multiprocessing.Pipe(duplex=False)
+    exporter = ChangeStreamExporter(EntityIndex(), ConnectionSink(writer), gateway="gw", flush_interval=0)
+    exporter.start()
+
+    exporter.index.update(DOMAIN_OUTPUTS, [_output(on=False)])
+    exporter.index.update(DOMAIN_OUTPUTS, [_output(on=True)])
+    exporter.flush()
+    exporter.sink.close()
+
+    assert len(reader.recv_bytes().splitlines()) == 2
+    with pytest.raises(EOFError):
+        reader.recv_bytes()
+
+
+def test_msgpack_records() -> None:
+    """Test msgpack records round-trip, including integer keys."""
+    msgpack = pytest.importorskip("msgpack")
+    stream = io.BytesIO()
+    exporter = ChangeStreamExporter(EntityIndex(), StreamSink(stream), gateway="gw", fmt="msgpack", flush_interval=0)
+    exporter.start()
+
+    exporter.index.update(DOMAIN_OUTPUTS, [_output(on=True)])
+    exporter.flush()
+    unpacker = msgpack.Unpacker(strict_map_key=False)
+    unpacker.feed(stream.getvalue())
+    (record,) = list(unpacker)
+    assert record["gateway"] == "gw"
+    assert record["id"] == 3
+    assert record["changed"]["status"]["on"] is True
+
+
+@pytest.mark.asyncio
+async def test_exporter_writes_from_thread() -> None:
+    """Test a started exporter writes full batches off the event loop, and the rest on stop."""
+    threads: list[str] = []
+
+    class RecordingSink(StreamSink):
+        """Sink recording the thread of every write."""
+
+        def write(self, data: bytes) -> None:
+            threads.append(threading.current_thread().name)
+            super().write(data)
+
+    stream = io.BytesIO()
+    exporter = ChangeStreamExporter(EntityIndex(), RecordingSink(stream), gateway="gw", batch_size=1, flush_interval=60)
+    async with exporter:
+        exporter.index.update(DOMAIN_OUTPUTS, [_output(on=False)])
+        for _ in range(10):
+            await asyncio.sleep(0.01)
+            if threads:
+                break
+        exporter.index.update(DOMAIN_OUTPUTS, [_output(on=True)])
+    assert threads
+    assert threads[0] != threading.current_thread().name
+    assert len(stream.getvalue().splitlines()) == 2
@@ -0,0 +1,59 @@
+"""Tests for the gateway feature map."""
+
+from pyhaopenmotics.errors import OpenMoticsConnectionError
+from pyhaopenmotics.helpers.features import (
+    FEATURE_INPUT_STATES,
+    FEATURE_SHUTTER_POSITIONS,
+    FeatureMap,
+    is_unsupported_error,
+)
+
+
+class NotFoundError(Exception):
+    """Stand-in for an HTTP error with a status."""
+
+    status = 404
+
+
+def test_feature_map() -> None:
+    """Test unprobed gateways support everything, probed ones only their features."""
+    features = FeatureMap()
+    assert not features.probed
+    assert features.supports(FEATURE_SHUTTER_POSITIONS)
+
+    features.features = {FEATURE_INPUT_STATES}
+    features.mark_unsupported("get_thermostat_configurations")
+    assert features.supports(FEATURE_INPUT_STATES)
+    assert not features.supports(FEATURE_SHUTTER_POSITIONS)
+    assert not features.action_supported("get_thermostat_configurations")
+
+    restored = FeatureMap.from_dict(features.to_dict())
+    assert restored.probed
+    assert restored.features == features.features
+    assert restored.unsupported_actions == {"get_thermostat_configurations"}
+
+
+def test_unsupported_error() -> None:
+    """Test only 404 answers mark an action as unsupported."""
+    exception = OpenMoticsConnectionError()
+    exception.__cause__ = NotFoundError()
+    assert is_unsupported_error(exception)
+    assert not is_unsupported_error(OpenMoticsConnectionError())
+
+
+class HttpxStatusError(Exception):
+    """Stand-in for an httpx error, which holds the status in its response."""
+
+    def __init__(self, status_code: int) -> None:
+        """Init the error."""
+        super().__init__()
+        self.response = type("Response", (), {"status_code": status_code})()
+
+
+def test_unsupported_error_http2() -> None:
+    """Test 404 answers of the HTTP/2 transport are recognized too."""
+    exception = OpenMoticsConnectionError()
+    exception.__cause__ = HttpxStatusError(404)
+    assert is_unsupported_error(exception)
+    exception.__cause__ = HttpxStatusError(500)
+    assert not is_unsupported_error(exception)
@@ -0,0 +1,33 @@
+"""Tests for the typed entity filters."""
+
+import json
+
+from pyhaopenmotics.helpers.filters import EntityFilter, cloud_filter
+from pyhaopenmotics.openmoticsgw.models.output import Output
+
+outputs = [
+    Output.from_dict({"id": 0, "name": "Hall", "type": 255, "room": 1, "module_type": "D", "status": {"status": 1}}),
+    Output.from_dict({"id": 1, "name": "Pump", "type": 0, "room": 1, "status": {"status": 0}}),
+    Output.from_dict({"id": 2, "name": "Desk", "type": 255, "room": 2, "status": {"status": 0}}),
+]
+
+
+def test_local_predicate() -> None:
+    """Test the compiled predicate combines all criteria."""
+    assert [output.idx for output in EntityFilter(rooms=1).apply(outputs)] == [0, 1]
+    assert [output.idx for output in EntityFilter(types="LIGHT", state={"on": False}).apply(outputs)] == [2]
+    assert [output.idx for output in EntityFilter(capabilities=["ON_OFF", "RANGE"]).apply(outputs)] == [0]
+    assert EntityFilter().apply(outputs) == outputs
+    assert not EntityFilter()
+
+
+def test_cloud_pushdown() -> None:
+    """Test single valued criteria are sent to the cloud, the rest stays local."""
+    query, residual = cloud_filter(EntityFilter(types="LIGHT", rooms=(1, 2), floors=3, state={"on": True}))
+    assert query is not None
+    assert json.loads(query) == {"type": "LIGHT", "location": {"floor_id": 3}}
+    assert residual == EntityFilter(rooms=(1, 2), state={"on": True})
+
+    assert cloud_filter(EntityFilter(types="LIGHT")) == ('{"type":"LIGHT"}', None)
+    assert cloud_filter('{"usage":"SCENE"}') == ('{"usage":"SCENE"}', None)
+    assert cloud_filter(None) == (None, None)
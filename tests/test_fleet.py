@@ -0,0 +1,75 @@
+"""Tests for the fleet collector."""
+
+# pylint: disable=protected-access
+import multiprocessing
+import threading
+
+import pytest
+
+from pyhaopenmotics.helpers import fleet
+from pyhaopenmotics.helpers.fleet import FleetCollector, FleetGateway, shard_gateways
+from pyhaopenmotics.helpers.index import DOMAIN_OUTPUTS, EntityIndex
+from pyhaopenmotics.openmoticsgw.models.output import Output
+
+
+def test_shard_gateways() -> None:
+    """Test gateways are spread evenly, and no worker starts without gateways."""
+    gateways = [FleetGateway(f"gw{idx}", {"localgw": f"10.0.0.{idx}"}) for idx in range(5)]
+
+    shards = shard_gateways(gateways, 2)
+    assert [[gateway.name for gateway in shard] for shard in shards] == [["gw0", "gw2", "gw4"], ["gw1", "gw3"]]
+    assert len(shard_gateways(gateways, 8)) == len(gateways)
+    assert shard_gateways([], 4) == []
+
+
+class _Outputs:
+    """Outputs domain of the fake client, switching output 3 on every poll."""
+
+    def __init__(self, client: "_Client") -> None:
+        self.client = client
+
+    async def get_all(self) -> None:
+        self.client.polls += 1
+        output = Output.from_dict({"id": 3, "name": "Hall", "type": 255, "status": {"status": self.client.polls % 2}})
+        self.client.index.update(DOMAIN_OUTPUTS, [output])
+        if self.client.polls == 2:
+            self.client.stop.set()
+
+
+class _Client:
+    """Client polled by the fleet worker."""
+
+    def __init__(self, stop: threading.Event) -> None:
+        self.index = EntityIndex()
+        self.stop = stop
+        self.polls = 0
+        self.closed = False
+        self.outputs = _Outputs(self)
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_collect_over_pipe(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test a worker sends the changes of every poll over its pipe, until stopped."""
+    stop = threading.Event()
+    clients: list[_Client] = []
+
+    def create_client(_gateway: FleetGateway) -> _Client:
+        clients.append(_Client(stop))
+        return clients[-1]
+
+    monkeypatch.setattr(fleet, "_create_client", create_client)
+    reader, writer = multiprocessing.Pipe(duplex=False)
+    await fleet._collect([FleetGateway("gw1")], writer, stop, 0, (DOMAIN_OUTPUTS,))  # type: ignore[arg-type]
+    assert clients[0].closed
+
+    # The worker closed its end, so the collector sees EOF after the batches.
+    collector = FleetCollector([])
+    collector._connections = [reader]
+    records = [record async for record in collector.changes()]
+    assert [(record["gateway"], record["domain"], record["id"]) for record in records] == [("gw1", "outputs", 3)] * 2
+    assert records[0]["changed"]["status"]["on"] is True
+    assert records[1]["changed"] == {"status": {"on": False}}
+    await collector.stop()
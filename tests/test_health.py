@@ -0,0 +1,86 @@
+"""Tests for the latency tracking and circuit breaking."""
+
+import pytest
+
+from pyhaopenmotics.client.health import (
+    MIN_TIMEOUT,
+    STATE_HALF_OPEN,
+    CircuitBreaker,
+    HealthRegistry,
+    LatencyTracker,
+    latency_key,
+)
+from pyhaopenmotics.errors import OpenMoticsCircuitOpenError, OpenMoticsConnectionError
+
+
+def test_latency_key() -> None:
+    """Test ids are collapsed in the latency key."""
+    assert latency_key("GET", "/base/installations/12/outputs/3") == "GET /base/installations/{id}/outputs/{id}"
+    assert latency_key("POST", "get_output_status") == "POST get_output_status"
+
+
+def test_adaptive_timeout() -> None:
+    """Test the timeout follows the observed latency."""
+    tracker = LatencyTracker()
+    assert tracker.timeout_for("key", 8) == 8
+    assert tracker.hedge_delay("key") is None
+
+    for _ in range(20):
+        tracker.record("key", 0.1)
+    tracker.record("key", 0.9)
+    assert tracker.percentile("key", 95) == pytest.approx(0.1)
+    assert tracker.timeout_for("key", 8) == pytest.approx(2.7)
+
+    fast = LatencyTracker()
+    for _ in range(20):
+        fast.record("key", 0.01)
+    assert fast.timeout_for("key", 8) == MIN_TIMEOUT
+
+
+def test_circuit_breaker() -> None:
+    """Test the circuit opens after consecutive failures and closes on success."""
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    breaker.record_failure()
+    breaker.check()
+    breaker.record_failure()
+    assert breaker.is_open
+    with pytest.raises(OpenMoticsCircuitOpenError):
+        breaker.check()
+    assert issubclass(OpenMoticsCircuitOpenError, OpenMoticsConnectionError)
+
+    breaker.record_success()
+    assert not breaker.is_open
+    breaker.check()
+
+
+def test_half_open_probe() -> None:
+    """Test a single probe is let through once the reset timeout passed."""
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.state == STATE_HALF_OPEN
+    breaker.check()
+    breaker.reset_timeout = 60
+    breaker.opened_at = 0.0
+    with pytest.raises(OpenMoticsCircuitOpenError):
+        breaker.check()
+
+    breaker.record_failure()
+    assert breaker.is_open
+    breaker.record_success()
+    breaker.record_latency(0.2)
+    breaker.record_latency(0.4)
+    health = breaker.as_dict()
+    assert health["consecutive_failures"] == 0
+    assert health["latency_ewma"] == pytest.approx(0.24)
+    assert health["last_success"] is not None
+
+
+def test_health_registry() -> None:
+    """Test clients of the same gateway share their circuit breaker."""
+    registry = HealthRegistry(failure_threshold=1)
+    assert registry.get("gw:443") is registry.get("gw:443")
+    assert registry.get("gw:443") is not registry.get("gw:8443")
+
+    registry.get("gw:443").record_failure()
+    assert registry.snapshot()["gw:443"]["state"] == "open"
+    assert registry.snapshot()["gw:8443"]["state"] == "closed"
@@ -0,0 +1,112 @@
+"""Tests for the HTTP/2 transport of the clients."""
+
+# pylint: disable=protected-access
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from pyhaopenmotics.client.health import CircuitBreaker
+from pyhaopenmotics.client.openmoticscloud import OpenMoticsCloud
+from pyhaopenmotics.errors import (
+    AuthenticationError,
+    OpenMoticsConnectionError,
+    OpenMoticsConnectionTimeoutError,
+)
+from pyhaopenmotics.helpers.features import is_unsupported_error
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("h2")
+
+from pyhaopenmotics.client.http2 import Http2Transport  # noqa: E402
+
+URL = "https://api.openmotics.com/api/v1.1/base/installations/1/outputs"
+
+
+class RecordingBreaker(CircuitBreaker):
+    """Circuit breaker counting the outcomes it is told about."""
+
+    def __init__(self) -> None:
+        """Init the breaker."""
+        super().__init__()
+        self.outcomes: list[str] = []
+
+    def record_success(self) -> None:
+        """Count a success."""
+        self.outcomes.append("success")
+        super().record_success()
+
+    def record_failure(self) -> None:
+        """Count a failure."""
+        self.outcomes.append("failure")
+        super().record_failure()
+
+
+def _client(handler: Any) -> tuple[OpenMoticsCloud, RecordingBreaker]:
+    """Return a cloud client sending its requests to a handler."""
+    breaker = RecordingBreaker()
+    client = OpenMoticsCloud("12345", installation_id=1, http2=True, circuit_breaker=breaker)
+    client._http2_transport = Http2Transport(transport=httpx.MockTransport(handler))
+    return client, breaker
+
+
+@pytest.mark.asyncio
+async def test_http2_json_and_text() -> None:
+    """Test JSON and text responses are read like with aiohttp."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/outputs"):
+            assert request.headers["Authorization"] == "Bearer 12345"
+            assert request.url.params["filter"] == "x"
+            return httpx.Response(200, json={"data": []})
+        assert request.content == b'{"on":true}'
+        return httpx.Response(200, text="OK")
+
+    client, breaker = _client(handler)
+    path = client.routes.path("outputs")
+    assert await client.get(path, params={"filter": "x"}) == {"data": []}
+    assert await client.post(client.routes.path("outputs/{}/turn_on", 3), json={"on": True}) == "OK"
+    assert breaker.outcomes == ["success", "success"]
+    await client.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("status", "error"),
+    [
+        (401, AuthenticationError),
+        (403, AuthenticationError),
+        (404, OpenMoticsConnectionError),
+        (500, OpenMoticsConnectionError),
+    ],
+)
+async def test_http2_status_errors(status: int, error: type[Exception]) -> None:
+    """Test error statuses are mapped, and count as a healthy answer."""
+    client, breaker = _client(lambda _request: httpx.Response(status, text="nok"))
+    with pytest.raises(error) as exc_info:
+        await client._send_http2("GET", URL, request_timeout=1)
+    assert breaker.outcomes == ["success"]
+    assert is_unsupported_error(exc_info.value) == (status == 404)
+    await client.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("exception", "error"),
+    [
+        (httpx.ReadTimeout("timeout"), OpenMoticsConnectionTimeoutError),
+        (httpx.ConnectError("refused"), OpenMoticsConnectionError),
+    ],
+)
+async def test_http2_transport_errors(exception: Exception, error: type[Exception]) -> None:
+    """Test timeouts and transport errors are mapped and count as failures."""
+
+    def handler(_request: httpx.Request) -> httpx.Response:
+        raise exception
+
+    client, breaker = _client(handler)
+    with pytest.raises(error):
+        await client._send_http2("GET", URL, request_timeout=1)
+    assert breaker.outcomes == ["failure"]
+    await client.close()
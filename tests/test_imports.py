@@ -0,0 +1,43 @@
+"""Tests for the lazy loading of the pyhaopenmotics package."""
+
+import subprocess
+import sys
+
+import pytest
+
+import pyhaopenmotics
+from pyhaopenmotics import cloud
+
+
+def test_import_is_lazy() -> None:
+    """Test importing the package does not load the clients and their dependencies."""
+    code = (
+        "import sys, pyhaopenmotics; "
+        "print(','.join(m for m in ('aiohttp', 'backoff', 'mashumaro', 'websockets', "
+        "'pyhaopenmotics.localgateway', 'pyhaopenmotics.openmoticsgw') if m in sys.modules))"
+    )
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", code],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    assert result.stdout.strip() == ""
+
+
+def test_lazy_attributes() -> None:
+    """Test the public names resolve on first access."""
+    assert "LocalGateway" in dir(pyhaopenmotics)
+    assert pyhaopenmotics.LocalGateway.__name__ == "LocalGateway"
+    assert pyhaopenmotics.OpenMoticsCloud.__name__ == "OpenMoticsCloud"
+    with pytest.raises(AttributeError):
+        _ = pyhaopenmotics.DoesNotExist
+
+
+def test_lazy_subpackage() -> None:
+    """Test the domains of a subpackage resolve and are kept on the package."""
+    assert "OpenMoticsOutputs" in dir(cloud)
+    outputs = cloud.OpenMoticsOutputs
+    assert vars(cloud)["OpenMoticsOutputs"] is outputs
+    with pytest.raises(AttributeError):
+        _ = cloud.DoesNotExist
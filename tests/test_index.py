@@ -0,0 +1,102 @@
+"""Tests for the room and floor index."""
+
+import pytest
+
+from pyhaopenmotics.client.openmoticscloud import OpenMoticsCloud
+from pyhaopenmotics.helpers.index import DOMAIN_OUTPUTS, DOMAIN_SENSORS, EntityChange, EntityIndex
+from pyhaopenmotics.openmoticsgw.models.output import Output
+from pyhaopenmotics.openmoticsgw.models.sensor import Sensor
+
+
+def _output(idx: int, room: int, *, on: bool) -> Output | None:
+    """Return a light output."""
+    return Output.from_dict({"id": idx, "name": f"light{idx}", "type": 255, "room": room, "status": {"status": int(on)}})
+
+
+def _sensor(idx: int, floor: int, temperature: float) -> Sensor | None:
+    """Return a temperature sensor."""
+    return Sensor.from_dict(
+        {
+            "id": idx,
+            "name": f"sensor{idx}",
+            "floor_id": floor,
+            "physical_quantity": "temperature",
+            "status": {"temperature": temperature},
+        },
+    )
+
+
+def test_room_index() -> None:
+    """Test entities are moved between rooms and removed when gone."""
+    index = EntityIndex()
+    index.update(DOMAIN_OUTPUTS, [_output(0, 1, on=True), _output(1, 1, on=False), _output(2, 2, on=True)])
+    assert [light.idx for light in index.lights_on(1)] == [0]
+    assert len(index.in_room(1)) == 2
+
+    index.update(DOMAIN_OUTPUTS, [_output(0, 2, on=True), _output(1, 1, on=True)])
+    assert [light.idx for light in index.lights_on(1)] == [1]
+    assert sorted(light.idx for light in index.lights_on(2)) == [0]
+    assert index.get(DOMAIN_OUTPUTS, 2) is None
+    assert len(index) == 2
+
+
+def test_floor_temperature() -> None:
+    """Test the average temperature per floor."""
+    index = EntityIndex()
+    humidity = Sensor.from_dict({"id": 3, "floor_id": 1, "physical_quantity": "humidity", "status": {"humidity": 50}})
+    index.update(DOMAIN_SENSORS, [_sensor(0, 1, 20.0), _sensor(1, 1, 22.0), _sensor(2, 2, 18.0), humidity])
+    assert index.average_temperature(1) == 21.0
+    assert index.average_temperature(3) is None
+    assert index.average_temperature_per_floor() == {1: 21.0, 2: 18.0}
+
+
+def test_optimistic_confirm_and_rollback() -> None:
+    """Test optimistic states survive stale reads until confirmed or expired."""
+    index = EntityIndex()
+    index.update(DOMAIN_OUTPUTS, [_output(0, 1, on=False)])
+
+    assert index.apply_pending(DOMAIN_OUTPUTS, 0, {"on": True})
+    assert index.get(DOMAIN_OUTPUTS, 0).status.on
+    assert not index.apply_pending(DOMAIN_OUTPUTS, 9, {"on": True})
+
+    # A read from before the command does not undo the optimistic state.
+    index.update(DOMAIN_OUTPUTS, [_output(0, 1, on=False)])
+    assert index.get(DOMAIN_OUTPUTS, 0).status.on
+    assert index.is_pending(DOMAIN_OUTPUTS, 0)
+
+    index.update(DOMAIN_OUTPUTS, [_output(0, 1, on=True)])
+    assert not index.is_pending(DOMAIN_OUTPUTS, 0)
+
+    # Unconfirmed states roll back to the last read once expired.
+    index.apply_pending(DOMAIN_OUTPUTS, 0, {"on": False}, timeout=0)
+    assert not index.is_pending(DOMAIN_OUTPUTS, 0)
+    assert index.get(DOMAIN_OUTPUTS, 0).status.on
+
+
+def test_optimistic_failed_command() -> None:
+    """Test a failing command rolls its optimistic state back."""
+    index = EntityIndex()
+    index.update(DOMAIN_OUTPUTS, [_output(0, 1, on=False)])
+    changes = []
+    index.subscribe(changes.append)
+
+    with pytest.raises(RuntimeError), index.optimistic(DOMAIN_OUTPUTS, 0, {"on": True}):
+        raise RuntimeError
+
+    assert not index.get(DOMAIN_OUTPUTS, 0).status.on
+    assert [change.pending for change in changes] == [True, False]
+
+
+def test_index_per_installation() -> None:
+    """Test entities with the same id in two installations do not overwrite each other."""
+    client = OpenMoticsCloud("12345", installation_id=1)
+    changes: list[EntityChange] = []
+    client.index.subscribe(changes.append)
+    client.index.update(DOMAIN_OUTPUTS, [_output(3, 1, on=True)])
+
+    client.installation_id = 2
+    client.index.update(DOMAIN_OUTPUTS, [_output(3, 5, on=False)])
+
+    assert client.index_for(1).get(DOMAIN_OUTPUTS, 3).status.on
+    assert not client.index.get(DOMAIN_OUTPUTS, 3).status.on
+    assert not any(change.removed for change in changes)
@@ -0,0 +1,80 @@
+"""Tests for the input event engine."""
+
+import asyncio
+from contextlib import aclosing
+
+import pytest
+
+from pyhaopenmotics.cloud.inputs import OpenMoticsInputs
+from pyhaopenmotics.helpers.inputevents import (
+    CLOUD_POLL_INTERVAL,
+    DEFAULT_POLL_INTERVAL,
+    EVENT_DOUBLE_CLICK,
+    EVENT_LONG_PRESS,
+    EVENT_PRESSED,
+    EVENT_RELEASED,
+    EVENT_SHORT_PRESS,
+    InputEventEngine,
+)
+
+
+def _types(events: list) -> list[str]:
+    """Return the types of events."""
+    return [event.event_type for event in events]
+
+
+def test_press_patterns() -> None:
+    """Test edges, short and long presses and double clicks are detected."""
+    engine = InputEventEngine(long_press_time=0.8, double_click_time=0.4)
+
+    assert _types(engine.feed(1, on=True, timestamp=0.0)) == [EVENT_PRESSED]
+    assert engine.feed(1, on=True, timestamp=0.1) == []
+    assert _types(engine.feed(1, on=False, timestamp=0.2)) == [EVENT_RELEASED, EVENT_SHORT_PRESS]
+    engine.feed(1, on=True, timestamp=0.4)
+    assert _types(engine.feed(1, on=False, timestamp=0.5)) == [EVENT_RELEASED, EVENT_SHORT_PRESS, EVENT_DOUBLE_CLICK]
+
+    engine.feed(1, on=True, timestamp=2.0)
+    assert _types(engine.tick(2.9)) == [EVENT_LONG_PRESS]
+    assert engine.tick(3.0) == []
+    assert _types(engine.feed(1, on=False, timestamp=3.1)) == [EVENT_RELEASED]
+
+
+def test_websocket_events() -> None:
+    """Test input changes of the websocket feed the engine."""
+    engine = InputEventEngine()
+    engine.handle_event({"type": "OUTPUT_CHANGE", "data": {"id": 1, "status": {"on": True}}})
+    engine.handle_event({"type": "INPUT_CHANGE", "data": {"id": 2, "status": True}})
+    assert _types(engine.feed(2, on=False)) == [EVENT_RELEASED, EVENT_SHORT_PRESS]
+    assert engine.feed(1, on=False) == []
+
+
+@pytest.mark.asyncio
+async def test_single_poll_for_all_subscribers() -> None:
+    """Test one poll serves every subscriber, and stops without subscribers."""
+    polls = 0
+    states = [{1: False}, {1: True}, {1: True}]
+
+    async def poll() -> dict[int, bool]:
+        nonlocal polls
+        polls += 1
+        return states[min(polls, len(states)) - 1]
+
+    engine = InputEventEngine(poll, poll_interval=0)
+
+    async def first_event() -> str:
+        async with aclosing(engine.events([1])) as events:
+            async for event in events:
+                return event.event_type
+        return ""
+
+    results = await asyncio.wait_for(asyncio.gather(first_event(), first_event()), 1)
+    assert results == [EVENT_PRESSED, EVENT_PRESSED]
+    # The first poll sets the known states, the second one sees the press.
+    assert polls == 2
+    assert engine._task is None
+
+
+def test_cloud_poll_interval() -> None:
+    """Test the cloud polls its inputs less often than a local gateway."""
+    inputs = OpenMoticsInputs(None)  # type: ignore[arg-type]
+    assert inputs.event_engine.poll_interval == CLOUD_POLL_INTERVAL > DEFAULT_POLL_INTERVAL
@@ -0,0 +1,63 @@
+"""Tests for the local lights."""
+
+from typing import Any
+
+import pytest
+
+from pyhaopenmotics.helpers.index import EntityIndex
+from pyhaopenmotics.openmoticsgw.lights import OpenMoticsLights
+from pyhaopenmotics.openmoticsgw.outputs import OpenMoticsOutputs
+
+CONFIGS = [
+    {"id": 0, "name": "Hall", "type": 255, "module_type": "O", "room": 1},
+    {"id": 1, "name": "Living", "type": 255, "module_type": "D", "room": 1},
+    {"id": 2, "name": "Pump", "type": 4, "module_type": "O", "room": 2},
+]
+
+
+class _Gateway:
+    """Gateway answering the output actions and recording the commands."""
+
+    def __init__(self) -> None:
+        self.index = EntityIndex()
+        self.outputs = OpenMoticsOutputs(self)  # type: ignore[arg-type]
+        self.actions: list[str] = []
+        self.commands: list[dict[str, Any]] = []
+        self.on = dict.fromkeys(range(3), 0)
+
+    async def exec_action(self, action: str, data: dict[str, Any] | None = None, **_kwargs: Any) -> dict[str, Any]:
+        self.actions.append(action)
+        if action == "get_output_configurations":
+            return {"success": True, "config": CONFIGS}
+        if action == "get_output_status":
+            return {"success": True, "status": [{"id": idx, "status": on, "dimmer": 0} for idx, on in self.on.items()]}
+        self.commands.append(data or {})
+        if data is not None:
+            self.on[data["id"]] = int(data["is_on"])
+        return {"success": True}
+
+
+@pytest.mark.asyncio
+async def test_lights_from_outputs() -> None:
+    """Test lights come from the indexed outputs, and brightness only goes to dimmers."""
+    gateway = _Gateway()
+    lights = OpenMoticsLights(gateway)  # type: ignore[arg-type]
+
+    assert [light.name for light in await lights.get_all()] == ["Hall", "Living"]
+    polls = len(gateway.actions)
+    assert len(await lights.get_all(refresh=False)) == 2
+    assert len(gateway.actions) == polls
+
+    await lights.turn_on_all(brightness=40)
+    assert gateway.commands == [{"id": 0, "is_on": True}, {"id": 1, "is_on": True, "dimmer": 40}]
+    assert all(light.status.on for light in await lights.get_all(refresh=False))
+
+    # A light turned off elsewhere is seen by the next call, and toggled on.
+    assert all(light.status.on for light in await lights.get_all())
+    gateway.on[0] = 0
+    assert not (await lights.get_by_id(0)).status.on  # type: ignore[union-attr]
+    await lights.toggle(0)
+    assert gateway.commands[-1] == {"id": 0, "is_on": True}
+
+    await lights.turn_on(1, 0)
+    assert gateway.commands[-1] == {"id": 1, "is_on": False}
@@ -0,0 +1,95 @@
+"""Tests for the clients sharing BaseClient."""
+
+# pylint: disable=protected-access
+import aiohttp
+import pytest
+from aiohttp import web
+from aresponses import ResponsesMockServer
+
+import pyhaopenmotics
+from pyhaopenmotics import localgateway as localgateway_shim
+from pyhaopenmotics import openmoticscloud as openmoticscloud_shim
+from pyhaopenmotics.client.localgateway import LocalGateway
+from pyhaopenmotics.client.openmoticscloud import OpenMoticsCloud
+from pyhaopenmotics.errors import OpenMoticsConnectionError
+from pyhaopenmotics.helpers.features import FeatureMap
+
+
+def test_reexport_shims() -> None:
+    """Test the old module paths export the clients of the client package."""
+    assert localgateway_shim.LocalGateway is LocalGateway
+    assert openmoticscloud_shim.OpenMoticsCloud is OpenMoticsCloud
+    assert pyhaopenmotics.LocalGateway is LocalGateway
+    assert pyhaopenmotics.OpenMoticsCloud is OpenMoticsCloud
+
+
+@pytest.mark.asyncio
+async def test_exec_action_request(aresponses: ResponsesMockServer) -> None:
+    """Test an action logs in once and is posted with the token."""
+
+    async def login_handler(request: web.Request) -> web.Response:
+        """Check the credentials."""
+        assert dict(await request.post()) == {"username": "user", "password": "secret"}
+        return aresponses.Response(
+            text='{"success": true, "token": "abc"}',
+            headers={"Content-Type": "application/json"},
+        )
+
+    async def action_handler(request: web.Request) -> web.Response:
+        """Check the token and the data of the action."""
+        assert request.headers["Authorization"] == "Bearer abc"
+        assert dict(await request.post()) == {"id": "3", "is_on": "true"}
+        return aresponses.Response(text='{"success": true}', headers={"Content-Type": "application/json"})
+
+    aresponses.add("gw.local", "/login", "POST", login_handler)
+    aresponses.add("gw.local", "/set_output", "POST", action_handler, repeat=2)
+
+    async with aiohttp.ClientSession() as session:
+        client = LocalGateway(
+            "user",
+            "secret",
+            "gw.local",
+            session=session,
+            features=FeatureMap(features=[]),
+        )
+        assert await client._get_url("set_output") == "https://gw.local/set_output"
+        assert await client.exec_action("set_output", {"id": 3, "is_on": "true"}) == {"success": True}
+        assert await client.exec_action("set_output", {"id": 3, "is_on": "true"}) == {"success": True}
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_unknown_action_is_not_retried(aresponses: ResponsesMockServer) -> None:
+    """Test a 404 is raised after a single request and marks the action unsupported."""
+    aresponses.add(
+        "gw.local",
+        "/login",
+        "POST",
+        aresponses.Response(text='{"success": true, "token": "abc"}', headers={"Content-Type": "application/json"}),
+    )
+    aresponses.add("gw.local", "/get_thermostat_unit_configurations", "POST", aresponses.Response(status=404))
+
+    async with aiohttp.ClientSession() as session:
+        client = LocalGateway("user", "secret", "gw.local", session=session, features=FeatureMap(features=[]))
+        with pytest.raises(OpenMoticsConnectionError):
+            await client.exec_action("get_thermostat_unit_configurations")
+    assert not client.features.action_supported("get_thermostat_unit_configurations")
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_cloud_get_request(aresponses: ResponsesMockServer) -> None:
+    """Test a cloud read is sent to the installation with the token."""
+
+    async def handler(request: web.Request) -> web.Response:
+        """Check the token and the query."""
+        assert request.headers["Authorization"] == "Bearer 12345"
+        assert request.query["filter"] == "x"
+        return aresponses.Response(text='{"data": []}', headers={"Content-Type": "application/json"})
+
+    aresponses.add("api.openmotics.com", "/api/v1.1/base/installations/7/outputs", "GET", handler, match_querystring=False)
+
+    async with aiohttp.ClientSession() as session:
+        client = OpenMoticsCloud("12345", session=session, installation_id=7)
+        path = client.routes.path("outputs")
+        assert await client.get(path, params={"filter": "x"}) == {"data": []}
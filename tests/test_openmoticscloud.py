@@ -87,3 +87,42 @@ async def test_http_error500(aresponses: ResponsesMockServer) -> None:
         open_motics = OpenMoticsCloud(session=session, token="12345")
         with pytest.raises(OpenMoticsError):
             assert await open_motics._request("/")
+
+
+@pytest.mark.enable_socket
+@pytest.mark.asyncio
+async def test_shutter_command_payload(aresponses: ResponsesMockServer) -> None:
+    """Test commands send their body encoded once, with the auth headers."""
+
+    async def response_handler(request):  # type: ignore
+        """Check the body and headers of the command."""
+        assert await request.json() == {"position": 50}
+        assert request.headers["Authorization"] == "Bearer 12345"
+        assert request.headers["Content-Type"] == "application/json"
+        return aresponses.Response(text='{"_error": null}', headers={"Content-Type": "application/json"})
+
+    aresponses.add(
+        "api.openmotics.com",
+        "/api/v1.1/base/installations/1/shutters/2/change_position",
+        "POST",
+        response_handler,
+    )
+
+    async with aiohttp.ClientSession() as session:
+        open_motics = OpenMoticsCloud(session=session, token="12345", installation_id=1)
+        assert await open_motics.shutters.change_position(2, 50) == {"_error": None}
+
+
+@pytest.mark.asyncio
+async def test_auth_headers_per_token() -> None:
+    """Test header sets are shared until the token changes."""
+    open_motics = OpenMoticsCloud(token="12345")
+    headers = await open_motics._get_auth_headers()
+    assert headers["Authorization"] == "Bearer 12345"
+    assert await open_motics._get_auth_headers() is headers
+    assert (await open_motics._get_auth_headers(json_body=True))["Content-Type"] == "application/json"
+    assert (await open_motics._get_auth_headers({"X-Test": "1"}))["X-Test"] == "1"
+    assert (await open_motics._get_ws_headers())["Sec-WebSocket-Protocol"] == "authorization.bearer.MTIzNDU="
+
+    open_motics.token = "67890"
+    assert (await open_motics._get_auth_headers())["Authorization"] == "Bearer 67890"
@@ -0,0 +1,39 @@
+"""Tests for the output types and partitions."""
+
+from pyhaopenmotics.helpers import get_key_for_word
+from pyhaopenmotics.openmoticsgw.models.const import (
+    OPENMOTICS_MODULE_NAME_TO_TYPE,
+    OPENMOTICS_MODULE_TYPE_TO_NAME,
+    OPENMOTICS_OUTPUT_NAME_TO_TYPE,
+    OPENMOTICS_OUTPUT_TYPE_TO_NAME,
+    ModuleType,
+    OutputType,
+)
+from pyhaopenmotics.openmoticsgw.outputs import OpenMoticsOutputs
+
+
+def test_type_maps() -> None:
+    """Test the maps follow the enums and the reverse maps are exported."""
+    assert OPENMOTICS_OUTPUT_TYPE_TO_NAME[255] == "LIGHT"
+    assert OPENMOTICS_MODULE_TYPE_TO_NAME["R"] == "ROLLER"
+    assert get_key_for_word(OPENMOTICS_OUTPUT_TYPE_TO_NAME, "PUMP") == OutputType.PUMP
+    assert get_key_for_word(OPENMOTICS_MODULE_TYPE_TO_NAME, "DIMMER") == ModuleType.DIMMER
+    assert OPENMOTICS_OUTPUT_NAME_TO_TYPE["PUMP"] == OutputType.PUMP
+    assert OPENMOTICS_MODULE_NAME_TO_TYPE["DIMMER"] == ModuleType.DIMMER
+
+
+def test_partitions() -> None:
+    """Test outputs are partitioned by type when the configurations are set."""
+    outputs = OpenMoticsOutputs(None)  # type: ignore[arg-type]
+    assert outputs.ids_by_type(OutputType.PUMP) == ()
+
+    outputs.output_configs = [
+        {"id": 0, "type": 4, "module_type": "O"},
+        {"id": 1, "type": 255, "module_type": "D"},
+        {"id": 2, "type": 4, "module_type": "R"},
+        {"id": 3, "type": 42, "module_type": "X"},
+    ]
+    assert outputs.ids_by_type(OutputType.PUMP) == (0, 2)
+    assert outputs.ids_by_type("PUMP") == outputs.ids_by_type(4) == (0, 2)
+    assert outputs.ids_by_type(OutputType.HVAC) == ()
+    assert outputs.ids_by_module_type(ModuleType.DIMMER) == outputs.ids_by_module_type("D") == (1,)
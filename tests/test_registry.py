@@ -0,0 +1,101 @@
+"""Tests for the group action registry."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from pyhaopenmotics.client.routes import InstallationRoutes
+from pyhaopenmotics.cloud.groupactions import OpenMoticsGroupActions
+from pyhaopenmotics.cloud.models.groupaction import GroupAction
+from pyhaopenmotics.helpers import registry as registry_module
+from pyhaopenmotics.helpers.registry import GroupActionRegistry
+
+groupactions = [
+    GroupAction.from_dict({"id": 1, "name": "Movie"}),
+    GroupAction.from_dict({"id": 2, "name": "Dinner"}),
+    GroupAction.from_dict({"id": 3, "name": "movie"}),
+]
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    """Replace the clock of the registry by a settable one."""
+    fake = SimpleNamespace(now=100.0)
+    monkeypatch.setattr(registry_module, "time", SimpleNamespace(monotonic=lambda: fake.now))
+    return fake
+
+
+def test_lookup() -> None:
+    """Test group actions are found by id, name and usage."""
+    registry = GroupActionRegistry()
+    assert not registry.loaded
+    registry.load([*groupactions, None])
+
+    assert registry.loaded
+    assert len(registry.all()) == 3
+    assert registry.by_id(2).name == "Dinner"
+    assert registry.by_id(4) is None
+    assert [groupaction.idx for groupaction in registry.by_name("MOVIE")] == [1, 3]
+    assert registry.resolve("dinner") == 2
+    assert registry.resolve(7) == 7
+    assert registry.resolve("unknown") is None
+
+    assert not registry.has_usage("scene")
+    registry.load_usage("scene", groupactions[:1])
+    assert registry.has_usage("SCENE")
+    assert registry.by_usage("Scene") == groupactions[:1]
+
+
+def test_expiry(clock: SimpleNamespace) -> None:
+    """Test the configuration and the usages expire after max_age."""
+    registry = GroupActionRegistry(max_age=60)
+    registry.load(groupactions)
+    clock.now += 30
+    registry.load_usage("SCENE", groupactions[:1])
+
+    clock.now += 31
+    assert not registry.loaded
+    assert registry.by_id(1) is None
+    assert registry.has_usage("SCENE")
+
+    clock.now += 30
+    assert not registry.has_usage("SCENE")
+    assert registry.by_usage("SCENE") == []
+
+    forever = GroupActionRegistry(max_age=None)
+    forever.load(groupactions)
+    clock.now += 1e6
+    assert forever.loaded
+
+
+def test_invalidate() -> None:
+    """Test invalidate drops everything."""
+    registry = GroupActionRegistry()
+    registry.load(groupactions)
+    registry.load_usage("SCENE", groupactions)
+    registry.invalidate()
+
+    assert not registry.loaded
+    assert not registry.has_usage("SCENE")
+    assert registry.all() == []
+
+
+@pytest.mark.asyncio
+async def test_cloud_usage_single_request() -> None:
+    """Test a usage is requested once, without downloading the configuration."""
+    requests: list[tuple[str, Any]] = []
+
+    async def get(path: str, params: Any = None) -> Any:
+        requests.append((path, params))
+        return {"data": [{"id": 1, "name": "Movie"}]}
+
+    omcloud = SimpleNamespace(routes=InstallationRoutes(12), get=get)
+    domain = OpenMoticsGroupActions(omcloud)  # type: ignore[arg-type]
+
+    scenes = await domain.scenes()
+    assert [scene.idx for scene in scenes] == [1]
+    assert await domain.scenes() == scenes
+    assert requests == [("/base/installations/12/groupactions", {"usage": "SCENE"})]
@@ -0,0 +1,13 @@
+"""Tests for the cloud routes."""
+
+from pyhaopenmotics.client.routes import InstallationRoutes
+
+
+def test_installation_routes() -> None:
+    """Test endpoint templates are compiled per installation and filled with the ids."""
+    routes = InstallationRoutes(12)
+    assert routes.prefix == "/base/installations/12"
+    assert routes.path("outputs") == "/base/installations/12/outputs"
+    assert routes.path("outputs/{}/turn_on", 3) == "/base/installations/12/outputs/3/turn_on"
+    assert routes.path("outputs/{}/turn_on", 4) == "/base/installations/12/outputs/4/turn_on"
+    assert InstallationRoutes(7).path("outputs/{}/turn_on", 3) == "/base/installations/7/outputs/3/turn_on"
@@ -0,0 +1,68 @@
+"""Tests for the request scheduler."""
+
+import asyncio
+
+import pytest
+
+from pyhaopenmotics.client.openmoticscloud import OpenMoticsCloud
+from pyhaopenmotics.client.scheduler import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_STATUS,
+    RequestScheduler,
+    request_priority,
+)
+from pyhaopenmotics.errors import OpenMoticsQueueFullError
+
+
+def test_request_priority() -> None:
+    """Test commands, status reads and configuration reads are told apart."""
+    assert request_priority("set_output", idempotent=False) == PRIORITY_INTERACTIVE
+    assert request_priority("get_output_status", idempotent=True) == PRIORITY_STATUS
+    assert request_priority("get_output_configurations", idempotent=True) == PRIORITY_BACKGROUND
+    assert request_priority("get_realtime_power", idempotent=True) == PRIORITY_BACKGROUND
+
+
+@pytest.mark.asyncio
+async def test_commands_bypass_reads() -> None:
+    """Test commands start while reads wait, and waiting status reads go first."""
+    scheduler = RequestScheduler(max_reads=1, max_queued={PRIORITY_BACKGROUND: 1})
+    await scheduler.acquire(PRIORITY_BACKGROUND)
+
+    # Commands do not wait for the reads.
+    await asyncio.wait_for(scheduler.acquire(PRIORITY_INTERACTIVE), 1)
+    scheduler.release(PRIORITY_INTERACTIVE)
+
+    order = []
+
+    async def read(priority: int) -> None:
+        async with scheduler.slot(priority):
+            order.append(priority)
+
+    background = asyncio.ensure_future(read(PRIORITY_BACKGROUND))
+    status = asyncio.ensure_future(read(PRIORITY_STATUS))
+    await asyncio.sleep(0)
+    assert scheduler.queued(PRIORITY_BACKGROUND) == 1
+    with pytest.raises(OpenMoticsQueueFullError):
+        await scheduler.acquire(PRIORITY_BACKGROUND)
+
+    scheduler.release(PRIORITY_BACKGROUND)
+    await asyncio.gather(background, status)
+    assert order == [PRIORITY_STATUS, PRIORITY_BACKGROUND]
+    assert scheduler.active(PRIORITY_STATUS) == scheduler.active(PRIORITY_BACKGROUND) == 0
+
+
+@pytest.mark.asyncio
+async def test_queue_unlimited_by_default() -> None:
+    """Test reads are only refused when max_queued is set, and clients schedule on request."""
+    scheduler = RequestScheduler(max_reads=1)
+    await scheduler.acquire(PRIORITY_STATUS)
+    waiting = [asyncio.ensure_future(scheduler.acquire(PRIORITY_STATUS)) for _ in range(100)]
+    await asyncio.sleep(0)
+    assert scheduler.queued(PRIORITY_STATUS) == 100
+    for _ in range(101):
+        scheduler.release(PRIORITY_STATUS)
+        await asyncio.sleep(0)
+    await asyncio.gather(*waiting)
+
+    assert OpenMoticsCloud("12345", installation_id=1).scheduler is None
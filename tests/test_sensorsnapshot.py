@@ -0,0 +1,46 @@
+"""Tests for the immutable sensor snapshots."""
+
+import pickle
+from typing import Any
+
+import pytest
+
+from pyhaopenmotics.helpers.index import EntityIndex
+from pyhaopenmotics.openmoticsgw.sensors import OpenMoticsSensors
+
+CONFIGS = [
+    {"id": 1, "name": "Living", "physical_quantity": "temperature", "unit": "celcius", "room": 2},
+    {"id": 2, "name": "Bathroom", "physical_quantity": "humidity", "unit": "percent", "room": 3},
+]
+
+
+class _Gateway:
+    """Gateway answering the sensor actions with fixed values."""
+
+    def __init__(self) -> None:
+        self.index = EntityIndex()
+        self.values: dict[int, Any] = {1: 20.5, 2: None}
+
+    async def exec_action(self, action: str, **_kwargs: Any) -> dict[str, Any]:
+        if action == "get_sensor_configurations":
+            return {"success": True, "config": CONFIGS}
+        return {"success": True, "status": [{"id": idx, "value": value} for idx, value in self.values.items()]}
+
+
+@pytest.mark.asyncio
+async def test_snapshots_share_configs() -> None:
+    """Test polls share the configs and never change earlier snapshots or the loaded configs."""
+    gateway = _Gateway()
+    sensors = OpenMoticsSensors(gateway)  # type: ignore[arg-type]
+
+    first = await sensors.get_snapshot()
+    gateway.values = {1: 21.0, 2: 55.0}
+    second = await sensors.get_snapshot()
+
+    assert [snapshot.value for snapshot in first] == [20.5, None]
+    assert [snapshot.value for snapshot in second] == [21.0, 55.0]
+    assert all(a.config is b.config for a, b in zip(first, second, strict=True))
+    assert pickle.loads(pickle.dumps(second)) == second  # noqa: S301
+
+    await sensors.get_all()
+    assert "status" not in CONFIGS[0]
@@ -0,0 +1,39 @@
+"""Tests for the sensor stream filter."""
+
+from pyhaopenmotics.helpers.sensorstream import SensorReading, SensorStreamFilter, StreamSettings
+
+
+def _temperature(value: float, timestamp: float, sensor_id: int = 1) -> SensorReading:
+    """Return a temperature reading."""
+    return SensorReading(sensor_id, "temperature", value, timestamp)
+
+
+def test_deadband_and_interval() -> None:
+    """Test jitter within the deadband and readings within the interval are dropped."""
+    stream_filter = SensorStreamFilter(per_quantity={"temperature": StreamSettings(deadband=0.2, min_interval=10)})
+    readings = [
+        _temperature(20.0, 0),
+        _temperature(20.1, 15),
+        _temperature(19.9, 30),
+        _temperature(20.3, 35),
+        _temperature(20.6, 40),
+        _temperature(20.6, 46),
+    ]
+    assert [reading.timestamp for reading in stream_filter.filter(readings)] == [0, 35, 46]
+
+
+def test_rate_and_max_interval() -> None:
+    """Test fast changes and the heartbeat are emitted, per sensor settings first."""
+    stream_filter = SensorStreamFilter(
+        per_sensor={2: StreamSettings(deadband=5, min_interval=60, max_rate=0.1, max_interval=300)},
+    )
+    readings = [
+        _temperature(20.0, 0, 2),
+        _temperature(18.0, 10, 2),
+        _temperature(18.0, 20, 2),
+        _temperature(18.0, 320, 2),
+    ]
+    assert [reading.timestamp for reading in stream_filter.filter(readings)] == [0, 10, 320]
+
+    humidity = SensorReading(3, "humidity", 50, 0)
+    assert stream_filter.filter([humidity, SensorReading(3, "humidity", 50.5, 1)]) == [humidity]
@@ -0,0 +1,76 @@
+"""Tests for the client-side shutter motion model."""
+
+# pylint: disable=protected-access
+from pyhaopenmotics.openmoticsgw.shuttermotion import (
+    DIRECTION_DOWN,
+    DIRECTION_STOP,
+    IDLE_POLL_INTERVAL,
+    ShutterMotion,
+    ShutterMotionTracker,
+)
+
+shutter_config = {"id": 1, "name": "Kitchen", "timer_up": 20, "timer_down": 10, "steps": 11}
+
+
+def test_motion_from_config() -> None:
+    """Test parsing of flat and nested shutter configurations."""
+    motion = ShutterMotion.from_config(shutter_config)
+    assert motion.shutter_id == 1
+    assert motion.timer_up == 20
+    assert motion.timer_down == 10
+    assert motion.max_position == 10
+
+    nested = ShutterMotion.from_config({"id": 2, "configuration": {"timer_up": 5, "steps": None}})
+    assert nested.timer_up == 5
+    assert nested.max_position == 100
+
+
+def test_motion_interpolation() -> None:
+    """Test the position is interpolated from the configured timers."""
+    motion = ShutterMotion.from_config(shutter_config)
+    motion.start(DIRECTION_DOWN, now=100.0)
+    assert motion.estimate(105.0) == 5
+    assert motion.remaining(105.0) == 5
+    assert motion.estimate(120.0) == 10
+
+    motion.goto(0, now=110.0)
+    assert motion.estimate(120.0) == 5
+    motion.settle(130.0)
+    assert motion.direction == DIRECTION_STOP
+    assert motion.position == 0
+
+
+def test_motion_single_step() -> None:
+    """Test a shutter without travel settles at once."""
+    motion = ShutterMotion.from_config({"id": 3, "timer_up": 20, "timer_down": 10, "steps": 1})
+    motion.start(DIRECTION_DOWN, now=0.0)
+    assert motion.remaining(1.0) == 0
+    motion.settle(1.0)
+    assert motion.direction == DIRECTION_STOP
+    assert motion.position == 0
+
+
+def test_motion_status_correction() -> None:
+    """Test a gateway status overrides the estimate."""
+    motion = ShutterMotion.from_config(shutter_config)
+    motion.start(DIRECTION_DOWN, now=0.0)
+    motion.update_from_status({"state": "stopped", "position": 3}, now=1.0)
+    assert motion.direction == DIRECTION_STOP
+    assert motion.estimate(50.0) == 3
+
+    motion.update_from_status({"state": "down", "position": None}, now=2.0)
+    assert motion.position == 10
+
+
+def test_tracker_poll_interval() -> None:
+    """Test polling slows down once all movements ended."""
+    tracker = ShutterMotionTracker()
+    tracker.load_configs([shutter_config])
+    assert tracker.poll_interval() == IDLE_POLL_INTERVAL
+
+    tracker.get(1).start(DIRECTION_DOWN)
+    assert tracker.poll_interval() <= 11
+
+    tracker.update_from_status({"1": {"state": "stopped", "position": 4}})
+    assert tracker.poll_interval() == IDLE_POLL_INTERVAL
+    assert tracker.estimate(1) == 4
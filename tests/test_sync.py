@@ -0,0 +1,97 @@
+"""Tests for the blocking facade."""
+
+import threading
+from collections.abc import AsyncIterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from typing import Any
+
+import pytest
+
+from pyhaopenmotics.client.sync import SyncClient
+
+
+class _Outputs:
+    """Domain of the fake client."""
+
+    def __init__(self, omcloud: "_Client") -> None:
+        self._omcloud = omcloud
+
+    async def turn_on(self, output_id: int) -> int:
+        self._omcloud.threads.add(threading.current_thread().name)
+        return output_id
+
+    async def stream(self, count: int) -> AsyncIterator[int]:
+        try:
+            for value in range(count):
+                yield value
+        finally:
+            self._omcloud.streams_closed += 1
+
+
+class _Index:
+    """Synchronous object of the fake client."""
+
+    def __init__(self, omcloud: "_Client") -> None:
+        self._client = omcloud
+
+    def get(self, idx: int) -> int:
+        self._client.threads.add(threading.current_thread().name)
+        return idx
+
+
+class _Client:
+    """Client recording on which threads it runs."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.threads: set[str] = set()
+        self.streams_closed = 0
+        self.closed = False
+        self.index = _Index(self)
+
+    @cached_property
+    def outputs(self) -> _Outputs:
+        return _Outputs(self)
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+def test_calls_run_on_one_loop_thread() -> None:
+    """Test calls from many threads share the client and its loop thread."""
+    with SyncClient(_Client, "gw") as client:
+        assert client.name == "gw"
+        with ThreadPoolExecutor(4) as executor:
+            assert list(executor.map(client.outputs.turn_on, range(8))) == list(range(8))
+        assert client.client.threads == {"pyhaopenmotics-sync"}
+        assert client.outputs is client.outputs
+
+        assert list(client.outputs.stream(3)) == [0, 1, 2]
+        for _ in client.outputs.stream(3):
+            break
+        assert client.client.streams_closed == 2
+    assert client.client.closed
+
+    with pytest.raises(RuntimeError):
+        client.outputs.turn_on(1)
+
+
+def test_methods_are_resolved_once() -> None:
+    """Test a call only crosses to the loop thread once, and objects are wrapped."""
+    with SyncClient(_Client, "gw") as client:
+        client.outputs.turn_on(1)
+        trips = 0
+        run = client.run
+
+        def counting_run(coro: Any) -> Any:
+            nonlocal trips
+            trips += 1
+            return run(coro)
+
+        client.run = counting_run  # type: ignore[method-assign]
+        assert client.outputs.turn_on(2) == 2
+        assert trips == 1
+
+        assert client.index.get(3) == 3
+        assert client.client.threads == {"pyhaopenmotics-sync"}
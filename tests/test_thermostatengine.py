@@ -0,0 +1,132 @@
+"""Tests for the local thermostat engine."""
+
+# pylint: disable=protected-access
+from typing import Any
+
+import pytest
+
+from pyhaopenmotics.errors import OpenMoticsConnectionError
+from pyhaopenmotics.helpers.features import FeatureMap
+from pyhaopenmotics.helpers.index import EntityIndex
+from pyhaopenmotics.openmoticsgw.thermostatengine import (
+    GENERATION_CLASSIC,
+    GENERATION_UNIT,
+    ThermostatEngine,
+)
+from pyhaopenmotics.openmoticsgw.thermostats import OpenMoticsThermostatUnits
+
+
+class NotFoundError(Exception):
+    """Stand-in for an HTTP error with a status."""
+
+    status = 404
+
+
+class FakeGateway:
+    """Answer exec_action from a dict of responses."""
+
+    def __init__(self, responses: dict[str, Any]) -> None:
+        """Init the fake gateway."""
+        self.responses = responses
+        self.calls: list[str] = []
+        self.features = FeatureMap()
+        self.index = EntityIndex()
+        self.failing: set[str] = set()
+
+    async def exec_action(self, path: str, **_kwargs: Any) -> Any:
+        """Return the response of an action, raise for unknown actions."""
+        self.calls.append(path)
+        if path in self.failing:
+            msg = "Timeout"
+            raise OpenMoticsConnectionError(msg)
+        if path not in self.responses:
+            msg = "Not found"
+            raise OpenMoticsConnectionError(msg) from NotFoundError()
+        return self.responses[path]
+
+
+UNIT_RESPONSES = {
+    "get_thermostat_unit_configurations": {
+        "success": True,
+        "config": [
+            {"id": 1, "name": "Living", "thermostat_group_id": 0},
+            {"id": 2, "name": "Kitchen", "thermostat_group_id": 0},
+        ],
+    },
+    "get_thermostat_group_configurations": {"success": True, "config": [{"id": 0, "name": "House"}]},
+    "get_thermostat_group_status": {"success": True, "status": [{"id": 0, "mode": "HEATING", "state": True}]},
+    "get_thermostat_unit_status": {
+        "success": True,
+        "status": [{"id": 2, "actual_temperature": 20.5, "setpoint_temperature": 21.0}],
+    },
+}
+
+
+@pytest.mark.asyncio
+async def test_unit_generation() -> None:
+    """Test the unit API is used and indexed when available."""
+    gateway = FakeGateway(UNIT_RESPONSES)
+    engine = ThermostatEngine(gateway)  # type: ignore[arg-type]
+    view = await engine.refresh()
+    assert engine.generation == GENERATION_UNIT
+    assert view.groups[0].status.state is True
+    assert view.units[2].status.actual_temperature == 20.5
+    assert view.units[1].status.actual_temperature == 0
+    assert [unit.idx for unit in view.units_by_group[0]] == [1, 2]
+
+    await engine.refresh()
+    assert gateway.calls.count("get_thermostat_unit_configurations") == 1
+
+
+@pytest.mark.asyncio
+async def test_classic_generation() -> None:
+    """Test the classic API is normalized to the unit API."""
+    gateway = FakeGateway(
+        {
+            "get_thermostat_configurations": {"success": True, "config": [{"id": 3, "name": "Office"}]},
+            "get_thermostat_status": {
+                "success": True,
+                "thermostats_on": True,
+                "cooling": False,
+                "status": [{"id": 3, "act": 19.0, "csetp": 20.0, "output0": 40, "mode": 1}],
+            },
+        },
+    )
+    engine = ThermostatEngine(gateway)  # type: ignore[arg-type]
+    view = await engine.refresh()
+    assert engine.generation == GENERATION_CLASSIC
+    assert view.groups[0].status.mode == "HEATING"
+    assert view.units[3].status.current_setpoint == 20.0
+    assert view.units[3].status.output_0 == 40
+
+
+@pytest.mark.asyncio
+async def test_transient_error_keeps_detecting() -> None:
+    """Test a failed request is raised and does not fall back to the classic API."""
+    gateway = FakeGateway(UNIT_RESPONSES)
+    gateway.failing.add("get_thermostat_unit_configurations")
+    engine = ThermostatEngine(gateway)  # type: ignore[arg-type]
+    with pytest.raises(OpenMoticsConnectionError):
+        await engine.refresh()
+    assert engine.generation is None
+    assert "get_thermostat_configurations" not in gateway.calls
+
+    gateway.failing.clear()
+    await engine.refresh()
+    assert engine.generation == GENERATION_UNIT
+
+
+@pytest.mark.asyncio
+async def test_lookups_use_last_view() -> None:
+    """Test lookups only fetch the statuses when nothing was loaded or when asked."""
+    gateway = FakeGateway(UNIT_RESPONSES)
+    engine = ThermostatEngine(gateway)  # type: ignore[arg-type]
+    units = OpenMoticsThermostatUnits(gateway, engine)  # type: ignore[arg-type]
+
+    assert (await units.get_by_id(2)).status.actual_temperature == 20.5
+    assert (await units.get_by_id(1)).idx == 1
+    assert gateway.calls.count("get_thermostat_unit_status") == 1
+
+    await units.get_by_id(1, refresh=True)
+    await units.get_all()
+    assert gateway.calls.count("get_thermostat_unit_status") == 3